@@ -1,11 +1,55 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import biletinial_modul
+import datetime
+import os
+import threading
+from contextlib import asynccontextmanager
+
+from fastapi import Body, Depends, FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+import batch_modul
+import birlestir_modul
 import bubilet_modul
 import burs_microfon
+import compression_modul
+import http_modul
+import job_modul
+import kaynak_modul
+import metrics_modul
+import model_modul
+import query_modul
+import scheduler_modul
 # import sqlite3 <-- KALDIRILDI
 
-app = FastAPI(title="Etkinlik Toplayıcı API", description="Biletinial ve Bubilet Bot Entegrasyonu")
+
+@asynccontextmanager
+async def lifespan(app):
+    # Bubilet tarayıcılarını arka planda ısıt; açılış beklemesin
+    threading.Thread(target=bubilet_modul.DRIVER_POOL.warm, daemon=True).start()
+    PREWARM.start()
+    yield
+    PREWARM.stop()
+    bubilet_modul.DRIVER_POOL.close()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON'u model_modul.dumps (orjson) ile yazar. Endpoint bu sınıfı doğrudan
+    döndürdüğünde FastAPI'nin jsonable_encoder dolaşması da atlanır; kayıtlar
+    (slotlu dataclass) ara sözlüğe çevrilmeden yazılır.
+    """
+
+    def render(self, content):
+        return model_modul.dumps(content)
+
+
+app = FastAPI(
+    title="Etkinlik Toplayıcı API",
+    description="Biletinial ve Bubilet Bot Entegrasyonu",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+# Accept-Encoding'e göre brotli / gzip; COMPRESS_MIN_SIZE altındaki yanıtlar sıkıştırılmaz
+app.add_middleware(compression_modul.CompressionMiddleware)
 
 # İstek Gövdesi Modelleri (Request Body)
 class ScrapeRequest(BaseModel):
@@ -15,59 +59,357 @@ class ScrapeRequest(BaseModel):
 
 class ScholarshipRequest(BaseModel):
     level: str
+    window: int = burs_microfon.PAGE_WINDOW  # Paralel çekilecek sayfa sayısı (1 = sıralı)
+
+
+class ResultShape:
+    """/scrape yanıtlarında alan seçimi, sıralama ve sayfalama; sonuç yeniden taranmaz."""
+
+    def __init__(
+        self,
+        fields: str | None = Query(None, description="Virgülle ayrılmış alanlar, ör. title,date,link"),
+        sort: str | None = Query(None, description="Kayıt alanı; azalan için başına \"-\", ör. -date"),
+        limit: int | None = Query(None, ge=1, le=query_modul.MAX_LIMIT),
+        cursor: str | None = Query(None, description="Önceki yanıttaki next_cursor"),
+        layout: str | None = Query(None, description="objects (varsayılan) veya rows: alan adları bir kez, değerler satır satır"),
+    ):
+        self.fields = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+        self.sort = sort
+        self.limit = limit
+        self.cursor = cursor
+        self.layout = layout
+
+    def apply(self, source, result):
+        try:
+            return kaynak_modul.shape(source, result, self.fields, self.sort, self.limit, self.cursor, self.layout)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+# Kaynak adı -> istek gövdesi modeli
+REQUEST_MODELS = {
+    "biletinial": ScrapeRequest,
+    "bubilet": ScrapeRequest,
+    "microfon": ScholarshipRequest,
+}
+
+# Uzun süren taramalar için arka plan işleri
+JOBS = job_modul.JobManager(
+    runner=kaynak_modul.run_job,
+    is_error=kaynak_modul.is_error,
+    max_workers=int(os.getenv("JOB_WORKERS", "4")),
+    source_limits={
+        "biletinial": int(os.getenv("JOB_LIMIT_BILETINIAL", "4")),
+        "bubilet": int(os.getenv("JOB_LIMIT_BUBILET", str(bubilet_modul.POOL_SIZE))),
+        "microfon": int(os.getenv("JOB_LIMIT_MICROFON", "2")),
+    },
+    ttl=int(os.getenv("JOB_TTL", "3600")),
+    max_finished=int(os.getenv("JOB_MAX_FINISHED", "1000")),
+)
+
+
+def _prewarm_targets():
+    # Ör. PREWARM_TARGETS="biletinial:istanbul:tiyatro;bubilet:ankara:konser;microfon:lise"
+    fields = {source: config["fields"] for source, config in kaynak_modul.SOURCES.items()}
+    try:
+        targets = scheduler_modul.parse_targets(os.getenv("PREWARM_TARGETS", ""), fields)
+    except ValueError as e:
+        print(f"⚠️ Ön ısıtma kapalı: {e}")
+        return []
+    valid = []
+    for source, params in targets:
+        error = kaynak_modul.check(source, params)
+        if error:
+            print(f"⚠️ Ön ısıtma hedefi atlandı ({source}): {error}")
+        else:
+            valid.append((source, params))
+    return valid
+
+
+# Sık istenen hedefleri önbellek süresi dolmadan arka planda yeniden tarar
+PREWARM = scheduler_modul.PrewarmScheduler(
+    refresh=kaynak_modul.prewarm,
+    key=kaynak_modul.cache_key,
+    interval=lambda source: kaynak_modul.SOURCES[source]["ttl"] * float(os.getenv("PREWARM_LEAD", "0.9")),
+    targets=_prewarm_targets(),
+    demand=kaynak_modul.DEMAND,
+    source_limits={
+        "biletinial": int(os.getenv("PREWARM_LIMIT_BILETINIAL", "2")),
+        "bubilet": int(os.getenv("PREWARM_LIMIT_BUBILET", "1")),
+        "microfon": int(os.getenv("PREWARM_LIMIT_MICROFON", "1")),
+    },
+    jitter=float(os.getenv("PREWARM_JITTER", "0.1")),
+    start_delay=float(os.getenv("PREWARM_START_DELAY", "30")),
+    is_error=kaynak_modul.is_error,
+)
 
 @app.get("/")
 def home():
     return {"message": "Etkinlik API çalışıyor. /docs adresine giderek test edebilirsiniz."}
 
+
+@app.get("/stats")
+def stats():
+    """Tarayıcı havuzu gibi paylaşılan bileşenlerin anlık istatistikleri."""
+    return {
+        "bubilet_pool": bubilet_modul.DRIVER_POOL.stats(),
+        "cache": kaynak_modul.CACHE.stats(),
+        "singleflight": kaynak_modul.FLIGHTS.stats(),
+        "jobs": JOBS.stats(),
+        "conditional_fetch": http_modul.conditional_stats(),
+        "outbound": http_modul.outbound_stats(),
+        "store": kaynak_modul.STORE.stats() if kaynak_modul.STORE else None,
+    }
+
+@app.get("/events")
+def list_events(
+    source: str | None = None,
+    city: str | None = None,
+    category: str | None = None,
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+    venue: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    q: str | None = None,
+    sort: str = "start_date",
+    limit: int = Query(query_modul.DEFAULT_LIMIT, ge=1, le=query_modul.MAX_LIMIT),
+    cursor: str | None = None,
+    include_inactive: bool = False,
+):
+    """
+    Daha önce taranıp depoya yazılmış etkinlik ve burslarda arar; kaynak sitelere gitmez.
+    q başlık ve mekanda, venue sadece mekanda arar (ı/i, ş/s ... farkı gözetilmez).
+    Sıralama: start_date, price, title, first_seen, last_seen (azalan için başına "-").
+    Sonraki sayfa için yanıttaki next_cursor değeri cursor olarak gönderilir.
+    """
+    if kaynak_modul.STORE is None:
+        raise HTTPException(status_code=503, detail="Kalıcı depo kapalı (STORE_PATH).")
+    try:
+        page = query_modul.query(
+            kaynak_modul.STORE,
+            source=source,
+            city=city,
+            category=category,
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            venue=venue,
+            min_price=min_price,
+            max_price=max_price,
+            q=q,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            include_inactive=include_inactive,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(page)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Aşama süreleri ve kart / kayıt sayaçları (Prometheus metin biçimi)."""
+    return PlainTextResponse(metrics_modul.expose(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/prewarm")
+def prewarm_status():
+    """Ön ısıtma hedefleri: sıradaki çalışma, öncelik, talep ve son çalışma istatistikleri."""
+    return PREWARM.stats()
+
 # --- BİLETİNİAL ENDPOINT ---
 @app.post("/scrape/biletinial")
-def scrape_biletinial(request: ScrapeRequest):
+def scrape_biletinial(request: ScrapeRequest, refresh: bool = False, shape: ResultShape = Depends()):
     """
     Biletinial.com sitesini tarar.
     Kategoriler: sinema, tiyatro, muzik, opera, egitim
     Şehir: istanbul, ankara, izmir vb.
+    Sonuç önbellekten gelebilir (X-Cache başlığı); refresh=true yeniden taratır.
+    fields / sort / limit / cursor ile yanıt daraltılır ve sayfalanır (önbellekteki sonuçtan).
     """
     try:
-        # Modüldeki fonksiyonu çağır
+        # Modüldeki fonksiyonu önbellek üzerinden çağır
         # result artık veritabanına kaydetmek yerine anlık çekilen veriyi döndürecek.
-        result = biletinial_modul.run_biletinial(request.category, request.city)
+        result, cache_state = kaynak_modul.scrape("biletinial", request.model_dump(), refresh)
         if "status" in result and result["status"] == "error":
             raise HTTPException(status_code=404, detail=result["message"])
-        return result
+        return FastJSONResponse(shape.apply("biletinial", result), headers={"X-Cache": cache_state})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # --- BUBİLET ENDPOINT ---
 @app.post("/scrape/bubilet")
-def scrape_bubilet(request: ScrapeRequest):
+def scrape_bubilet(request: ScrapeRequest, refresh: bool = False, shape: ResultShape = Depends()):
     """
     Bubilet.com.tr sitesini tarar.
     Kategoriler: konser, tiyatro, festival, stand-up
     Şehir: istanbul, ankara, izmir vb.
+    Sonuç önbellekten gelebilir (X-Cache başlığı); refresh=true yeniden taratır.
+    fields / sort / limit / cursor ile yanıt daraltılır ve sayfalanır (önbellekteki sonuçtan).
     """
     try:
-        # Modüldeki fonksiyonu çağır
+        # Modüldeki fonksiyonu önbellek üzerinden çağır
         # result artık veritabanına kaydetmek yerine anlık çekilen veriyi döndürecek.
-        result = bubilet_modul.run_bubilet(request.category, request.city)
-        return result
+        result, cache_state = kaynak_modul.scrape("bubilet", request.model_dump(), refresh)
+        return FastJSONResponse(shape.apply("bubilet", result), headers={"X-Cache": cache_state})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/scrape/microfon")
-def scrape_microfon(request: ScholarshipRequest):
+def scrape_microfon(request: ScholarshipRequest, refresh: bool = False, shape: ResultShape = Depends()):
     """
     Microfon burs ilanlarını okul seviyesine göre tarar.
     Seviye örnekleri: HighSchool/Lise, University/Üniversite, PrimarySchool/İlkokul
+    window > 1 verilirse sayfalar paralel çekilir, sonuç sıralı taramayla aynıdır.
+    Sonuç önbellekten gelebilir (X-Cache başlığı); refresh=true yeniden taratır.
+    fields / sort / limit / cursor ile yanıt daraltılır ve sayfalanır (önbellekteki sonuçtan).
+    Ör. ?fields=title,application_dates,detail_url&limit=20 (scanned_urls da çıkarılır).
     """
     try:
-        result = burs_microfon.run_microfon(request.level)
+        result, cache_state = kaynak_modul.scrape("microfon", request.model_dump(), refresh)
         if result.get("status") == "error":
             raise HTTPException(status_code=400, detail=result.get("message", "Microfon verisi alınamadı."))
-        return result
+        return FastJSONResponse(shape.apply("microfon", result), headers={"X-Cache": cache_state})
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@app.post("/scrape/all")
+def scrape_all(request: ScrapeRequest, refresh: bool = False):
+    """
+    Biletinial ve Bubilet'i aynı anda tarar, aynı etkinlikleri birleştirir.
+    Kategoriler: sinema, tiyatro, muzik/konser, opera, egitim, standup, festival
+    Her etkinlik kaynak başına link ve fiyatı "offers" altında taşır.
+    """
+    try:
+        result = birlestir_modul.scrape_all(request.city, request.category, refresh)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result["status"] == "error":
+        raise HTTPException(status_code=502, detail=result["sources"])
+    return FastJSONResponse(result)
+
+
+def _validate(source, payload):
+    """Gövdeyi kaynağın istek modeliyle doğrular ve parametre sözlüğü döndürür."""
+    model = REQUEST_MODELS.get(source)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Bilinmeyen kaynak: {source}")
+    try:
+        return model(**payload).model_dump()
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+
+# --- TOPLU TARAMA ---
+# Kaynak başına aynı anda çalışabilecek batch hedefi
+BATCH_LIMITS = {
+    "biletinial": int(os.getenv("BATCH_LIMIT_BILETINIAL", str(batch_modul.DEFAULT_CONCURRENCY))),
+    "bubilet": int(os.getenv("BATCH_LIMIT_BUBILET", str(bubilet_modul.POOL_SIZE))),
+    "microfon": int(os.getenv("BATCH_LIMIT_MICROFON", "2")),
+}
+
+
+class BatchRequest(BaseModel):
+    targets: dict[str, list[dict]]  # Kaynak adı -> istek gövdeleri
+    concurrency: int = batch_modul.DEFAULT_CONCURRENCY
+
+
+@app.post("/scrape/batch")
+def scrape_batch(
+    request: BatchRequest,
+    refresh: bool = False,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """
+    Birden çok hedefi tek çağrıda, sınırlı paralellikle tarar.
+    Gövde: {"targets": {"biletinial": [{"city": "ankara", "category": "tiyatro"}, ...]}, "concurrency": 8}
+    Her hedefin durumu, süresi ve sonucu ayrı raporlanır; hata veren hedef diğerlerini durdurmaz.
+    format=ndjson: Hedefler bittikçe satır satır gönderilir, en sonda {"type": "summary", ...}.
+    Özet, batch'in toplam süresini ve hedef/kayıt başına verimi içerir.
+    """
+    targets = [
+        (source, _validate(source, payload))
+        for source, payloads in request.targets.items()
+        for payload in payloads
+    ]
+    batch = batch_modul.run_batch(targets, request.concurrency, BATCH_LIMITS, refresh)
+
+    if format == "ndjson":
+        def ndjson():
+            for kind, value in batch:
+                yield model_modul.dumps({"type": kind, **value}) + b"\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results, summary = [], None
+    for kind, value in batch:
+        if kind == "target":
+            results.append(value)
+        else:
+            summary = value
+    results.sort(key=lambda record: record["index"])
+    return FastJSONResponse({"summary": summary, "results": results})
+
+
+# --- AKIŞ (STREAMING) ENDPOINT ---
+@app.post("/scrape/{source}/stream")
+def scrape_stream(source: str, payload: dict = Body(...), format: str = Query("ndjson", pattern="^(ndjson|sse)$")):
+    """
+    Etkinlikleri/bursları parse edildikçe gönderir (Bubilet: her yeni link, Microfon: her sayfa).
+    format=ndjson: Satır başına bir JSON; {"type": "item", "data": ...} ve en sonda {"type": "summary", ...}
+    format=sse: Server-Sent Events; "item" ve "summary" olayları.
+    """
+    params = _validate(source, payload)
+
+    def ndjson():
+        for kind, value in kaynak_modul.stream(source, params):
+            record = {"type": kind, "data": value} if kind == "item" else {"type": kind, **value}
+            yield model_modul.dumps(record) + b"\n"
+
+    def sse():
+        for kind, value in kaynak_modul.stream(source, params):
+            yield f"event: {kind}\ndata: ".encode() + model_modul.dumps(value) + b"\n\n"
+
+    if format == "sse":
+        return StreamingResponse(sse(), media_type="text/event-stream")
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+# --- ARKA PLAN İŞLERİ ---
+@app.post("/jobs/{source}", status_code=202)
+def create_job(source: str, payload: dict = Body(...)):
+    """
+    Taramayı arka planda başlatır ve hemen iş kimliğini döndürür.
+    Gövde ilgili /scrape/{source} endpoint'i ile aynıdır.
+    """
+    params = _validate(source, payload)
+    try:
+        job = JOBS.submit(source, params)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """İşin durumunu, ilerlemesini (scroll/sayfa sayısı, bulunan etkinlik) ve sonucunu döndürür."""
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı veya süresi doldu.")
+    return FastJSONResponse(job.to_dict())
+
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """İşi iptal eder. Çalışan tarama bir sonraki adımda durur."""
+    job = JOBS.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı veya süresi doldu.")
+    return {"job_id": job.id, "status": job.status}
@@ -0,0 +1,110 @@
+"""
+Çok sayıda (kaynak, şehir, kategori) hedefini tek çağrıda tarar.
+
+Hedefler sınırlı sayıda thread'de çalışır; her kaynağın ayrıca kendi eşzamanlılık
+sınırı vardır (ör. Bubilet tarayıcı havuzu kadar). Sıradaki hedef, sınırı dolmamış
+bir kaynaktan seçilir; böylece yavaş bir kaynak diğerlerinin worker'larını tutmaz.
+Biletinial ve Microfon istekleri http_modul'ün ortak bağlantı havuzunu kullanır.
+Hedefler bittikçe sonuçları verilir; hata veren hedef batch'i durdurmaz.
+"""
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import http_modul
+import kaynak_modul
+
+DEFAULT_CONCURRENCY = http_modul.POOL_MAXSIZE
+MAX_CONCURRENCY = 64
+
+
+def _run_target(index, source, params, refresh):
+    started = time.perf_counter()
+    try:
+        result, cache_state = kaynak_modul.scrape(source, params, refresh)
+    except Exception as e:
+        result, cache_state = {"status": "error", "message": str(e)}, None
+    duration = time.perf_counter() - started
+
+    record = {
+        "index": index,
+        "source": source,
+        "params": params,
+        "duration": round(duration, 3),
+    }
+    if kaynak_modul.is_error(result):
+        record.update({"status": "error", "message": result.get("message") if isinstance(result, dict) else None})
+    else:
+        record.update({
+            "status": "success",
+            "cache": cache_state,
+            "item_count": len(result.get(kaynak_modul.SOURCES[source]["items"], [])),
+            "result": result,
+        })
+    return record
+
+
+def run_batch(targets, concurrency=DEFAULT_CONCURRENCY, source_limits=None, refresh=False):
+    """
+    targets: [(kaynak, params)] listesi. Hedef bittikçe ("target", kayıt) verir,
+    en sonda ("summary", batch istatistikleri). Kayıtlar bitiş sırasındadır; "index"
+    alanı hedefin istekteki sırasını gösterir. Üreteç kapatılırsa bekleyen hedefler
+    başlatılmaz.
+    """
+    concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+    source_limits = source_limits or {}
+    pending = {}
+    for index, (source, params) in enumerate(targets):
+        pending.setdefault(source, deque()).append((index, params))
+    running = {source: 0 for source in pending}
+
+    started = time.perf_counter()
+    succeeded = failed = items = 0
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+    futures = {}
+
+    def fill():
+        # Sınırı dolmamış kaynaklardan sırayla hedef al (round-robin)
+        while len(futures) < concurrency:
+            submitted = False
+            for source, queue in pending.items():
+                if not queue or len(futures) >= concurrency:
+                    continue
+                if running[source] >= source_limits.get(source, concurrency):
+                    continue
+                index, params = queue.popleft()
+                running[source] += 1
+                futures[executor.submit(_run_target, index, source, params, refresh)] = source
+                submitted = True
+            if not submitted:
+                return
+
+    try:
+        fill()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                running[futures.pop(future)] -= 1
+                record = future.result()
+                if record["status"] == "success":
+                    succeeded += 1
+                    items += record["item_count"]
+                else:
+                    failed += 1
+                yield "target", record
+            fill()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    yield "summary", {
+        "targets": len(targets),
+        "succeeded": succeeded,
+        "failed": failed,
+        "items": items,
+        "elapsed": round(elapsed, 3),
+        "targets_per_sec": round(len(targets) / elapsed, 2) if elapsed else None,
+        "items_per_sec": round(items / elapsed, 2) if elapsed else None,
+        "concurrency": concurrency,
+        "source_limits": source_limits,
+    }
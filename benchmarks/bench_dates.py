@@ -0,0 +1,81 @@
+"""
+Tarih ayrıştırma mikro-benchmark'ı.
+
+Eski parse_date_range kopyaları (legacy_dates.py) ile tarih_modul'ü aynı metinler
+üzerinde karşılaştırır: soğuk önbellek, sıcak önbellek ve toplu parse_many.
+Çıktılar eski fonksiyonlarla aynı değilse 1 ile çıkar.
+
+Kullanım:
+    python benchmarks/bench_dates.py --count 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tarih_modul  # noqa: E402
+import fixture_pages  # noqa: E402
+import legacy_dates  # noqa: E402
+
+
+LEGACY = {
+    "biletinial": legacy_dates.biletinial_parse_date_range,
+    "bubilet": legacy_dates.bubilet_parse_date_range,
+}
+
+
+def _rate(func, texts):
+    started = time.perf_counter()
+    for text in texts:
+        func(text)
+    return len(texts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--distinct", type=int, default=2000, help="Farklı metin sayısı (sayfalarda tekrar oranı)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    pool = [fixture_pages._date_text(rng) for _ in range(args.distinct)]
+    texts = [rng.choice(pool) for _ in range(args.count)]
+
+    failed = False
+    print(f"{'stil':<11} {'yöntem':<16} {'tarih/sn':>12}")
+    for style, legacy in LEGACY.items():
+        expected = [legacy(text) for text in texts]
+        actual = [tarih_modul.parse_date_range(text, style=style) for text in texts]
+        if expected != actual:
+            failed = True
+            print(f"❌ {style}: çıktılar eski fonksiyondan farklı")
+
+        def cold(text):
+            tarih_modul._parse.cache_clear()
+            return tarih_modul.parse_date_range(text, style=style)
+
+        def warm(text):
+            return tarih_modul.parse_date_range(text, style=style)
+
+        rows = [("eski", _rate(legacy, texts)), ("yeni (soğuk)", _rate(cold, texts))]
+        tarih_modul._parse.cache_clear()
+        rows.append(("yeni (önbellek)", _rate(warm, texts)))
+
+        tarih_modul._parse.cache_clear()
+        started = time.perf_counter()
+        tarih_modul.parse_many(texts, style=style)
+        rows.append(("parse_many", len(texts) / (time.perf_counter() - started)))
+
+        for label, rate in rows:
+            print(f"{style:<11} {label:<16} {rate:>12.0f}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+HTTP katmanı benchmark'ı.
+
+Yerel bir HTTP/1.1 (keep-alive) sunucusuna karşı, her istekte yeni bağlantı açan
+düz requests.get ile http_modul'ün paylaşılan havuzunu karşılaştırır ve saniyedeki
+istek sayısını yazdırır. Host hız / eşzamanlılık sınırı kapatılır: bağlantı
+havuzu ölçülür, zamanlayıcı değil.
+
+Kullanım:
+    python benchmarks/bench_http.py --requests 500 --workers 8
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_modul  # noqa: E402
+import outbound_modul  # noqa: E402
+
+
+PAYLOAD = b"<html><body><div class='kategori__etkinlikler'><ul></ul></div></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def _run(fetch, url, total, workers):
+    started = time.perf_counter()
+    if workers <= 1:
+        for _ in range(total):
+            fetch(url).content
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda _: fetch(url).content, range(total)))
+    elapsed = time.perf_counter() - started
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = _start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/tr-tr/tiyatro/istanbul"
+    http_modul.configure(pool_maxsize=max(args.workers, http_modul.POOL_MAXSIZE))
+    http_modul.SCHEDULER = outbound_modul.OutboundScheduler(rate=0, concurrency=0)
+
+    def bare(target):
+        return requests.get(target, timeout=15)
+
+    def pooled(target):
+        return http_modul.get(target, timeout=15)
+
+    print(f"{'mod':<10} {'worker':>6} {'istek/sn':>10}")
+    for workers in (1, args.workers):
+        before = _run(bare, url, args.requests, workers)
+        after = _run(pooled, url, args.requests, workers)
+        print(f"{'önce':<10} {workers:>6} {before:>10.1f}")
+        print(f"{'sonra':<10} {workers:>6} {after:>10.1f}")
+
+    http_modul.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
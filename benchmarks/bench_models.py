@@ -0,0 +1,126 @@
+"""
+Kayıt tipleri (model_modul) ile eski sözlüklerin karşılaştırması (çevrimdışı).
+
+Her kaynak için sabit sayfalardan parse edilen kayıtlar --count adede çoğaltılır.
+Sonra iki ölçüm yapılır:
+  bellek : Aynı alan değerleriyle kurulan --count sözlük ile --count kayıt
+           (tracemalloc; metinler paylaşılır, sadece kapsayıcı farkı ölçülür).
+  encode : Yanıt gövdesinin JSON'a çevrilmesi.
+           - eski: jsonable_encoder + json.dumps (FastAPI varsayılan yolu)
+           - sözlük + model_modul.dumps (FastJSONResponse yolu; önbellek
+             isabetleri dahil her yanıt)
+           - kayıt -> model_modul.plain + dumps (taramadan sonraki ilk yanıt;
+             çevrim tarama başına bir kez yapılır)
+           - kayıt + model_modul.dumps, çevrimsiz (karşılaştırma için)
+           - kayıt, satır biçimi (model_modul.rows)
+Eski yol ile yeni yolun JSON çıktısı (alan sırası dahil) aynı değilse 1 ile çıkar.
+
+Kullanım:
+    python benchmarks/bench_models.py --count 10000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import biletinial_modul  # noqa: E402
+import bubilet_modul  # noqa: E402
+import burs_microfon  # noqa: E402
+import model_modul  # noqa: E402
+import fixture_pages  # noqa: E402
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+SOURCES = [
+    ("biletinial", "events",
+     lambda: biletinial_modul.parse_events_html(fixture_pages.biletinial_page(1000), "İstanbul", "tiyatro")),
+    ("bubilet", "events",
+     lambda: bubilet_modul.parse_cards_html(fixture_pages.bubilet_page(1000), bubilet_modul.BASE_URL, "istanbul", "tiyatro")[1]),
+    ("microfon", "scholarships",
+     lambda: burs_microfon._parse_page_html(fixture_pages.microfon_page(200))[1]),
+]
+
+
+def _legacy_dumps(value):
+    # Starlette JSONResponse.render ile aynı ayarlar
+    return json.dumps(jsonable_encoder(value), ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def _plain_dumps(value):
+    return model_modul.dumps(model_modul.plain(value))
+
+
+def _allocated(build):
+    tracemalloc.start()
+    objects = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, current
+
+
+def _best(func, value, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(value)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'kaynak':<11} {'yöntem':<24} {'bellek KB':>10} {'B/kayıt':>8} {'encode ms':>10} {'çıktı KB':>9}")
+    for source, items_field, parse in SOURCES:
+        parsed = [item for item in parse() if item is not None]
+        record_type = type(parsed[0])
+        values = [parsed[i % len(parsed)].to_row() for i in range(args.count)]
+        fields = record_type.FIELDS
+
+        dicts, dict_bytes = _allocated(lambda: [dict(zip(fields, row)) for row in values])
+        records, record_bytes = _allocated(lambda: [record_type(**dict(zip(fields, row))) for row in values])
+
+        body_dicts = {"source": source, f"{source}_count": len(dicts), items_field: dicts}
+        body_records = {"source": source, f"{source}_count": len(records), items_field: records}
+
+        legacy = _legacy_dumps(body_dicts)
+        for label, fast in (("plain", _plain_dumps(body_records)), ("doğrudan", model_modul.dumps(body_records))):
+            if json.loads(legacy) != json.loads(fast):
+                failed = True
+                print(f"❌ {source}: kayıt çıktısı ({label}) sözlük çıktısından farklı")
+            # json.loads karşılaştırması anahtar sırasını görmez; sırayı ayrıca kontrol et
+            if list(json.loads(fast)[items_field][0]) != list(json.loads(legacy)[items_field][0]):
+                failed = True
+                print(f"❌ {source}: kayıt çıktısında ({label}) alan sırası farklı")
+
+        variants = [
+            ("eski: sözlük+encoder", dict_bytes, _legacy_dumps, body_dicts),
+            ("sözlük+dumps", dict_bytes, model_modul.dumps, body_dicts),
+            ("kayıt→plain+dumps", record_bytes, _plain_dumps, body_records),
+            ("kayıt+dumps (çevrimsiz)", record_bytes, model_modul.dumps, body_records),
+        ]
+        body_rows = {"source": source, items_field: model_modul.rows(records, fields)}
+        variants.append(("kayıt, satır biçimi", record_bytes, model_modul.dumps, body_rows))
+
+        for label, memory, encode, body in variants:
+            elapsed = _best(encode, body, args.repeat)
+            size = len(encode(body))
+            print(f"{source:<11} {label:<24} {memory / 1024:>10.0f} {memory / args.count:>8.0f} "
+                  f"{elapsed * 1000:>10.1f} {size / 1024:>9.0f}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
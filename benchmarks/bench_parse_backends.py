@@ -0,0 +1,89 @@
+"""
+HTML parser arka ucu benchmark'ı (çevrimdışı).
+
+Her sabit sayfa için eski yöntem (html.parser, tüm belge) ile alt ağaca
+kısıtlanmış html.parser ve lxml'i karşılaştırır. Çıkarılan sözlüklerin eski
+yöntemle birebir aynı olduğunu doğrular; parse süresini ve tepe bellek
+kullanımını (tracemalloc) yazdırır. Sözlükler farklıysa 1 ile çıkar.
+
+Kullanım:
+    python benchmarks/bench_parse_backends.py --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import biletinial_modul  # noqa: E402
+import bubilet_modul  # noqa: E402
+import burs_microfon  # noqa: E402
+import parser_modul  # noqa: E402
+import fixture_pages  # noqa: E402
+
+
+FIXTURES = [
+    ("biletinial-small", fixture_pages.biletinial_page(30),
+     lambda html, backend: biletinial_modul.parse_events_html(html, "İstanbul", "tiyatro", backend)),
+    ("biletinial-large", fixture_pages.biletinial_page(1500),
+     lambda html, backend: biletinial_modul.parse_events_html(html, "İstanbul", "tiyatro", backend)),
+    ("microfon-page", fixture_pages.microfon_page(20),
+     lambda html, backend: burs_microfon._parse_page_html(html, backend)),
+    ("microfon-no-results", fixture_pages.microfon_no_results_page(),
+     lambda html, backend: burs_microfon._parse_page_html(html, backend)),
+    ("bubilet-small", fixture_pages.bubilet_page(40),
+     lambda html, backend: bubilet_modul.parse_cards_html(html, bubilet_modul.BASE_URL, "istanbul", "tiyatro", backend)),
+    ("bubilet-large", fixture_pages.bubilet_page(1200),
+     lambda html, backend: bubilet_modul.parse_cards_html(html, bubilet_modul.BASE_URL, "istanbul", "tiyatro", backend)),
+]
+
+# (ad, arka uç, alt ağaç kısıtlaması)
+VARIANTS = [("eski: html.parser", "html.parser", False), ("html.parser+strainer", "html.parser", True)]
+if parser_modul.HAS_LXML:
+    VARIANTS.append(("lxml+strainer", "lxml", True))
+
+
+def _measure(func, html, backend, scoped, repeat):
+    parser_modul.SCOPED_PARSING = scoped
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(html, backend)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    output = func(html, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    mismatches = 0
+    print(f"{'sayfa':<22} {'KB':>6} {'yöntem':<22} {'ms':>9} {'tepe MB':>8} {'aynı':>5}")
+    for name, html, func in FIXTURES:
+        baseline = None
+        for label, backend, scoped in VARIANTS:
+            output, elapsed, peak = _measure(func, html, backend, scoped, args.repeat)
+            if baseline is None:
+                baseline = output
+            same = output == baseline
+            mismatches += not same
+            print(f"{name:<22} {len(html) // 1024:>6} {label:<22} {elapsed * 1000:>9.2f} "
+                  f"{peak / 1024 / 1024:>8.2f} {'evet' if same else 'HAYIR':>5}")
+
+    parser_modul.SCOPED_PARSING = True
+    if mismatches:
+        print(f"\n❌ {mismatches} çıktı eski yöntemden farklı.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Çevrimdışı parser benchmark paketi.
+
+benchmarks/fixtures altındaki kayıtlı liste sayfaları (küçük ve çok büyük
+Biletinial / Bubilet sayfaları, Bubilet scroll anlık görüntüleri, Microfon
+sayfaları) ve tarih metinleri üzerinde sıcak fonksiyonları ölçer:
+
+    biletinial: parse_events_html (scrape_events_from_city'nin ağ dışı kısmı), parse_date_range
+    bubilet:    parse_cards_html, parse_event_card, parse_date_range
+    microfon:   _parse_page_html, _extract_card
+
+Her ölçüm için saniyedeki kart / tarih sayısı, tepe bellek ve çalışma sonunda
+ayrılmış kalan blok sayısı (tracemalloc) raporlanır; sonuçlar JSON dosyasına
+yazılır. Çıktılar fixtures/golden altındaki beklenen çıktılarla karşılaştırılır,
+hız ve bellek thresholds.json'daki sınırlarla denetlenir. Fark veya gerileme
+varsa 1 ile çıkar. Tarihler REFERENCE_DATE ile sabitlenir (yıl tahmini
+bugünün tarihine bağlı olmasın).
+
+Kullanım:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --only bubilet --output sonuc.json
+    python benchmarks/bench_suite.py --update-golden        # çıktı bilerek değiştiyse
+    python benchmarks/bench_suite.py --update-thresholds    # ölçüm makinesi değiştiyse
+    python benchmarks/bench_suite.py --regenerate-fixtures  # sayfaları fixture_pages'ten yeniden üret
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import biletinial_modul  # noqa: E402
+import bubilet_modul  # noqa: E402
+import burs_microfon  # noqa: E402
+import model_modul  # noqa: E402
+import parser_modul  # noqa: E402
+import tarih_modul  # noqa: E402
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+GOLDEN_DIR = os.path.join(FIXTURE_DIR, "golden")
+THRESHOLDS_PATH = os.path.join(BENCH_DIR, "thresholds.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "bench_results.json")
+
+REFERENCE_DATE = datetime.date(2025, 1, 15)
+
+# --update-thresholds: hız ölçülenin bu oranına, bellek bu katına kadar gerileyebilir
+THROUGHPUT_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 1.5
+MEMORY_SLACK_KB = 64  # Çok küçük ölçümlerde tracemalloc gürültüsü için
+
+# Dosya adı -> fixture_pages üreticisi (--regenerate-fixtures için)
+PAGES = {
+    "biletinial-small.html": lambda fp: fp.biletinial_page(30),
+    "biletinial-large.html": lambda fp: fp.biletinial_page(1000),
+    "microfon-page.html": lambda fp: fp.microfon_page(20),
+    "microfon-no-results.html": lambda fp: fp.microfon_no_results_page(),
+    "bubilet-small.html": lambda fp: fp.bubilet_page(40),
+    "bubilet-large.html": lambda fp: fp.bubilet_page(800),
+}
+SCROLL_TOTAL, SCROLL_STEP = 400, 100
+DATE_COUNT = 2000
+
+
+def regenerate_fixtures():
+    import random
+
+    import fixture_pages
+
+    os.makedirs(os.path.join(FIXTURE_DIR, "bubilet-scroll"), exist_ok=True)
+    for name, build in PAGES.items():
+        _write(os.path.join(FIXTURE_DIR, name), build(fixture_pages))
+    snapshots = fixture_pages.bubilet_scroll_snapshots(SCROLL_TOTAL, SCROLL_STEP)
+    for i, html in enumerate(snapshots, 1):
+        _write(os.path.join(FIXTURE_DIR, "bubilet-scroll", f"step-{i:02d}.html"), html)
+    rng = random.Random(7)
+    dates = [fixture_pages._date_text(rng) for _ in range(DATE_COUNT)]
+    _write(os.path.join(FIXTURE_DIR, "dates.json"), json.dumps(dates, ensure_ascii=False, indent=0))
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+
+
+def _read(*parts):
+    with open(os.path.join(FIXTURE_DIR, *parts), encoding="utf-8") as f:
+        return f.read()
+
+
+def _scroll_snapshots():
+    folder = os.path.join(FIXTURE_DIR, "bubilet-scroll")
+    return [(name[:-5], _read("bubilet-scroll", name)) for name in sorted(os.listdir(folder)) if name.endswith(".html")]
+
+
+def _bubilet_cards(html):
+    soup = parser_modul.make_soup(html, parser_modul.BUBILET_CARDS)
+    return soup.find_all("a", class_="group block")
+
+
+def _microfon_cards(html):
+    soup = parser_modul.make_soup(html, parser_modul.MICROFON_CARDS)
+    return soup.select("div.scholarship-item")
+
+
+def _cold(parse):
+    """Tarih önbelleğini her çalışmada boşaltarak ilk görülen metinlerin hızını ölçer."""
+    def run(texts):
+        tarih_modul._parse.cache_clear()
+        return [parse(text) for text in texts]
+    return run
+
+
+def build_benchmarks():
+    """(ad, birim, fonksiyon, argüman, birim sayısı) listesi. Fonksiyonun çıktısı golden ile karşılaştırılır."""
+    city, category = "İstanbul", "tiyatro"
+    benches = []
+
+    for size in ("small", "large"):
+        content = _read(f"biletinial-{size}.html").encode("utf-8")
+        count = len(biletinial_modul.parse_events_html(content, city, category))
+        benches.append((f"biletinial.parse_events_html[{size}]", "cards",
+                        lambda c: biletinial_modul.parse_events_html(c, city, category), content, count))
+
+    for size in ("small", "large"):
+        html = _read(f"bubilet-{size}.html")
+        benches.append((f"bubilet.parse_cards_html[{size}]", "cards",
+                        lambda h: bubilet_modul.parse_cards_html(h, bubilet_modul.BASE_URL, city, category)[1],
+                        html, len(_bubilet_cards(html))))
+    for name, html in _scroll_snapshots():
+        benches.append((f"bubilet.parse_cards_html[scroll/{name}]", "cards",
+                        lambda h: bubilet_modul.parse_cards_html(h, bubilet_modul.BASE_URL, city, category)[1],
+                        html, len(_bubilet_cards(html))))
+    cards = _bubilet_cards(_read("bubilet-large.html"))
+    benches.append(("bubilet.parse_event_card", "cards",
+                    lambda cs: [bubilet_modul.parse_event_card(c, bubilet_modul.BASE_URL, city, category) for c in cs],
+                    cards, len(cards)))
+
+    for name in ("page", "no-results"):
+        html = _read(f"microfon-{name}.html")
+        benches.append((f"microfon._parse_page_html[{name}]", "cards",
+                        burs_microfon._parse_page_html, html, max(1, len(_microfon_cards(html)))))
+    cards = _microfon_cards(_read("microfon-page.html"))
+    benches.append(("microfon._extract_card", "cards",
+                    lambda cs: [burs_microfon._extract_card(c) for c in cs], cards, len(cards)))
+
+    dates = json.loads(_read("dates.json"))
+    for module in (biletinial_modul, bubilet_modul):
+        label = module.__name__.replace("_modul", "")
+        benches.append((f"{label}.parse_date_range[cold]", "dates", _cold(module.parse_date_range), dates, len(dates)))
+        benches.append((f"{label}.parse_date_range[warm]", "dates",
+                        lambda texts, parse=module.parse_date_range: [parse(t) for t in texts], dates, len(dates)))
+    return benches
+
+
+def _json_default(value):
+    return value.to_dict() if isinstance(value, model_modul.Record) else str(value)
+
+
+def _normalise(output):
+    # Tuple / namedtuple'lar JSON'da listeye, kayıtlar sözlüğe döner; golden dosyasıyla aynı biçim
+    return json.loads(json.dumps(output, ensure_ascii=False, default=_json_default))
+
+
+def _golden_path(name):
+    safe = name.replace("/", "_").replace("[", "-").replace("]", "")
+    return os.path.join(GOLDEN_DIR, f"{safe}.json")
+
+
+def _first_difference(expected, actual):
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return f"uzunluk {len(expected)} != {len(actual)}"
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            if a != b:
+                if isinstance(a, dict) and isinstance(b, dict):
+                    keys = sorted(k for k in set(a) | set(b) if a.get(k) != b.get(k))
+                    return f"[{i}] alanlar: " + ", ".join(f"{k}: {a.get(k)!r} -> {b.get(k)!r}" for k in keys)
+                return f"[{i}] beklenen {a!r}, çıkan {b!r}"
+    return "çıktı farklı"
+
+
+def measure(func, arg, units, repeat):
+    timer = timeit.Timer(lambda: func(arg))
+    number, _ = timer.autorange()
+    runs = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+
+    tracemalloc.start()
+    output = func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    retained = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+
+    best = min(runs)
+    return output, {
+        "units": units,
+        "best_sec": best,
+        "median_sec": statistics.median(runs),
+        "per_sec": units / best if best else None,
+        "peak_kb": round(peak / 1024, 1),
+        "retained_blocks": retained,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Adında bu metin geçen benchmark'lar çalışır")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--update-golden", action="store_true")
+    parser.add_argument("--update-thresholds", action="store_true")
+    parser.add_argument("--regenerate-fixtures", action="store_true")
+    args = parser.parse_args()
+
+    if args.regenerate_fixtures:
+        regenerate_fixtures()
+    tarih_modul.REFERENCE_DATE = REFERENCE_DATE
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+
+    thresholds = {"min_per_sec": {}, "max_peak_kb": {}}
+    if os.path.exists(THRESHOLDS_PATH):
+        with open(THRESHOLDS_PATH, encoding="utf-8") as f:
+            thresholds = json.load(f)
+
+    results, failures = [], []
+    print(f"{'benchmark':<44} {'birim/sn':>12} {'ms':>9} {'tepe KB':>9} {'kalan blok':>10}  golden")
+    for name, unit, func, arg, units in build_benchmarks():
+        if args.only and args.only not in name:
+            continue
+        output, stats = measure(func, arg, units, args.repeat)
+        output = _normalise(output)
+
+        golden_path = _golden_path(name)
+        if args.update_golden or not os.path.exists(golden_path):
+            with open(golden_path, "w", encoding="utf-8", newline="\n") as f:
+                json.dump(output, f, ensure_ascii=False, indent=0, sort_keys=True)
+            golden = "yazıldı"
+        else:
+            with open(golden_path, encoding="utf-8") as f:
+                expected = json.load(f)
+            golden = "aynı" if expected == output else "FARKLI"
+            if expected != output:
+                failures.append(f"{name}: golden çıktıdan farklı ({_first_difference(expected, output)})")
+
+        if args.update_thresholds:
+            thresholds["min_per_sec"][name] = round(stats["per_sec"] * THROUGHPUT_TOLERANCE, 1)
+            thresholds["max_peak_kb"][name] = round(stats["peak_kb"] * MEMORY_TOLERANCE + MEMORY_SLACK_KB, 1)
+        else:
+            min_rate = thresholds["min_per_sec"].get(name)
+            max_peak = thresholds["max_peak_kb"].get(name)
+            if min_rate is not None and stats["per_sec"] < min_rate:
+                failures.append(f"{name}: {stats['per_sec']:.0f} {unit}/sn < sınır {min_rate}")
+            if max_peak is not None and stats["peak_kb"] > max_peak:
+                failures.append(f"{name}: tepe bellek {stats['peak_kb']} KB > sınır {max_peak} KB")
+
+        results.append({"name": name, "unit": unit, "golden": golden, **stats})
+        print(f"{name:<44} {stats['per_sec']:>12,.0f} {stats['best_sec'] * 1000:>9.3f} "
+              f"{stats['peak_kb']:>9.1f} {stats['retained_blocks']:>10}  {golden}")
+
+    if args.update_thresholds:
+        with open(THRESHOLDS_PATH, "w", encoding="utf-8", newline="\n") as f:
+            json.dump(thresholds, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parser_backend": parser_modul.resolve_backend(),
+        "reference_date": REFERENCE_DATE.isoformat(),
+        "repeat": args.repeat,
+        "benchmarks": results,
+        "failures": failures,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar: {args.output}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} sorun:")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
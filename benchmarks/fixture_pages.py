@@ -0,0 +1,128 @@
+"""
+Benchmark'lar için sentetik liste sayfaları.
+
+Sayfalar, scraper'ların okuduğu işaretlemeyi (Biletinial kategori listesi,
+Microfon burs kartları, Bubilet a.group.block kartları) ve etrafındaki tipik
+gürültüyü (head, script, menü, footer) aynı tohumla her seferinde aynı üretir.
+"""
+import random
+
+MONTHS = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+          "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+DAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+VENUES = ["Zorlu PSM", "Harbiye Açıkhava", "Maximum Uniq Hall", "CSO Ada Ankara",
+          "AKM Türk Telekom Opera Salonu", "İzmir Sanat", "Bostancı Gösteri Merkezi"]
+CITIES = ["İstanbul", "Ankara", "İzmir", "Eskişehir", "Bursa"]
+WORDS = ["Hamlet", "Gece", "Yolculuk", "Senfoni", "Aşk", "Masal", "Kahkaha", "Rüya",
+         "Şarkı", "Işık", "Gölge", "Deniz", "Öykü", "Çığlık", "Dans", "Sessizlik"]
+
+
+def _title(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def _date_text(rng):
+    """Sitelerde görülen farklı tarih yazımlarından birini üretir."""
+    m1, m2 = rng.randrange(12), rng.randrange(12)
+    d1, d2 = rng.randint(1, 28), rng.randint(1, 28)
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"{MONTHS[m1]} - {d1} {MONTHS[m2]} - {d2}"
+    if kind == 1:
+        return f"{d1} {MONTHS[m1]} {rng.choice(DAYS)} {rng.randint(10, 22)}:{rng.choice(['00', '30'])}"
+    if kind == 2:
+        return f"{d1} {MONTHS[m1]} - {d2} {MONTHS[m2]}"
+    if kind == 3:
+        return f"{d1}.{MONTHS[m1]}"
+    return "Tarih Belirtilmemiş"
+
+
+def _noise(rng, blocks):
+    parts = ["<nav><ul>" + "".join(f"<li><a href='/m/{i}'>Menü {i}</a></li>" for i in range(30)) + "</ul></nav>"]
+    for i in range(blocks):
+        parts.append(
+            f"<section class='promo promo-{i}'><div><div><span>{_title(rng)}</span>"
+            f"<img src='/static/p{i}.png'><p>{' '.join(rng.choice(WORDS) for _ in range(40))}</p></div></div></section>"
+        )
+    return "".join(parts)
+
+
+def _document(body, rng, noise_blocks):
+    head = "<head><meta charset='utf-8'><title>Liste</title>" + "".join(
+        f"<script>window.__c{i} = {{a: {i}, b: '{'x' * 200}'}};</script>" for i in range(20)
+    ) + "<style>" + ".c{color:red}" * 500 + "</style></head>"
+    return (
+        f"<!DOCTYPE html><html lang='tr'>{head}<body>{_noise(rng, noise_blocks)}"
+        f"<main>{body}</main><footer>{_noise(rng, noise_blocks // 2)}</footer></body></html>"
+    )
+
+
+def biletinial_page(count, seed=1):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        title = _title(rng)
+        if rng.random() < 0.1:
+            address = "<address>Birden fazla mekanda</address>"
+        else:
+            address = f"<address><b>{rng.choice(CITIES)}</b><small>{rng.choice(VENUES)}</small></address>"
+        date_text = _date_text(rng)
+        if rng.random() < 0.5:
+            date_html = f"<p class='dates'>{date_text}</p>"
+        else:
+            date_html = f"<span>{date_text}</span>"
+        items.append(
+            f"<li><figure><a href='/tr-tr/tiyatro/etkinlik-{i}'>"
+            f"<img data-src='https://b6s54eznn8xq.merlincdn.net/Uploads/Films/{i}.jpg' src='/img/lazy.png'></a></figure>"
+            f"<h3><a title=' {title} ' href='/tr-tr/tiyatro/etkinlik-{i}'>{title}</a></h3>"
+            f"{address}{date_html}</li>"
+        )
+    body = f"<div class='kategori__etkinlikler'><ul>{''.join(items)}</ul></div>"
+    return _document(body, rng, max(10, count // 5))
+
+
+def microfon_page(count, seed=1, start=0):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(start, start + count):
+        cards.append(
+            "<div class='scholarship-item sc-a1'>"
+            f"<img alt='Burs İlanı Görseli' src='/uploads/burs-{i}.png'>"
+            f"<p class='styled-h6'>{_title(rng)} Vakfı</p>"
+            f"<a href='/scholarship/burs-{i}'>{_title(rng)} Bursu</a>"
+            f"<div class='sc-x istbwq'><span>{rng.choice(CITIES)}</span><span>Üniversite</span></div>"
+            f"<div class='sc-y jGQIFV'><span>{rng.randint(1, 9)}.000 TL</span><p>{rng.randint(1, 12)} Ay</p></div>"
+            f"<p class='clamp-3'>{' '.join(rng.choice(WORDS) for _ in range(60))}</p>"
+            f"<small>{rng.randint(1, 28):02d}.0{rng.randint(1, 9)}.2026 - {rng.randint(1, 28):02d}.1{rng.randint(0, 2)}.2026</small>"
+            "</div>"
+        )
+    return _document(f"<div class='list'>{''.join(cards)}</div>", rng, max(10, count))
+
+
+def microfon_no_results_page(seed=1):
+    rng = random.Random(seed)
+    return _document("<p>Aradığınız kriterlere uygun bir sonuç bulunamadı.</p>", rng, 10)
+
+
+def _bubilet_card(rng, i):
+    src = "data:image/gif;base64,R0lGOD" if rng.random() < 0.3 else f"https://cdn.bubilet.com.tr/{i}.webp"
+    price = f"<span class='text-[#00c656] font-bold'>{rng.randint(100, 2000)} TL</span>" if rng.random() < 0.8 else ""
+    return (
+        f"<a class='group block' href='/istanbul/etkinlik/etkinlik-{i}'>"
+        f"<div class='relative'><img src='{src}' srcset='https://cdn.bubilet.com.tr/{i}-s.webp 1x, "
+        f"https://cdn.bubilet.com.tr/{i}-l.webp 2x'></div>"
+        f"<h3 class='font-semibold'> {_title(rng)} </h3>"
+        f"<p class='text-gray-500 text-sm'>{rng.choice(VENUES)}</p>"
+        f"<p class='text-gray-500 text-sm'>{_date_text(rng)}</p>{price}</a>"
+    )
+
+
+def bubilet_page(count, seed=1):
+    rng = random.Random(seed)
+    cards = "".join(_bubilet_card(rng, i) for i in range(count))
+    return _document(f"<div class='grid'>{cards}</div>", rng, max(10, count // 5))
+
+
+def bubilet_scroll_snapshots(total, step, seed=1):
+    """Sonsuz scroll sırasında page_source'un her adımdaki hali (kart sayısı büyüyerek)."""
+    return [bubilet_page(count, seed) for count in range(step, total + step, step)]
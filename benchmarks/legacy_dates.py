@@ -0,0 +1,199 @@
+"""
+Ortak tarih modülünden önceki parse_date_range kopyaları (değiştirilmeden).
+
+Yalnızca benchmarks/bench_dates.py tarafından hız ve çıktı karşılaştırması için kullanılır.
+"""
+import datetime
+import re
+
+MONTH_MAP = {
+    "ocak": 1, "şubat": 2, "mart": 3, "nisan": 4, "mayıs": 5, "haziran": 6,
+    "temmuz": 7, "ağustos": 8, "eylül": 9, "ekim": 10, "kasım": 11, "aralık": 12
+}
+
+
+def biletinial_parse_date_range(date_text):
+    """
+    Karmaşık tarih metinlerini (Örn: "Kasım - 28 Ocak - 31") doğru ayrıştırır.
+    Şu anki tarihe göre yıl ataması yapar (Gelecek yıl kontrolü).
+    En erken ve en geç tarihi döndürür.
+    """
+    if not date_text:
+        return None
+
+    # Şu anki zaman bilgisi
+    now = datetime.datetime.now()
+    current_year = now.year
+    current_month = now.month
+    
+    parsed_dates = []
+
+    # Regex ile Ay isimlerini yakalamak için pattern (büyük küçük harf duyarsız olması için flag kullanacağız)
+    # Bu pattern tüm Türkçe ay isimlerini içerir.
+    month_pattern = r"(ocak|şubat|mart|nisan|mayıs|haziran|temmuz|ağustos|eylül|ekim|kasım|aralık)"
+
+    # --- STRATEJİ 1: "Ay Adı [ayraç] Gün" Formatı (Örn: Kasım - 28, Kasım 28) ---
+    # Bu format, senin örneğindeki hatayı çözen kısımdır.
+    # Pattern açıklaması: Ay ismi + (boşluk veya tire) + Sayı
+    regex_month_first = f"{month_pattern}\s*[-.]?\s*(\d{{1,2}})"
+    matches_month_first = re.findall(regex_month_first, date_text.lower(), re.IGNORECASE)
+
+    # --- STRATEJİ 2: "Gün [ayraç] Ay Adı" Formatı (Örn: 28 Kasım) ---
+    # Standart yazım şekli
+    regex_day_first = f"(\d{{1,2}})\s*[-.]?\s*{month_pattern}"
+    matches_day_first = re.findall(regex_day_first, date_text.lower(), re.IGNORECASE)
+
+    # Hangi format daha çok sonuç verdiyse veya metin yapısına göre birleştirme mantığı
+    # Burada çakışmayı önlemek için basit bir önceliklendirme yapacağız.
+    # Eğer "Ay - Gün" formatı (senin örneğin) varsa öncelik onundur.
+    
+    final_matches = []
+
+    # Veriyi işlenebilir formata (Gün, Ay İsmi) çevirip listeye atalım
+    if matches_month_first:
+        for m_name, d_str in matches_month_first:
+            final_matches.append((int(d_str), m_name))
+    
+    # Eğer ilk strateji sonuç vermediyse veya ek tarihler varsa ikinciyi kontrol et
+    # Not: Aynı metinde iki formatın karışık olması nadirdir ama yine de ekleyelim
+    if matches_day_first and not final_matches:
+        for d_str, m_name in matches_day_first:
+            final_matches.append((int(d_str), m_name))
+            
+    # Eğer hala boşsa ve karışık durum varsa (Matches month first kısmi yakaladıysa vs)
+    if not final_matches and matches_day_first:
+         for d_str, m_name in matches_day_first:
+            final_matches.append((int(d_str), m_name))
+
+
+    # --- TARİHLERİ OLUŞTURMA VE YIL HESABI ---
+    for day, month_str in final_matches:
+        # Ay ismini sayıya çevir
+        # Türkçe karakter sorunu olmaması için map içinde geziyoruz
+        month_val = 0
+        cleaned_month = month_str.lower().replace('ı', 'i') # basit normalizasyon
+        
+        # Tam eşleşme veya başlangıç eşleşmesi (örn: "kas" -> kasım)
+        for k, v in MONTH_MAP.items():
+            if month_str.startswith(k[:3]): 
+                month_val = v
+                break
+        
+        if month_val > 0:
+            year = current_year
+            
+            # --- KRİTİK YIL MANTIĞI ---
+            # Mevcut ay (Örn: 11-Kasım) ve Gelen Veri (Örn: 1-Ocak)
+            # Etkinlik ayı, şu anki aydan küçükse, etkinlik önümüzdeki yıldır.
+            if month_val < current_month:
+                year += 1
+            
+            # Ayrıca: Eğer ay aynıysa (Kasım) ama gün geçmişse (Bugün 27, Etkinlik 10 Kasım),
+            # Bu genellikle bir sonraki yılın etkinliğidir (Senede bir olanlar vb.)
+            # Ancak sinema/tiyatroda genelde geçmiş etkinlik listelenmez, o yüzden gün kontrolünü
+            # opsiyonel bırakıyoruz, ama ay kontrolü şart.
+            
+            try:
+                dt = datetime.date(year, month_val, day)
+                parsed_dates.append(dt)
+            except ValueError:
+                continue
+
+    if not parsed_dates:
+        return date_text # Parse edilemedi
+
+    # Sıralama: En erken tarih en başa, en geç en sona
+    parsed_dates.sort()
+    
+    min_date = parsed_dates[0]
+    max_date = parsed_dates[-1]
+    
+    fmt = "%d.%m.%Y"
+    
+    if min_date == max_date:
+        return min_date.strftime(fmt)
+    else:
+        return f"{min_date.strftime(fmt)} - {max_date.strftime(fmt)}"
+
+
+def bubilet_parse_date_range(date_text):
+    """Tarih metnini parse eder ve DD.MM.YYYY formatında döndürür."""
+    if not date_text:
+        return None
+    
+    cleaned_text = date_text.lower()
+    
+    # Gün isimlerini temizle
+    days_to_remove = r"(pazartesi|salı|çarşamba|perşembe|cuma|cumartesi|pazar|pzt|sal|çar|per|cum|cmt|paz|cmrt)"
+    cleaned_text = re.sub(days_to_remove, '', cleaned_text, flags=re.IGNORECASE)
+    
+    # Saat bilgilerini temizle
+    cleaned_text = re.sub(r"\d{1,2}:\d{2}", '', cleaned_text)
+    
+    # Fazla boşlukları temizle
+    cleaned_text = re.sub(r"[\s\/\.]+", ' ', cleaned_text).strip()
+    
+    now = datetime.datetime.now()
+    current_year = now.year
+    current_month = now.month
+    parsed_dates = []
+    
+    month_pattern = r"(ocak|şubat|mart|nisan|mayıs|haziran|temmuz|ağustos|eylül|ekim|kasım|aralık)"
+    
+    # Ay-Gün formatı
+    regex_month_first = f"{month_pattern}\\s*[-.]?\\s*(\\d{{1,2}})"
+    matches_month_first = re.findall(regex_month_first, cleaned_text, re.IGNORECASE)
+    
+    # Gün-Ay formatı
+    regex_day_first = f"(\\d{{1,2}})\\s*[-.]?\\s*{month_pattern}"
+    matches_day_first = re.findall(regex_day_first, cleaned_text, re.IGNORECASE)
+    
+    final_matches = []
+    
+    if matches_month_first:
+        for m_name, d_str in matches_month_first:
+            final_matches.append((int(d_str), m_name))
+    
+    if matches_day_first:
+        for d_str, m_name in matches_day_first:
+            current_tuple = (int(d_str), m_name)
+            is_duplicate = False
+            for d, m in final_matches:
+                if d == current_tuple[0] and m.lower().startswith(current_tuple[1].lower()[:3]):
+                    is_duplicate = True
+                    break
+            if not is_duplicate:
+                final_matches.append(current_tuple)
+    
+    for day, month_str in final_matches:
+        month_val = 0
+        for k, v in MONTH_MAP.items():
+            if month_str.lower().startswith(k[:3]):
+                month_val = v
+                break
+        
+        if month_val > 0:
+            year = current_year
+            if month_val < current_month:
+                year += 1
+            elif month_val == current_month and day < now.day:
+                year += 1
+            
+            try:
+                dt = datetime.date(year, month_val, day)
+                parsed_dates.append(dt)
+            except ValueError:
+                continue
+    
+    if not parsed_dates:
+        return date_text
+    
+    parsed_dates.sort()
+    min_date = parsed_dates[0]
+    max_date = parsed_dates[-1]
+    fmt = "%d.%m.%Y"
+    
+    if min_date == max_date:
+        return min_date.strftime(fmt)
+    else:
+        return f"{min_date.strftime(fmt)} - {max_date.strftime(fmt)}"
@@ -0,0 +1,163 @@
+"""
+API yük testi: N eşzamanlı istemciyle endpoint'lere istek atar ve endpoint başına
+p50/p95/p99 gecikmeyi, saniyedeki isteği ve hata sayısını raporlar.
+
+Kaynak sitelere yük bindirmemek için API, replay sunucusuna yönlendirilmiş olarak
+çalıştırılmalıdır (bkz. replay_server.py). Önbellek her isteği karşılamasın diye
+--refresh ile canlı tarama zorlanabilir.
+
+Senaryo dosyası (JSON) verilmezse varsayılan senaryo kullanılır:
+    [{"name": "biletinial", "method": "POST", "path": "/scrape/biletinial",
+      "json": [{"city": "istanbul", "category": "tiyatro"}, ...]}, ...]
+"json" liste ise her istekte sıradaki gövde kullanılır.
+
+Kullanım:
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --clients 16 --duration 30 --refresh
+    python benchmarks/load_test.py --scenario senaryo.json --requests 500 --output sonuc.json
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+
+import requests
+
+CITIES = ["istanbul", "ankara", "izmir", "bursa", "antalya", "eskisehir"]
+
+DEFAULT_SCENARIO = [
+    {"name": "biletinial", "method": "POST", "path": "/scrape/biletinial",
+     "json": [{"city": city, "category": category} for city in CITIES for category in ("tiyatro", "sinema", "muzik")]},
+    {"name": "microfon", "method": "POST", "path": "/scrape/microfon",
+     "json": [{"level": level} for level in ("lise", "universite", "ilkokul")]},
+    {"name": "events", "method": "GET", "path": "/events?q=hamlet&limit=20"},
+    {"name": "stats", "method": "GET", "path": "/stats"},
+]
+
+
+def percentile(sorted_values, p):
+    """En yakın sıra yöntemiyle yüzdelik (sorted_values sıralı olmalı)."""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Endpoint:
+    def __init__(self, spec, refresh):
+        self.name = spec.get("name") or spec["path"]
+        self.method = spec.get("method", "GET").upper()
+        self.path = spec["path"]
+        if refresh and self.method == "POST":
+            self.path += ("&" if "?" in self.path else "?") + "refresh=true"
+        bodies = spec.get("json")
+        self._bodies = itertools.cycle(bodies if isinstance(bodies, list) else [bodies])
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+
+    def next_body(self):
+        with self._lock:
+            return next(self._bodies)
+
+    def record(self, latency, status):
+        with self._lock:
+            self.latencies.append(latency)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if not isinstance(status, int) or status >= 400:
+                self.errors += 1
+
+    def report(self, elapsed):
+        values = sorted(self.latencies)
+        return {
+            "requests": len(values),
+            "errors": self.errors,
+            "statuses": {str(k): v for k, v in self.statuses.items()},
+            "throughput": round(len(values) / elapsed, 2) if elapsed else None,
+            "p50_ms": round(percentile(values, 50) * 1000, 1) if values else None,
+            "p95_ms": round(percentile(values, 95) * 1000, 1) if values else None,
+            "p99_ms": round(percentile(values, 99) * 1000, 1) if values else None,
+            "max_ms": round(values[-1] * 1000, 1) if values else None,
+        }
+
+
+def run(base_url, endpoints, clients, duration=None, total_requests=None, timeout=120):
+    """
+    İstemciler endpoint'leri sırayla dolaşır. duration saniye dolana veya
+    total_requests isteğe ulaşılana kadar çalışır. Geçen süreyi döndürür.
+    """
+    order = itertools.cycle(endpoints)
+    order_lock = threading.Lock()
+    sent = itertools.count()
+    deadline = time.monotonic() + duration if duration else None
+
+    def client():
+        session = requests.Session()
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if total_requests is not None and next(sent) >= total_requests:
+                break
+            with order_lock:
+                endpoint = next(order)
+            body = endpoint.next_body() if endpoint.method == "POST" else None
+            started = time.perf_counter()
+            try:
+                response = session.request(endpoint.method, base_url + endpoint.path, json=body, timeout=timeout)
+                response.content
+                status = response.status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            endpoint.record(time.perf_counter() - started, status)
+        session.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, name=f"client-{i}") for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, help="Test süresi (sn)")
+    parser.add_argument("--requests", type=int, help="Toplam istek sayısı")
+    parser.add_argument("--scenario", help="Endpoint listesi içeren JSON dosyası")
+    parser.add_argument("--refresh", action="store_true", help="POST isteklerinde önbelleği atla")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+    if args.duration is None and args.requests is None:
+        args.duration = 30
+
+    scenario = DEFAULT_SCENARIO
+    if args.scenario:
+        with open(args.scenario, encoding="utf-8") as f:
+            scenario = json.load(f)
+    endpoints = [Endpoint(spec, args.refresh) for spec in scenario]
+
+    print(f"{args.url} | {args.clients} istemci | "
+          f"{f'{args.duration} sn' if args.duration else f'{args.requests} istek'}")
+    elapsed = run(args.url.rstrip("/"), endpoints, args.clients, args.duration, args.requests, args.timeout)
+
+    reports = {endpoint.name: endpoint.report(elapsed) for endpoint in endpoints}
+    total = sum(report["requests"] for report in reports.values())
+    print(f"\n{'endpoint':<16} {'istek':>7} {'hata':>6} {'istek/sn':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, report in reports.items():
+        print(f"{name:<16} {report['requests']:>7} {report['errors']:>6} {report['throughput'] or 0:>9.1f} "
+              f"{report['p50_ms'] or 0:>9.1f} {report['p95_ms'] or 0:>9.1f} {report['p99_ms'] or 0:>9.1f}")
+    print(f"\nToplam: {total} istek, {elapsed:.1f} sn, {total / elapsed:.1f} istek/sn")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"url": args.url, "clients": args.clients, "elapsed": elapsed,
+                       "throughput": total / elapsed, "endpoints": reports}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
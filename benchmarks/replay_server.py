@@ -0,0 +1,258 @@
+"""
+Kaynak siteler yerine yük testinde kullanılacak yerel kayıt / tekrar sunucusu.
+
+record: Verilen sayfaları gerçek sitelerden indirip bir klasöre (manifest.json +
+        HTML dosyaları) kaydeder.
+serve:  Kayıtlı sayfaları aynı yol ve sorgu ile sunar. Kaydı olmayan Biletinial
+        kategori/şehir, Microfon ?pageNumber=&pageSize=&level= ve Bubilet
+        /{şehir}/etiket/{etiket} sayfaları için --synthetic verilirse
+        fixture_pages ile tohumu yoldan türetilen sabit sayfalar üretilir.
+        Gecikme ve hata oranı ayarlanabilir.
+
+Üç site tek portta sunulur; scraper'lar ortam değişkenleriyle yönlendirilir:
+    BILETINIAL_BASE_URL=http://127.0.0.1:8900 BUBILET_BASE_URL=http://127.0.0.1:8900 \\
+    MICROFON_BASE_URL=http://127.0.0.1:8900 uvicorn api:app
+Kaynak sitelerin hız sınırı (HTTP_SOURCE_RATE, HTTP_SOURCE_CONCURRENCY; 0 = sınırsız)
+*_BASE_URL ile yönlendirilen replay sunucusuna da uygulanır; API'nin kendi sınırını
+ölçmek için kapatılabilir.
+
+Bubilet kartları tarayıcıda JavaScript ile yüklendiği için kayıtlı Bubilet sayfası
+sunucunun gönderdiği HTML'dir; tarayıcısız HTTP yolunu (scrape_http) besler.
+
+Kullanım:
+    python benchmarks/replay_server.py record --capture-dir captures \\
+        --targets "biletinial:istanbul:tiyatro;microfon:lise:3;bubilet:ankara:konser"
+    python benchmarks/replay_server.py serve --capture-dir captures --port 8900 \\
+        --latency 0.15 --jitter 0.05 --error-rate 0.02 --synthetic
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import fixture_pages  # noqa: E402
+
+BILETINIAL_PATH = re.compile(r"^/tr-tr/[^/]+/[^/]+/?$")
+BUBILET_PATH = re.compile(r"^/[^/]+/etiket/[^/]+/?$")
+MICROFON_PATH = "/scholarship"
+RECORD_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/124.0.0.0 Safari/537.36",
+    "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+
+def request_key(path_and_query):
+    """Yol + sıralanmış sorgu: aynı sayfaya giden istekler aynı kaydı bulur."""
+    parts = urlsplit(path_and_query)
+    query = sorted(parse_qs(parts.query, keep_blank_values=True).items())
+    return parts.path + ("?" + urlencode(query, doseq=True) if query else "")
+
+
+# --- KAYIT ---
+def target_urls(targets):
+    """"kaynak:değer:değer;..." hedeflerini scraper'ların isteyeceği URL'lere çevirir."""
+    import biletinial_modul
+    import bubilet_modul
+    import burs_microfon
+
+    urls = []
+    for entry in filter(None, (part.strip() for part in targets.split(";"))):
+        source, *values = entry.split(":")
+        if source == "biletinial":
+            city, category = values
+            slug = biletinial_modul.CATEGORIES.get(category, "sinema")
+            urls.append(f"{biletinial_modul.BASE_URL}/tr-tr/{slug}/{city.lower()}")
+        elif source == "bubilet":
+            city, category = values
+            urls.append(f"{bubilet_modul.BASE_URL}/{bubilet_modul.url_hazirla(city)}"
+                        f"/etiket/{bubilet_modul.url_hazirla(category)}")
+        elif source == "microfon":
+            level, pages = values[0], int(values[1]) if len(values) > 1 else 1
+            level = burs_microfon._normalize_level(level)
+            urls.extend(burs_microfon._build_page_url(level, page) for page in range(1, pages + 1))
+        else:
+            raise ValueError(f"Geçersiz hedef: {entry}")
+    return urls
+
+
+def record(capture_dir, urls):
+    import http_modul
+
+    os.makedirs(capture_dir, exist_ok=True)
+    manifest_path = os.path.join(capture_dir, "manifest.json")
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    for url in urls:
+        response = http_modul.get(url, headers=RECORD_HEADERS)
+        parts = urlsplit(url)
+        key = request_key(parts.path + ("?" + parts.query if parts.query else ""))
+        filename = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".html"
+        with open(os.path.join(capture_dir, filename), "wb") as f:
+            f.write(response.content)
+        manifest[key] = {"file": filename, "status": response.status_code,
+                         "content_type": response.headers.get("Content-Type", "text/html; charset=utf-8")}
+        print(f"{response.status_code} {len(response.content) // 1024:>5} KB  {url}")
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+# --- TEKRAR ---
+def synthetic_page(key):
+    """Kaydı olmayan liste sayfası için yoldan türetilen sabit bir sayfa; tanınmayan yolda None."""
+    parts = urlsplit(key)
+    seed = int(hashlib.sha1(parts.path.encode("utf-8")).hexdigest()[:8], 16)
+    if BILETINIAL_PATH.match(parts.path):
+        return fixture_pages.biletinial_page(60 + seed % 120, seed)
+    if BUBILET_PATH.match(parts.path):
+        return fixture_pages.bubilet_page(40 + seed % 80, seed)
+    if parts.path == MICROFON_PATH:
+        query = parse_qs(parts.query)
+        page = int(query.get("pageNumber", ["1"])[0])
+        size = int(query.get("pageSize", ["20"])[0])
+        level = query.get("level", [""])[0]
+        pages = 2 + int(hashlib.sha1(level.encode("utf-8")).hexdigest()[:4], 16) % 4
+        if page > pages:
+            return fixture_pages.microfon_no_results_page(seed)
+        return fixture_pages.microfon_page(size, seed + page, (page - 1) * size)
+    return None
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, capture_dir=None, synthetic=False, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, seed=None):
+        super().__init__(address, ReplayHandler)
+        self.manifest = {}
+        self.capture_dir = capture_dir
+        if capture_dir:
+            with open(os.path.join(capture_dir, "manifest.json"), encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.synthetic = synthetic
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self._synthetic_cache = {}
+        self.counts = {"served": 0, "synthetic": 0, "missing": 0, "injected_errors": 0}
+
+    def lookup(self, key):
+        """(status, içerik tipi, gövde, sentetik mi) veya kayıt yoksa None."""
+        entry = self.manifest.get(key)
+        if entry is not None:
+            with open(os.path.join(self.capture_dir, entry["file"]), "rb") as f:
+                return entry["status"], entry["content_type"], f.read(), False
+        if self.synthetic:
+            body = self._synthetic_cache.get(key)
+            if body is None:
+                page = synthetic_page(key)
+                if page is None:
+                    return None
+                body = self._synthetic_cache[key] = page.encode("utf-8")
+            return 200, "text/html; charset=utf-8", body, True
+        return None
+
+    def draw(self):
+        """Bu istek için (gecikme, hata enjekte edilsin mi)."""
+        with self.random_lock:
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            return delay, self.random.random() < self.error_rate
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        delay, fail = server.draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            server.counts["injected_errors"] += 1
+            self._send(server.error_status, "text/plain; charset=utf-8", b"injected error")
+            return
+
+        found = server.lookup(request_key(self.path))
+        if found is None:
+            server.counts["missing"] += 1
+            self._send(404, "text/plain; charset=utf-8", b"not recorded")
+            return
+        status, content_type, body, synthetic = found
+        server.counts["synthetic" if synthetic else "served"] += 1
+        self._send(status, content_type, body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="Sayfaları gerçek sitelerden kaydeder")
+    rec.add_argument("--capture-dir", required=True)
+    rec.add_argument("--targets", default="", help='"biletinial:şehir:kategori;microfon:seviye:sayfa;bubilet:şehir:etiket"')
+    rec.add_argument("urls", nargs="*", help="Ayrıca kaydedilecek tam URL'ler")
+
+    srv = commands.add_parser("serve", help="Kayıtlı sayfaları sunar")
+    srv.add_argument("--capture-dir")
+    srv.add_argument("--synthetic", action="store_true", help="Kaydı olmayan liste sayfalarını üret")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8900)
+    srv.add_argument("--latency", type=float, default=0.0, help="Ortalama yanıt gecikmesi (sn)")
+    srv.add_argument("--jitter", type=float, default=0.0, help="Gecikmeye eklenecek ± rastgele süre (sn)")
+    srv.add_argument("--error-rate", type=float, default=0.0, help="Hata döndürülecek istek oranı (0-1)")
+    srv.add_argument("--error-status", type=int, default=503)
+    srv.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        urls = target_urls(args.targets) + args.urls
+        if not urls:
+            parser.error("Kaydedilecek hedef veya URL verilmedi.")
+        record(args.capture_dir, urls)
+        return
+
+    if not args.capture_dir and not args.synthetic:
+        parser.error("--capture-dir veya --synthetic gerekli.")
+    server = ReplayServer((args.host, args.port), args.capture_dir, args.synthetic, args.latency,
+                          args.jitter, args.error_rate, args.error_status, args.seed)
+    print(f"Replay sunucusu: http://{args.host}:{server.server_port} "
+          f"({len(server.manifest)} kayıt, sentetik={'açık' if args.synthetic else 'kapalı'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"İstatistik: {server.counts}")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
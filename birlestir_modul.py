@@ -0,0 +1,157 @@
+"""
+Biletinial ve Bubilet sonuçlarını tek listede birleştirir.
+
+İki kaynak aynı anda taranır; toplam süre yavaş olan kaynağın süresi kadardır.
+Aynı etkinlik iki sitede de listelenebildiği için kayıtlar, normalleştirilmiş başlık
+ve başlangıç tarihinden oluşan bir blok anahtarıyla indekslenir; sadece aynı
+bloktaki kayıtların mekanları karşılaştırılır (ikili tüm karşılaştırma yapılmaz).
+Birleşen etkinlik her kaynağın linkini ve fiyatını "offers" altında tutar.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import kaynak_modul
+import store_modul
+import tarih_modul
+
+SOURCES = ("biletinial", "bubilet")
+
+# Ortak kategori adı -> kaynakların kendi kategori değerleri (None: kaynakta yok)
+CATEGORY_MAP = {
+    "sinema": {"biletinial": "sinema", "bubilet": None},
+    "tiyatro": {"biletinial": "tiyatro", "bubilet": "tiyatro"},
+    "muzik": {"biletinial": "muzik", "bubilet": "konser"},
+    "konser": {"biletinial": "muzik", "bubilet": "konser"},
+    "opera": {"biletinial": "opera", "bubilet": None},
+    "egitim": {"biletinial": "egitim", "bubilet": None},
+    "standup": {"biletinial": "standup", "bubilet": "stand-up"},
+    "festival": {"biletinial": None, "bubilet": "festival"},
+}
+
+# Mekan karşılaştırmasında ayırt edici sayılmayan kelimeler
+VENUE_STOPWORDS = {
+    "sahne", "sahnesi", "salon", "salonu", "merkezi", "kultur", "sanat", "tiyatro",
+    "tiyatrosu", "ve", "the", "acik", "hava", "buyuk", "kucuk",
+}
+
+
+def resolve_category(category):
+    """Kategoriyi kaynak başına değerlere çevirir. Bilinmeyen kategoride ValueError."""
+    name = store_modul.fold(category).replace("-", "").replace(" ", "")
+    mapping = CATEGORY_MAP.get(name)
+    if mapping is None:
+        raise ValueError(f"Bilinmeyen kategori: {category}. Seçenekler: {', '.join(CATEGORY_MAP)}")
+    return {source: value for source, value in mapping.items() if value is not None}
+
+
+def _venue_tokens(venue):
+    return set(store_modul.tokens(venue)) - VENUE_STOPWORDS
+
+
+def merge(results):
+    """
+    results: Kaynak adı -> etkinlik listesi (SOURCES sırasıyla). Birleşmiş etkinlikleri ve
+    bulunan çift kayıt sayısını döndürür. Aynı kaynağın kayıtları birbiriyle birleştirilmez.
+    """
+    merged = []
+    blocks = {}  # (başlık anahtarı, başlangıç tarihi) -> merged içindeki indeksler
+    duplicates = 0
+
+    for source, events in results.items():
+        for event in events:
+            start, end = tarih_modul.parse_formatted(event.get("date"))
+            block_key = (" ".join(store_modul.tokens(event.get("title"))), start)
+            venue = _venue_tokens(event.get("venue"))
+            offer = {
+                "source": source,
+                "link": event.get("link"),
+                "price": event.get("price"),
+                "price_value": store_modul.parse_price(event.get("price")),
+                "venue": event.get("venue"),
+            }
+
+            target = None
+            for index in blocks.get(block_key, ()):
+                candidate = merged[index]
+                if source in candidate["_sources"]:
+                    continue
+                if not venue or not candidate["_venue"] or venue & candidate["_venue"]:
+                    target = candidate
+                    break
+
+            if target is None:
+                blocks.setdefault(block_key, []).append(len(merged))
+                merged.append({
+                    "title": event.get("title"),
+                    "venue": event.get("venue"),
+                    "date": event.get("date"),
+                    "start_date": start.isoformat() if start else None,
+                    "end_date": end.isoformat() if end else None,
+                    "image_url": event.get("image_url"),
+                    "offers": [offer],
+                    "_sources": {source},
+                    "_venue": venue,
+                })
+                continue
+
+            duplicates += 1
+            target["offers"].append(offer)
+            target["_sources"].add(source)
+            target["_venue"] |= venue
+            if not target["image_url"] or target["image_url"] == "Resim Yok":
+                target["image_url"] = event.get("image_url")
+
+    for event in merged:
+        del event["_sources"], event["_venue"]
+        prices = [offer["price_value"] for offer in event["offers"] if offer["price_value"] is not None]
+        event["min_price"] = min(prices) if prices else None
+    return merged, duplicates
+
+
+def _scrape_source(source, city, category, refresh):
+    started = time.perf_counter()
+    try:
+        result, cache_state = kaynak_modul.scrape(source, {"city": city, "category": category}, refresh)
+    except Exception as e:
+        result, cache_state = {"status": "error", "message": str(e)}, None
+    return result, cache_state, round(time.perf_counter() - started, 3)
+
+
+def scrape_all(city, category, refresh=False):
+    """
+    Kategorinin bulunduğu kaynakları paralel tarar ve sonuçları birleştirir.
+    Her kaynağın durumu "sources" altında raporlanır; bir kaynak hata verirse
+    diğerinin sonuçları yine döner. Bilinmeyen kategoride ValueError.
+    """
+    categories = resolve_category(category)
+    with ThreadPoolExecutor(max_workers=len(categories), thread_name_prefix="scrape-all") as executor:
+        futures = {
+            source: executor.submit(_scrape_source, source, city, categories[source], refresh)
+            for source in SOURCES if source in categories
+        }
+        outcomes = {source: future.result() for source, future in futures.items()}
+
+    summary, results = {}, {}
+    for source, (result, cache_state, duration) in outcomes.items():
+        if kaynak_modul.is_error(result):
+            summary[source] = {"status": "error", "message": result.get("message"), "duration": duration}
+            continue
+        results[source] = result.get("events", [])
+        summary[source] = {
+            "status": "success",
+            "category": categories[source],
+            "event_count": len(results[source]),
+            "cache": cache_state,
+            "duration": duration,
+        }
+
+    events, duplicates = merge(results)
+    return {
+        "status": "success" if results else "error",
+        "city": city.title(),
+        "category": category,
+        "sources": summary,
+        "event_count": len(events),
+        "duplicates": duplicates,
+        "events": events,
+    }
@@ -1,102 +1,225 @@
-import requests
-from bs4 import BeautifulSoup
-import datetime
-import re
+import json
 import os
+import tempfile
+import threading
 import time
+from contextlib import contextmanager
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+from urllib3.exceptions import HTTPError as DriverConnectionError
 
-# --- TARİH AYARLARI ---
-MONTH_MAP = {
-    "ocak": 1, "şubat": 2, "mart": 3, "nisan": 4, "mayıs": 5, "haziran": 6,
-    "temmuz": 7, "ağustos": 8, "eylül": 9, "ekim": 10, "kasım": 11, "aralık": 12
+import http_modul
+import metrics_modul
+import model_modul
+import parser_modul
+import tarih_modul
+from havuz_modul import DriverPool
+from tarih_modul import MONTH_MAP  # noqa: F401  (geriye dönük uyumluluk)
+
+# Yük testinde yerel replay sunucusuna yönlendirilebilir (benchmarks/replay_server.py)
+BASE_URL = os.getenv("BUBILET_BASE_URL", "https://www.bubilet.com.tr").rstrip("/")
+http_modul.limit_source(BASE_URL)
+DATE_STYLE = "bubilet"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# --- TARAYICI HAVUZU ---
+POOL_SIZE = int(os.getenv("BUBILET_POOL_SIZE", "2"))  # Aynı anda açık olabilecek en fazla tarayıcı
+POOL_MAX_USES = int(os.getenv("BUBILET_POOL_MAX_USES", "20"))  # Bu kadar kullanımdan sonra tarayıcı yenilenir
+POOL_ACQUIRE_TIMEOUT = float(os.getenv("BUBILET_POOL_TIMEOUT", "120"))
+
+# --- HTTP HIZLI YOL ---
+# Sunucunun döndürdüğü HTML'de kartlar zaten varsa tarayıcı açmadan okunur.
+# Sayfa sonsuz scroll ile büyüdüğü için HTTP sonucu ancak aynı şehir/kategori için
+# Selenium'un en son bulduğu sayının HTTP_MIN_RATIO katı kadar etkinlik içeriyorsa
+# kabul edilir. Henüz Selenium sonucu yoksa karşılaştırma yapılamaz, HTTP isteği
+# atılmadan Selenium kullanılır. HTTP sonucu yetersiz kalan şehir/kategori
+# HTTP_SKIP_TTL saniye boyunca doğrudan Selenium'a gider.
+# Selenium sayıları EXPECTED_PATH dosyasına yazılır; yeniden başlatmadan sonra ve
+# aynı makinedeki diğer worker'larda da kullanılır (boş bırakılırsa sadece bellekte).
+# Not: Sayfaya gömülü JSON durumu parse edilmez, sadece HTML kartları okunur.
+HTTP_FIRST = os.getenv("BUBILET_HTTP_FIRST", "1") == "1"
+EXPECTED_PATH = os.getenv("BUBILET_EXPECTED_PATH", os.path.join(tempfile.gettempdir(), "bubilet_expected.json"))
+HTTP_MIN_RATIO = 0.9
+HTTP_SKIP_TTL = float(os.getenv("BUBILET_HTTP_SKIP_TTL", "3600"))
+HTTP_TIMEOUT = 15
+HTTP_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+def _load_expected(path):
+    """Kaydedilmiş Selenium sayılarını {(sehir_slug, kategori_slug): sayı} olarak okur."""
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return {tuple(key.split("/", 1)): int(count) for key, count in data.items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        print(f"⚠️ Beklenen etkinlik sayıları okunamadı ({path}): {e}")
+        return {}
+
+def _save_expected(key, count):
+    # _expected_lock tutulurken çağrılır; diğer worker'ların yazdıkları korunur
+    _expected_counts[key] = count
+    if not EXPECTED_PATH:
+        return
+    counts = _load_expected(EXPECTED_PATH)
+    counts[key] = count
+    temp_path = f"{EXPECTED_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"/".join(k): v for k, v in counts.items()}, f, ensure_ascii=False)
+        os.replace(temp_path, EXPECTED_PATH)
+    except OSError as e:
+        print(f"⚠️ Beklenen etkinlik sayısı kaydedilemedi ({EXPECTED_PATH}): {e}")
+
+_expected_counts = _load_expected(EXPECTED_PATH)  # (sehir_slug, kategori_slug) -> son Selenium etkinlik sayısı
+_http_skip_until = {}  # (sehir_slug, kategori_slug) -> HTTP yolunun tekrar deneneceği an (monotonic)
+_expected_lock = threading.Lock()
+
+# --- HAFİF SAYFA YÜKLEME ---
+# Scraper yalnızca kartların href, img src/srcset ve metinlerini okur. Resim, medya,
+# font ve izleme scriptlerinin indirilmesi gereksizdir; CDP ile engellenir.
+# Engellenen resimlerin src/srcset öznitelikleri DOM'da kaldığı için çıktı değişmez.
+LEAN_LOAD = os.getenv("BUBILET_LEAN_LOAD", "1") == "1"
+PAGE_LOAD_STRATEGY = "eager"  # DOMContentLoaded sonrası driver.get döner
+BLOCKED_URL_PATTERNS = [
+    # Resimler
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*/_next/image*",
+    # Fontlar
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Medya
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    # Analitik / izleme
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*",
+    "*criteo.com*", "*tiktok.com*", "*yandex.ru*", "*adservice.google.com*",
+]
+
+# Her sayfada, sayfa scriptlerinden önce çalışır. Resource Timing tamponu varsayılan
+# 250 kayıtta dolar ve sonraki kayıtlar düşer; tampon büyütülür ve yine dolarsa
+# baytlar toplanıp tampon boşaltılır.
+RESOURCE_BUFFER_SIZE = 2000
+RESOURCE_TIMING_SCRIPT = """
+performance.setResourceTimingBufferSize(%d);
+window.__resourceBytes = 0;
+window.__resourceCount = 0;
+performance.addEventListener('resourcetimingbufferfull', function () {
+    var entries = performance.getEntriesByType('resource');
+    for (var i = 0; i < entries.length; i++) {
+        window.__resourceBytes += entries[i].transferSize || 0;
+    }
+    window.__resourceCount += entries.length;
+    performance.clearResourceTimings();
+});
+""" % RESOURCE_BUFFER_SIZE
+
+# Sayfanın indirdiği bayt ve yükleme zamanları (Resource Timing API). Bayt sayısı
+# bir alt sınırdır: Timing-Allow-Origin göndermeyen başka origin'lerden gelen
+# kaynaklar (CDN resimleri, fontlar) transferSize=0 bildirir.
+LOAD_STATS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = (nav ? (nav.transferSize || 0) : 0) + (window.__resourceBytes || 0);
+for (var i = 0; i < resources.length; i++) {
+    bytes += resources[i].transferSize || 0;
+}
+return {
+    transfer_bytes_min: bytes,
+    resource_count: resources.length + (window.__resourceCount || 0),
+    dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+    js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null
+};
+"""
+
+# --- BEKLEME AYARLARI ---
+# Sabit sleep yerine sayfanın durulmasını bekliyoruz: kart sayısı değişmiyor ve
+# MutationObserver SETTLE_TIME boyunca DOM değişikliği görmüyorsa sayfa hazırdır.
+# Sürekli değişen sayfalarda (sayaç, carousel) DOM hiç durulmaz; bu yüzden scroll
+# adımlarında kısa STEP_MAX_WAIT sınırı kullanılır ve kart sayısı artınca beklenmez.
+MAX_WAIT = 10  # İlk yükleme beklemesi için üst sınır (sn)
+STEP_MAX_WAIT = float(os.getenv("BUBILET_STEP_MAX_WAIT", "2"))  # Scroll adımı başına üst sınır (sn)
+SETTLE_TIME = 0.5  # Bu süre boyunca değişiklik olmazsa beklemeyi bitir (sn)
+POLL_INTERVAL = 0.1
+POPUP_TIMEOUT = 2
+
+CARD_SELECTOR = "a.group.block"
+
+# DOM değişikliklerinin zamanını window üzerinde tutan gözlemci (bir kez kurulur)
+OBSERVER_SCRIPT = """
+if (!window.__bubiletObserver) {
+    window.__bubiletLastMutation = Date.now();
+    window.__bubiletObserver = new MutationObserver(function () {
+        window.__bubiletLastMutation = Date.now();
+    });
+    window.__bubiletObserver.observe(document.body, {childList: true, subtree: true});
+}
+"""
+
+STATUS_SCRIPT = """
+return [
+    document.querySelectorAll(arguments[0]).length,
+    Date.now() - (window.__bubiletLastMutation || 0),
+    document.body.scrollHeight
+];
+"""
+
+# --- KART ÇIKARMA ---
+# "incremental": Sadece yeni/değişen kartlar tarayıcıdan kompakt JSON olarak alınır.
+# "soup": Her adımda page_source BeautifulSoup ile baştan parse edilir (eski yöntem).
+EXTRACTION_MODE = "incremental"
+
+# Kartın imzası data-bb-sig özniteliğinde tutulur; imzası değişmeyen kart tekrar
+# gönderilmez. Lazy-load ile sonradan gelen resim/metin imzayı değiştirdiği için
+# o kart bir kez daha okunur (soup modundaki "son görülen kazanır" davranışı).
+# Sınıf karşılaştırması BeautifulSoup'taki class_="group block" ile aynıdır.
+NEW_CARDS_SCRIPT = """
+var cards = document.querySelectorAll(arguments[0]);
+var total = 0;
+var fresh = [];
+for (var i = 0; i < cards.length; i++) {
+    var card = cards[i];
+    if ((card.getAttribute('class') || '').trim().split(/\\s+/).join(' ') !== 'group block') {
+        continue;
+    }
+    total++;
+    var img = card.querySelector('img');
+    var src = img ? img.getAttribute('src') : null;
+    var srcset = img ? img.getAttribute('srcset') : null;
+    var sig = card.getAttribute('href') + '|' + src + '|' + srcset + '|' + card.textContent.length;
+    if (card.getAttribute('data-bb-sig') === sig) {
+        continue;
+    }
+    card.setAttribute('data-bb-sig', sig);
+    var title = card.querySelector('h3');
+    var price = card.querySelector('span[class~="text-[#00c656]"]');
+    var details = [];
+    var ps = card.querySelectorAll('p.text-gray-500');
+    for (var j = 0; j < ps.length; j++) {
+        details.push(ps[j].textContent);
+    }
+    fresh.push([
+        card.getAttribute('href'),
+        src,
+        srcset,
+        title ? title.textContent : null,
+        details,
+        price ? price.textContent : null
+    ]);
 }
+return [total, fresh];
+"""
 
 def parse_date_range(date_text):
     """Tarih metnini parse eder ve DD.MM.YYYY formatında döndürür."""
-    if not date_text:
-        return None
-    
-    cleaned_text = date_text.lower()
-    
-    # Gün isimlerini temizle
-    days_to_remove = r"(pazartesi|salı|çarşamba|perşembe|cuma|cumartesi|pazar|pzt|sal|çar|per|cum|cmt|paz|cmrt)"
-    cleaned_text = re.sub(days_to_remove, '', cleaned_text, flags=re.IGNORECASE)
-    
-    # Saat bilgilerini temizle
-    cleaned_text = re.sub(r"\d{1,2}:\d{2}", '', cleaned_text)
-    
-    # Fazla boşlukları temizle
-    cleaned_text = re.sub(r"[\s\/\.]+", ' ', cleaned_text).strip()
-    
-    now = datetime.datetime.now()
-    current_year = now.year
-    current_month = now.month
-    parsed_dates = []
-    
-    month_pattern = r"(ocak|şubat|mart|nisan|mayıs|haziran|temmuz|ağustos|eylül|ekim|kasım|aralık)"
-    
-    # Ay-Gün formatı
-    regex_month_first = f"{month_pattern}\\s*[-.]?\\s*(\\d{{1,2}})"
-    matches_month_first = re.findall(regex_month_first, cleaned_text, re.IGNORECASE)
-    
-    # Gün-Ay formatı
-    regex_day_first = f"(\\d{{1,2}})\\s*[-.]?\\s*{month_pattern}"
-    matches_day_first = re.findall(regex_day_first, cleaned_text, re.IGNORECASE)
-    
-    final_matches = []
-    
-    if matches_month_first:
-        for m_name, d_str in matches_month_first:
-            final_matches.append((int(d_str), m_name))
-    
-    if matches_day_first:
-        for d_str, m_name in matches_day_first:
-            current_tuple = (int(d_str), m_name)
-            is_duplicate = False
-            for d, m in final_matches:
-                if d == current_tuple[0] and m.lower().startswith(current_tuple[1].lower()[:3]):
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
-                final_matches.append(current_tuple)
-    
-    for day, month_str in final_matches:
-        month_val = 0
-        for k, v in MONTH_MAP.items():
-            if month_str.lower().startswith(k[:3]):
-                month_val = v
-                break
-        
-        if month_val > 0:
-            year = current_year
-            if month_val < current_month:
-                year += 1
-            elif month_val == current_month and day < now.day:
-                year += 1
-            
-            try:
-                dt = datetime.date(year, month_val, day)
-                parsed_dates.append(dt)
-            except ValueError:
-                continue
-    
-    if not parsed_dates:
-        return date_text
-    
-    parsed_dates.sort()
-    min_date = parsed_dates[0]
-    max_date = parsed_dates[-1]
-    fmt = "%d.%m.%Y"
-    
-    if min_date == max_date:
-        return min_date.strftime(fmt)
-    else:
-        return f"{min_date.strftime(fmt)} - {max_date.strftime(fmt)}"
+    return tarih_modul.parse_date_range(date_text, style=DATE_STYLE)
 
 def url_hazirla(text):
     """Türkçe karakterleri URL uyumlu hale getirir."""
@@ -109,47 +232,75 @@ def url_hazirla(text):
         text = text.replace(tr, eng)
     return text
 
+def _build_event(href, src, srcset, baslik_text, detay_texts, fiyat_text, base_url, city, category):
+    """Karttan okunan ham alanlardan etkinlik kaydını oluşturur."""
+    link = base_url + href
+    
+    image_url = "Resim Yok"
+    if src and not src.startswith("data:"):
+        image_url = src
+    elif srcset:
+        image_url = srcset.split(',')[-1].strip().split(' ')[0]
+    
+    baslik = baslik_text.strip() if baslik_text is not None else "Başlık Yok"
+    
+    mekan = detay_texts[0].strip() if len(detay_texts) > 0 else "Belirtilmemiş"
+    
+    raw_tarih = detay_texts[1].strip() if len(detay_texts) > 1 else "Belirtilmemiş"
+    tarih = parse_date_range(raw_tarih)
+    
+    fiyat = fiyat_text.strip() if fiyat_text is not None else "Belirsiz"
+    
+    return model_modul.BubiletEvent(
+        city=city,
+        category=category,
+        title=baslik,
+        venue=mekan,
+        date=tarih,
+        price=fiyat,
+        link=link,
+        image_url=image_url,
+    )
+
 def parse_event_card(card, base_url, city, category):
     """Tek bir etkinlik kartını parse eder."""
+    with metrics_modul.stage("card_parse"):
+        return _parse_event_card(card, base_url, city, category)
+
+def _parse_event_card(card, base_url, city, category):
     try:
-        link = base_url + card.get("href")
-        
         image_tag = card.find("img")
-        image_url = "Resim Yok"
-        if image_tag:
-            src = image_tag.get("src")
-            if src and not src.startswith("data:"):
-                image_url = src
-            else:
-                srcset = image_tag.get("srcset")
-                if srcset:
-                    image_url = srcset.split(',')[-1].strip().split(' ')[0]
-        
-        baslik = card.find("h3").text.strip() if card.find("h3") else "Başlık Yok"
-        
-        detaylar = card.find_all("p", class_="text-gray-500")
-        mekan = detaylar[0].text.strip() if len(detaylar) > 0 else "Belirtilmemiş"
-        
-        raw_tarih = detaylar[1].text.strip() if len(detaylar) > 1 else "Belirtilmemiş"
-        tarih = parse_date_range(raw_tarih)
-        
+        baslik_tag = card.find("h3")
         fiyat_tag = card.find("span", class_="text-[#00c656]")
-        fiyat = fiyat_tag.text.strip() if fiyat_tag else "Belirsiz"
-        
-        return {
-            "city": city,
-            "category": category,
-            "title": baslik,
-            "venue": mekan,
-            "date": tarih,
-            "price": fiyat,
-            "link": link,
-            "image_url": image_url
-        }
+        return _build_event(
+            card.get("href"),
+            image_tag.get("src") if image_tag else None,
+            image_tag.get("srcset") if image_tag else None,
+            baslik_tag.text if baslik_tag else None,
+            [p.text for p in card.find_all("p", class_="text-gray-500")],
+            fiyat_tag.text if fiyat_tag else None,
+            base_url, city, category
+        )
+    except Exception as e:
+        return None
+
+def parse_cards_html(html, base_url, city, category, backend=None):
+    """Sayfadaki tüm kartları parse eder. (kart sayısı, etkinlikler) döndürür."""
+    soup = parser_modul.make_soup(html, parser_modul.BUBILET_CARDS, backend)
+    cards = soup.find_all("a", class_="group block")
+    return len(cards), [parse_event_card(card, base_url, city, category) for card in cards]
+
+def parse_card_payload(payload, base_url, city, category):
+    """NEW_CARDS_SCRIPT'in döndürdüğü kompakt kart verisini parse eder."""
+    try:
+        with metrics_modul.stage("card_parse"):
+            href, src, srcset, baslik_text, detay_texts, fiyat_text = payload
+            return _build_event(href, src, srcset, baslik_text, detay_texts, fiyat_text,
+                                base_url, city, category)
     except Exception as e:
         return None
 
-def popup_kapat(driver, timeout=5):
+def popup_kapat(driver, timeout=POPUP_TIMEOUT):
     """Sayfa açılırken çıkan pop-up'ı kapatır. Çıkmazsa görmezden gelir."""
     try:
         print("🔍 Pop-up kontrol ediliyor...")
@@ -158,16 +309,76 @@ def popup_kapat(driver, timeout=5):
         )
         close_btn.click()
         print("✅ Pop-up kapatıldı!")
-        time.sleep(1)
+        WebDriverWait(driver, timeout).until(EC.invisibility_of_element(close_btn))
     except Exception:
         print("ℹ️ Pop-up bulunamadı veya zaten kapalı, devam ediliyor...")
 
-def slow_smooth_scroll_with_collection(driver, base_url, city, category):
+def wait_until_settled(driver, max_wait=MAX_WAIT, settle_time=SETTLE_TIME, until_growth=False):
+    """
+    Kart sayısı ve DOM, settle_time boyunca değişmeyene kadar bekler.
+    En fazla max_wait saniye bekler. (kart sayısı, sayfa yüksekliği) döndürür.
+    until_growth=True ise kart sayısı ilk ölçümden büyüdüğü anda döner.
+    """
+    driver.execute_script(OBSERVER_SCRIPT)
+    deadline = time.monotonic() + max_wait
+    settle_ms = settle_time * 1000
+    first_count = None
+    last_count = None
+    stable_since = time.monotonic()
+
+    while True:
+        count, idle_ms, height = driver.execute_script(STATUS_SCRIPT, CARD_SELECTOR)
+        now = time.monotonic()
+        if first_count is None:
+            first_count = count
+        elif until_growth and count > first_count:
+            return count, height
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        if (now - stable_since) * 1000 >= settle_ms and idle_ms >= settle_ms:
+            return count, height
+        if now >= deadline:
+            return count, height
+        time.sleep(POLL_INTERVAL)
+
+def _collect_soup(driver, base_url, city, category):
+    """Tüm sayfayı parse eder. (görülen kart sayısı, etkinlikler) döndürür."""
+    return parse_cards_html(driver.page_source, base_url, city, category)
+
+def _collect_incremental(driver, base_url, city, category):
+    """Sadece yeni/değişen kartları tarayıcıdan alır. (görülen kart sayısı, etkinlikler) döndürür."""
+    total, payloads = driver.execute_script(NEW_CARDS_SCRIPT, CARD_SELECTOR)
+    return total, [parse_card_payload(payload, base_url, city, category) for payload in payloads]
+
+COLLECTORS = {
+    "incremental": _collect_incremental,
+    "soup": _collect_soup,
+}
+
+def slow_smooth_scroll_with_collection(driver, base_url, city, category, max_wait=MAX_WAIT,
+                                       extraction=EXTRACTION_MODE, progress=None, on_item=None,
+                                       step_wait=STEP_MAX_WAIT):
     """
     Her scroll adımında etkinlikleri toplar ve tekil bir sözlükte saklar.
+    İlk yüklemede sayfanın durulması en fazla max_wait sn beklenir. Scroll
+    adımlarında yeni kartlar gelince veya en fazla step_wait sn sonra devam edilir.
+    extraction: "incremental" (varsayılan) veya "soup".
+    progress: Her adımda {"scroll_count", "unique_events"} ile çağrılır; hata
+    yükseltirse tarama durur.
+    on_item: Daha önce görülmemiş her link için etkinlikle birlikte çağrılır.
     """
-    print("⏳ Sayfa açıldı, 10 saniye bekleniyor...")
-    time.sleep(10)
+    collect = COLLECTORS[extraction]
+    
+    def add(event_data):
+        # Link'i anahtar olarak kullan (tekil)
+        is_new = event_data["link"] not in unique_events
+        unique_events[event_data["link"]] = event_data
+        if is_new and on_item:
+            on_item(event_data)
+    
+    print("⏳ Sayfa açıldı, kartların yüklenmesi bekleniyor...")
+    wait_until_settled(driver, max_wait)
     
     print("🔄 Yavaş scroll başlıyor (etkinlikler kaydediliyor)...\n")
     
@@ -180,30 +391,28 @@ def slow_smooth_scroll_with_collection(driver, base_url, city, category):
     scroll_count = 0
     
     while True:
-        # Aşağı kaydır
-        current_position += scroll_step
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        scroll_count += 1
-        
-        # Şu anki HTML'i parse et
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        cards = soup.find_all("a", class_="group block")
+        with metrics_modul.stage("scroll_iteration"):
+            # Aşağı kaydır
+            current_position += scroll_step
+            driver.execute_script(f"window.scrollTo(0, {current_position});")
+            scroll_count += 1
+            
+            # Yeni kartlar gelene veya DOM durulana kadar bekle (adım başına kısa sınır)
+            _, new_height = wait_until_settled(driver, min(step_wait, max_wait), until_growth=True)
+            
+            # Kartları topla
+            card_count, events = collect(driver, base_url, city, category)
         
-        # Her kartı işle ve unique_events'e ekle
-        for card in cards:
-            event_data = parse_event_card(card, base_url, city, category)
+        # Her etkinliği unique_events'e ekle
+        for event_data in events:
             if event_data and event_data["link"]:
-                # Link'i anahtar olarak kullan (tekil)
-                unique_events[event_data["link"]] = event_data
+                add(event_data)
         
-        print(f"   Scroll {scroll_count}: {len(cards)} kart görüldü | "
+        print(f"   Scroll {scroll_count}: {card_count} kart görüldü | "
               f"💾 Benzersiz: {len(unique_events)} etkinlik")
         
-        # 2 saniye bekle
-        time.sleep(2)
-        
-        # Sayfa boyutunu kontrol et
-        new_height = driver.execute_script("return document.body.scrollHeight")
+        if progress:
+            progress({"scroll_count": scroll_count, "unique_events": len(unique_events)})
         
         # Eğer sayfa sonuna geldiyse dur
         if current_position >= new_height:
@@ -214,69 +423,250 @@ def slow_smooth_scroll_with_collection(driver, base_url, city, category):
         if new_height > last_height:
             last_height = new_height
     
-    print("⏳ Sayfa sonunda 10 saniye bekleniyor...")
-    time.sleep(10)
-    
     # Son kontrol
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    cards = soup.find_all("a", class_="group block")
-    for card in cards:
-        event_data = parse_event_card(card, base_url, city, category)
+    card_count, events = collect(driver, base_url, city, category)
+    for event_data in events:
         if event_data and event_data["link"]:
-            unique_events[event_data["link"]] = event_data
+            add(event_data)
+    metrics_modul.count_cards(card_count)
     
     print(f"\n🎯 TOPLAM BENZERSİZ ETKİNLİK: {len(unique_events)}")
     
     return list(unique_events.values())
 
-def run_bubilet(category, city):
-    """Selenium kullanarak TÜM benzersiz etkinlikleri çeker."""
-    base_url = "https://www.bubilet.com.tr"
-    
-    sehir_slug = url_hazirla(city)
-    kategori_slug = url_hazirla(category)
-    url = f"{base_url}/{sehir_slug}/etiket/{kategori_slug}"
-    
-    # Selenium ayarları
+def _chrome_options():
+    """Selenium ayarları."""
     chrome_options = Options()
     chrome_options.add_argument('--headless')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--disable-gpu')
     chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
     
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+    return chrome_options
+
+def create_driver():
+    """Ayarları yapılmış yeni bir Chrome sürücüsü başlatır."""
+    with metrics_modul.stage("driver_start"):
+        driver = webdriver.Chrome(options=_chrome_options())
+    
+    # Bot algılamasını önle
+    driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": USER_AGENT})
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {"source": RESOURCE_TIMING_SCRIPT})
+    return driver
+
+def set_lean_mode(driver, lean):
+    """Resim, medya, font ve izleme isteklerini engeller (lean=False ise engeli kaldırır)."""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {
+        "urls": BLOCKED_URL_PATTERNS if lean else []
+    })
+
+def collect_load_stats(driver, load_sec):
+    """
+    Bu çalıştırmada aktarılan bayt (alt sınır, transfer_bytes_min) ve yükleme
+    süresi bilgisini döndürür.
+    """
+    try:
+        stats = driver.execute_script(LOAD_STATS_SCRIPT)
+    except Exception:
+        stats = {}
+    stats["load_sec"] = round(load_sec, 3)
+    return stats
+
+def reset_driver(driver):
+    """Havuza geri dönen sürücünün önceki istekten kalan durumunu temizler."""
+    driver.delete_all_cookies()
+    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+        "origin": BASE_URL,
+        "storageTypes": "all"
+    })
+    driver.get("about:blank")
+
+# Bu metinleri içeren WebDriverException'lar tarayıcı oturumunun koptuğunu gösterir
+BROKEN_SESSION_MESSAGES = ("invalid session", "session deleted", "no such session", "disconnected",
+                           "not reachable", "crashed")
+
+def driver_broken(error):
+    """
+    Hata sürücüyü kullanılamaz bıraktıysa True. Sadece oturum / bağlantı hataları
+    sayılır; boş listede kart bekleme zaman aşımı gibi sayfa hatalarında sürücü havuza döner.
+    """
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if isinstance(error, WebDriverException):
+        message = (error.msg or "").lower()
+        return any(text in message for text in BROKEN_SESSION_MESSAGES)
+    # chromedriver süreci kapanmışsa komutlar bağlantı hatasıyla düşer
+    return isinstance(error, (ConnectionError, DriverConnectionError))
+
+DRIVER_POOL = DriverPool(
+    create_driver,
+    size=POOL_SIZE,
+    max_uses=POOL_MAX_USES,
+    reset=reset_driver,
+    acquire_timeout=POOL_ACQUIRE_TIMEOUT,
+    is_broken=driver_broken,
+)
+
+class CallbackStopped(Exception):
+    """
+    progress / on_item geri çağrısı hata yükseltti (ör. akış kapandı, iş iptal edildi).
+    Tarayıcıda sorun yoktur; tarama durur ve asıl hata (error) çağırana iletilir.
+    """
+
+    def __init__(self, error):
+        super().__init__(str(error))
+        self.error = error
+
+def _guarded(callback):
+    # Geri çağrının hatasını tarayıcı hatalarından ayırmak için sarar
+    if callback is None:
+        return None
+    
+    def call(value):
+        try:
+            callback(value)
+        except Exception as e:
+            raise CallbackStopped(e) from e
+    return call
+
+@contextmanager
+def _fresh_driver():
+    """Havuz kullanılmadığında her istek için yeni tarayıcı açar."""
+    driver = create_driver()
+    try:
+        yield driver
+    finally:
+        # WebDriver'ı kapat
+        driver.quit()
+        print("🔒 Browser kapatıldı\n")
+
+def scrape_http(url, city, category):
+    """
+    Sayfayı tarayıcı olmadan indirip sunucunun gönderdiği kartları parse eder.
+    Sayfa açılamazsa None döndürür.
+    """
+    response = http_modul.get(url, headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT)
+    if response.status_code != 200:
+        return None
     
-    driver = None
+    card_count, events = parse_cards_html(response.text, BASE_URL, city, category)
+    metrics_modul.count_cards(card_count)
+    unique_events = {}
+    for event_data in events:
+        if event_data and event_data["link"]:
+            unique_events[event_data["link"]] = event_data
+    return list(unique_events.values())
+
+def run_bubilet(category, city, max_wait=MAX_WAIT, extraction=EXTRACTION_MODE, use_pool=True,
+                lean=LEAN_LOAD, http_first=HTTP_FIRST, progress=None, on_item=None):
+    """
+    TÜM benzersiz etkinlikleri çeker. http_first=True ise önce tarayıcısız HTTP
+    yolu denenir; yeterli etkinlik çıkmazsa Selenium kullanılır.
+    Sonuçtaki "served_by" alanı hangi yolun kullanıldığını gösterir. HTTP yolu
+    listenin tamamını garanti etmediği için sonucu "partial": True ile işaretlenir.
+    """
+    sehir_slug = url_hazirla(city)
+    kategori_slug = url_hazirla(category)
+    url = f"{BASE_URL}/{sehir_slug}/etiket/{kategori_slug}"
+    key = (sehir_slug, kategori_slug)
+    
+    with _expected_lock:
+        expected = _expected_counts.get(key)
+        if expected is None and EXPECTED_PATH:
+            # Başka bir worker bu anahtarı taramış olabilir
+            expected = _load_expected(EXPECTED_PATH).get(key)
+            if expected is not None:
+                _expected_counts[key] = expected
+        http_allowed = time.monotonic() >= _http_skip_until.get(key, 0.0)
+    
+    # Beklenen sayı bilinmeden HTTP sonucu değerlendirilemez; istek hiç atılmaz
+    if http_first and expected is not None and http_allowed:
+        try:
+            http_events = scrape_http(url, city, category)
+        except Exception as e:
+            print(f"ℹ️ HTTP yolu başarısız, Selenium'a geçiliyor: {e}")
+            http_events = None
+        
+        if http_events and len(http_events) >= expected * HTTP_MIN_RATIO:
+            print(f"⚡ HTTP yolu yeterli: {len(http_events)} etkinlik (beklenen {expected})")
+            if on_item:
+                for event_data in http_events:
+                    on_item(event_data)
+            return {
+                "source": "Bubilet",
+                "city": city,
+                "category": category,
+                "event_count": len(http_events),
+                "events": http_events,
+                "served_by": "http",
+                "partial": True
+            }
+        
+        print(f"ℹ️ HTTP yolu yetersiz ({len(http_events or [])}/{expected}), "
+              f"{HTTP_SKIP_TTL:.0f} sn boyunca Selenium kullanılacak")
+        with _expected_lock:
+            _http_skip_until[key] = time.monotonic() + HTTP_SKIP_TTL
     
+    result = run_selenium(url, city, category, max_wait, extraction, use_pool, lean, progress, on_item)
+    if result.get("status") != "error":
+        with _expected_lock:
+            _save_expected(key, result["event_count"])
+    return result
+
+def run_selenium(url, city, category, max_wait=MAX_WAIT, extraction=EXTRACTION_MODE, use_pool=True,
+                 lean=LEAN_LOAD, progress=None, on_item=None):
+    """
+    Selenium kullanarak TÜM benzersiz etkinlikleri çeker.
+    use_pool=True ise tarayıcı DRIVER_POOL'dan ödünç alınır.
+    lean=True ise resim/medya/font/izleme istekleri engellenir.
+    progress / on_item hata yükseltirse tarama durur, tarayıcı sağlam olarak havuza
+    döner ve hata (ör. StreamClosed, JobCancelled) çağırana aynen yükseltilir.
+    """
+    stopped = None
     try:
         print(f"🌐 Bağlantı kuruluyor: {url}")
         print(f"📍 Şehir: {city} | Kategori: {category}")
         print("="*60 + "\n")
         
-        # WebDriver'ı başlat
-        driver = webdriver.Chrome(options=chrome_options)
-        
-        # Bot algılamasını önle
-        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-            "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
-        
-        driver.get(url)
-        
-        # İlk etkinliklerin yüklenmesini bekle
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "a.group.block"))
-        )
-        
-        # Pop-up varsa kapat
-        popup_kapat(driver)
+        with (DRIVER_POOL.driver() if use_pool else _fresh_driver()) as driver:
+            # Havuzdaki sürücü önceki istekten farklı bir modda kalmış olabilir
+            set_lean_mode(driver, lean)
+            
+            load_started = time.monotonic()
+            with metrics_modul.stage("driver_get"):
+                driver.get(url)
+            
+            # İlk etkinliklerin yüklenmesini bekle
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, CARD_SELECTOR))
+            )
+            load_sec = time.monotonic() - load_started
+            
+            # Pop-up varsa kapat
+            popup_kapat(driver)
+            
+            # Scroll yaparak etkinlikleri topla
+            try:
+                extracted_events = slow_smooth_scroll_with_collection(
+                    driver, BASE_URL, city, category, max_wait, extraction,
+                    _guarded(progress), _guarded(on_item)
+                )
+            except CallbackStopped as e:
+                # Sürücü bloktan hatasız çıkar, havuza sağlam olarak döner
+                stopped = e
+            else:
+                load_stats = collect_load_stats(driver, load_sec)
+                load_stats["lean"] = lean
         
-        # Scroll yaparak etkinlikleri topla
-        extracted_events = slow_smooth_scroll_with_collection(driver, base_url, city, category)
+        if stopped is not None:
+            raise stopped
         
         print("\n" + "="*60)
         print(f"✅ BAŞARIYLA TAMAMLANDI!")
@@ -288,9 +678,15 @@ def run_bubilet(category, city):
             "city": city,
             "category": category,
             "event_count": len(extracted_events),
-            "events": extracted_events
+            "events": extracted_events,
+            "load_stats": load_stats,
+            "served_by": "selenium"
         }
     
+    except CallbackStopped as e:
+        print(f"⏹️ Tarama durduruldu: {e}")
+        raise e.error
+    
     except Exception as e:
         print(f"\n{'='*60}")
         print(f"❌ HATA OLUŞTU: {str(e)}")
@@ -300,12 +696,6 @@ def run_bubilet(category, city):
             "status": "error",
             "message": str(e)
         }
-    
-    finally:
-        # WebDriver'ı kapat
-        if driver:
-            driver.quit()
-            print("🔒 Browser kapatıldı\n")
 
 # ----------------------------------------------------- 
 ## 🚀 Örnek Kullanım
@@ -339,7 +729,7 @@ if __name__ == "__main__":
         # JSON olarak kaydet
         output_file = f"bubilet_{result['city']}_{result['category']}.json"
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+            json.dump(result, f, ensure_ascii=False, indent=2, default=model_modul.default)
         print(f"\n💾 Veriler kaydedildi: {output_file}")
     else:
         print(f"❌ Hata: {result['message']}")
@@ -1,11 +1,21 @@
+import os
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from urllib.parse import urlencode
 
-import requests
 from bs4 import BeautifulSoup
 
+import http_modul
+import metrics_modul
+import model_modul
+import parser_modul
 
-BASE_URL = "https://microfon.co"
+
+# Yük testinde yerel replay sunucusuna yönlendirilebilir (benchmarks/replay_server.py)
+BASE_URL = os.getenv("MICROFON_BASE_URL", "https://microfon.co").rstrip("/")
+http_modul.limit_source(BASE_URL)
 LIST_PATH = "/scholarship"
 HEADERS = {
 	"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
@@ -32,6 +42,10 @@ PAGE_SIZE_BY_LEVEL = {
 DATE_RANGE_PATTERN = re.compile(r"\d{2}\.\d{2}\.\d{4}\s*-\s*\d{2}\.\d{2}\.\d{4}")
 NO_RESULTS_TEXT = "Aradığınız kriterlere uygun bir sonuç bulunamadı"
 
+# Aynı anda çekilecek sayfa penceresi. 1 = sıralı tarama.
+PAGE_WINDOW = 1
+MAX_PAGE_WINDOW = 8
+
 
 def _normalize_level(level: str) -> str:
 	if not level:
@@ -95,44 +109,105 @@ def _extract_card(card: BeautifulSoup):
 	description_tag = card.select_one("p.clamp-3")
 	description = description_tag.get_text(" ", strip=True) if description_tag else ""
 
-	return {
-		"provider": provider,
-		"title": title,
-		"detail_url": detail_url,
-		"image_url": image_url,
-		"application_dates": _extract_date_range(card),
-		"location": location,
-		"level": level,
-		"amount": amount,
-		"duration": duration,
-		"description": description,
-	}
-
-
-def _scrape_page(level: str, page_number: int):
-	url = _build_page_url(level, page_number)
-	response = requests.get(url, headers=HEADERS, timeout=20)
-
-	if response.status_code != 200:
-		return {"status": "error", "message": f"Microfon sayfası açılamadı. HTTP {response.status_code}"}
-
-	soup = BeautifulSoup(response.text, "html.parser")
-	no_results_tag = soup.find("p", string=lambda value: value and NO_RESULTS_TEXT in value)
-	if no_results_tag:
-		return {"status": "ok", "url": url, "items": [], "no_results": True}
-
+	return model_modul.Scholarship(
+		provider=provider,
+		title=title,
+		detail_url=detail_url,
+		image_url=image_url,
+		application_dates=_extract_date_range(card),
+		location=location,
+		level=level,
+		amount=amount,
+		duration=duration,
+		description=description,
+	)
+
+
+def _has_no_results(html: str, backend=None) -> bool:
+	# Metin sayfada hiç geçmiyorsa paragrafları parse etmeye gerek yok
+	if NO_RESULTS_TEXT not in html:
+		return False
+	soup = parser_modul.make_soup(html, parser_modul.MICROFON_PARAGRAPHS, backend)
+	return soup.find("p", string=lambda value: value and NO_RESULTS_TEXT in value) is not None
+
+
+def _parse_page_html(html: str, backend=None):
+	"""Liste sayfasının HTML'inden (sonuç yok mu, burslar) döndürür."""
+	if _has_no_results(html, backend):
+		return True, []
+
+	soup = parser_modul.make_soup(html, parser_modul.MICROFON_CARDS, backend)
 	cards = soup.select("div.scholarship-item")
+	metrics_modul.count_cards(len(cards))
 
 	scholarships = []
 	for card in cards:
-		parsed = _extract_card(card)
+		with metrics_modul.stage("card_parse"):
+			parsed = _extract_card(card)
 		if parsed:
 			scholarships.append(parsed)
 
-	return {"status": "ok", "url": url, "items": scholarships, "no_results": False}
+	return False, scholarships
+
+
+def _page_fingerprint(content: bytes) -> bytes:
+	# Sonucu belirleyen kısımlar: burs kartları ve "sonuç yok" mesajı
+	no_results = NO_RESULTS_TEXT.encode("utf-8") in content
+	return parser_modul.extract_div_blocks(content, "scholarship-item") + (b"\x00empty" if no_results else b"")
 
 
-def run_microfon(level: str, max_pages: int = 20):
+def _scrape_page(level: str, page_number: int):
+	url = _build_page_url(level, page_number)
+	# Burs kartları değişmediyse önceki parse sonucu kullanılır
+	try:
+		status_code, parsed, _ = http_modul.conditional_get(
+			url,
+			parse=lambda response: _parse_page_html(response.text),
+			fingerprint=_page_fingerprint,
+			headers=HEADERS,
+			timeout=20,
+		)
+	except http_modul.OutboundRejected as e:
+		return {"status": "error", "message": f"Microfon sayfası açılamadı. {e}"}
+
+	if status_code != 200:
+		return {"status": "error", "message": f"Microfon sayfası açılamadı. HTTP {status_code}"}
+
+	no_results, scholarships = parsed
+	return {"status": "ok", "url": url, "items": scholarships, "no_results": no_results}
+
+
+def _iter_pages(level: str, max_pages: int, window: int):
+	"""
+	Sayfa sonuçlarını sayfa sırasıyla üretir.
+	window > 1 ise sıradaki sayfalar önceden paralel olarak istenir. Uçuştaki
+	istekler yarıda kesilemez: tüketici durduğunda önceden istenmiş sayfalar yine
+	indirilir ve yok sayılır. Fazladan indirmeyi sınırlamak için önden istenen
+	sayfa sayısı 1'den başlar ve tüketilen her sayfada bir artar (en fazla window);
+	böylece kısa listelerde fazladan istenen sayfa, okunan sayfa sayısını geçmez.
+	"""
+	if window <= 1:
+		for page in range(1, max_pages + 1):
+			yield _scrape_page(level, page)
+		return
+
+	executor = ThreadPoolExecutor(max_workers=window)
+	pending = deque()
+	next_page = 1
+	ahead = 1
+	try:
+		while pending or next_page <= max_pages:
+			while next_page <= max_pages and len(pending) < ahead:
+				pending.append(executor.submit(metrics_modul.copy_context().run, _scrape_page, level, next_page))
+				next_page += 1
+			yield pending.popleft().result()
+			ahead = min(window, ahead + 1)
+	finally:
+		# Uçuştaki istekler beklenmez; sonuçları yok sayılır
+		executor.shutdown(wait=False)
+
+
+def run_microfon(level: str, max_pages: int = 20, window: int = PAGE_WINDOW, progress=None, on_item=None):
 	normalized_level = _normalize_level(level)
 	if not normalized_level:
 		return {
@@ -144,32 +219,42 @@ def run_microfon(level: str, max_pages: int = 20):
 	seen_urls = set()
 	scanned_urls = []
 
-	for page in range(1, max_pages + 1):
-		result = _scrape_page(normalized_level, page)
-		if result.get("status") == "error":
-			return result
-
-		scanned_urls.append(result["url"])
-		if result.get("no_results"):
-			break
-
-		page_items = result["items"]
-		if not page_items:
-			break
-
-		added_count = 0
-		for item in page_items:
-			detail_url = item.get("detail_url")
-			if not detail_url or detail_url in seen_urls:
-				continue
-			seen_urls.add(detail_url)
-			all_items.append(item)
-			added_count += 1
-
-		if added_count == 0:
-			break
-
-	return {
+	window = max(1, min(window, MAX_PAGE_WINDOW))
+	partial = False
+	with closing(_iter_pages(normalized_level, max_pages, window)) as pages:
+		for result in pages:
+			if result.get("status") == "error":
+				return result
+
+			scanned_urls.append(result["url"])
+			if result.get("no_results"):
+				break
+
+			page_items = result["items"]
+			if not page_items:
+				break
+
+			added_count = 0
+			for item in page_items:
+				detail_url = item.get("detail_url")
+				if not detail_url or detail_url in seen_urls:
+					continue
+				seen_urls.add(detail_url)
+				all_items.append(item)
+				added_count += 1
+				if on_item:
+					on_item(item)
+
+			if progress:
+				progress({"scanned_pages": len(scanned_urls), "scholarships": len(all_items)})
+
+			if added_count == 0:
+				break
+		else:
+			# max_pages sınırına ulaşıldı; sonraki sayfalar taranmadı
+			partial = True
+
+	result = {
 		"source": "Microfon",
 		"selected_level": normalized_level,
 		"scholarship_count": len(all_items),
@@ -177,3 +262,6 @@ def run_microfon(level: str, max_pages: int = 20):
 		"scanned_urls": scanned_urls,
 		"scholarships": all_items,
 	}
+	if partial:
+		result["partial"] = True
+	return result
@@ -0,0 +1,183 @@
+"""
+Boyutu sınırlı, TTL'li yanıt önbelleği.
+
+Kayıt TTL süresi içindeyse doğrudan döner. TTL dolmuş ama stale penceresi içindeyse
+eski kopya hemen döner ve arka planda yenileme başlatılır (stale-while-revalidate).
+Bundan daha eski kayıtlar ve hiç olmayanlar çağıran tarafta yeniden yüklenir.
+Kayıt sayısı veya toplam boyut sınırı aşılınca en uzun süredir kullanılmayan
+kayıtlar çıkarılır (LRU). Boyut, değerin JSON çıktısının uzunluğuyla yaklaşık ölçülür.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import model_modul
+
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+REFRESH = "refresh"
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at", "size")
+
+    def __init__(self, value, stored_at, size):
+        self.value = value
+        self.stored_at = stored_at
+        self.size = size
+
+
+def encoded_size(value):
+    """Değerin yaklaşık bellek maliyeti: JSON çıktısının bayt uzunluğu."""
+    return len(model_modul.dumps(value))
+
+
+class TTLCache:
+    """
+    max_entries: Tutulacak en fazla kayıt.
+    max_bytes: Kayıtların toplam yaklaşık boyutu için üst sınır (None ise sınır yok).
+    Bu sınırdan büyük tek bir değer saklanmaz.
+    should_cache: Değerin saklanıp saklanmayacağına karar verir (ör. hata yanıtları saklanmaz).
+    size_of: Değerin yaklaşık boyutunu (bayt) döndürür.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None, should_cache=None, size_of=encoded_size,
+                 refresh_workers=2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._should_cache = should_cache or (lambda value: True)
+        self._size_of = size_of
+        self._bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="cache-refresh")
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "forced_refreshes": 0,
+            "background_refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+            "oversized": 0,
+        }
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _store(self, key, value):
+        if not self._should_cache(value):
+            return
+        size = self._size_of(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._discard(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                self._stats["oversized"] += 1
+                return
+            self._data[key] = _Entry(value, time.monotonic(), size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, entry = self._data.popitem(last=False)
+                self._bytes -= entry.size
+                self._stats["evictions"] += 1
+
+    def _discard(self, key):
+        # Kilit tutulurken çağrılır
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _refresh(self, key, loader):
+        try:
+            self._store(key, loader())
+        except Exception as e:
+            self._count("refresh_errors")
+            print(f"⚠️ Önbellek yenilenemedi {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self._stats["background_refreshes"] += 1
+        self._executor.submit(self._refresh, key, loader)
+
+    def get_or_load(self, key, loader, ttl, stale_ttl=0, force=False):
+        """
+        (değer, durum) döndürür. Durum: "hit", "stale", "miss" veya "refresh" (force=True).
+        """
+        if not force:
+            with self._lock:
+                entry = self._data.get(key)
+                if entry is not None:
+                    age = time.monotonic() - entry.stored_at
+                    if age < ttl:
+                        self._data.move_to_end(key)
+                        self._stats["hits"] += 1
+                        return entry.value, HIT
+                    if age < ttl + stale_ttl:
+                        self._data.move_to_end(key)
+                        self._stats["stale_hits"] += 1
+                        stale_value = entry.value
+                    else:
+                        stale_value = None
+                else:
+                    stale_value = None
+            if stale_value is not None:
+                self._schedule_refresh(key, loader)
+                return stale_value, STALE
+
+        self._count("forced_refreshes" if force else "misses")
+        value = loader()
+        self._store(key, value)
+        return value, REFRESH if force else MISS
+
+    def get_fresh(self, key, ttl):
+        """Kayıt TTL içindeyse döndürür (isabet sayılır); değilse None. Yükleme yapmaz."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or time.monotonic() - entry.stored_at >= ttl:
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.value
+
+    def put(self, key, value):
+        """Dışarıda üretilmiş bir değeri önbelleğe yazar."""
+        self._store(key, value)
+
+    def peek(self, key):
+        """Kaydı yaşına bakmadan döndürür; yoksa None."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry.value if entry else None
+
+    def invalidate(self, key=None):
+        """Tek bir kaydı veya key verilmezse tüm önbelleği siler."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+                self._bytes = 0
+            else:
+                self._discard(key)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._data)
+            stats["bytes"] = self._bytes
+            stats["refreshing"] = len(self._refreshing)
+        stats["max_entries"] = self.max_entries
+        stats["max_bytes"] = self.max_bytes
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
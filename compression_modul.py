@@ -0,0 +1,107 @@
+"""
+Yanıt sıkıştırma (ASGI middleware).
+
+İstemcinin Accept-Encoding başlığına göre brotli (kuruluysa) veya gzip seçilir;
+MIN_SIZE bayttan küçük yanıtlar olduğu gibi gönderilir. Akış yanıtları (ndjson,
+SSE) sıkıştırılmaz: parçalar tamponlanmadan, üretildikleri anda gitmelidir.
+Büyük gövdeler event loop'u tutmasın diye thread'de sıkıştırılır.
+"""
+import gzip
+import os
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Sadece gzip sunulur
+    brotli = None
+
+
+MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # Bu boyutun altı sıkıştırılmaz (bayt)
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))  # 0-11; dinamik yanıt için düşük tutulur
+THREAD_MIN_SIZE = 128 * 1024  # Bu boyutun üstü thread'de sıkıştırılır
+
+# Eşit tercihte önce gelen seçilir
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding, encodings=ENCODINGS):
+    """Accept-Encoding başlığından (q değerleriyle) kullanılacak kodlamayı seçer; yoksa None."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body, encoding, gzip_level=GZIP_LEVEL, brotli_quality=BROTLI_QUALITY):
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size=MIN_SIZE, gzip_level=GZIP_LEVEL, brotli_quality=BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Gövdenin ilk parçası görülene kadar başlıklar bekletilir
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            pending, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=pending["headers"])
+            if message.get("more_body", False) or len(body) < self.minimum_size or "content-encoding" in headers:
+                await send(pending)
+                await send(message)
+                return
+
+            if len(body) >= THREAD_MIN_SIZE:
+                body = await anyio.to_thread.run_sync(compress, body, encoding, self.gzip_level, self.brotli_quality)
+            else:
+                body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(pending)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
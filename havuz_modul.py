@@ -0,0 +1,183 @@
+"""
+Önceden başlatılmış tarayıcılar için sınırlı havuz.
+
+Her istek için Chrome açıp kapatmak yerine sürücüler havuzdan ödünç alınır.
+Havuz boyutu aynı anda açık olabilecek tarayıcı sayısının üst sınırıdır; boş
+sürücü yoksa istek kuyrukta bekler ve bekleme süreleri istatistiklere yazılır.
+"""
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Havuzdan belirtilen süre içinde sürücü alınamadı."""
+
+
+class _Entry:
+    __slots__ = ("driver", "uses")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    factory: Yeni, ayarları yapılmış bir sürücü döndüren fonksiyon.
+    reset: Kullanım sonrası sürücüyü temizleyen fonksiyon (çerez, storage vb.).
+    max_uses: Bu kadar kullanımdan sonra sürücü kapatılıp yenisi açılır.
+    is_broken: Blokta yükselen hatanın sürücüyü kullanılamaz bırakıp bırakmadığına
+    karar verir (ör. oturum kopması). False dönerse sürücü havuza geri verilir;
+    verilmezse her hata sürücüyü yeniler.
+    """
+
+    def __init__(self, factory, size=2, max_uses=20, reset=None, acquire_timeout=60, is_broken=None):
+        self._factory = factory
+        self._reset = reset
+        self._is_broken = is_broken or (lambda error: True)
+        self.size = size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._stats = {
+            "created": 0,
+            "recycled": 0,
+            "crashed": 0,
+            "checkouts": 0,
+            "timeouts": 0,
+            "waiting": 0,
+            "in_use": 0,
+            "wait_total_sec": 0.0,
+            "wait_max_sec": 0.0,
+        }
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._stats[key] += value
+
+    def _new_entry(self):
+        entry = _Entry(self._factory())
+        self._count("created")
+        return entry
+
+    @staticmethod
+    def _quit(entry):
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _alive(entry):
+        try:
+            entry.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def warm(self, count=None):
+        """Havuzu önceden başlatılmış sürücülerle doldurur. Açılan sürücü sayısını döndürür."""
+        target = self.size if count is None else min(count, self.size)
+        opened = 0
+        while self._idle.qsize() < target:
+            if not self._slots.acquire(blocking=False):
+                break
+            try:
+                self._idle.put(self._new_entry())
+                opened += 1
+            except Exception as e:
+                print(f"⚠️ Havuz ısıtılamadı: {e}")
+                break
+            finally:
+                self._slots.release()
+        return opened
+
+    @contextmanager
+    def driver(self):
+        """
+        Havuzdan bir sürücü ödünç verir. Blok, is_broken'ın sürücüyü bozduğunu
+        söylediği bir hatayla biterse sürücü kapatılır ve yenisi açılır.
+        """
+        started = time.monotonic()
+        self._count("waiting")
+        acquired = self._slots.acquire(timeout=self.acquire_timeout)
+        waited = time.monotonic() - started
+        with self._lock:
+            self._stats["waiting"] -= 1
+            self._stats["wait_total_sec"] += waited
+            self._stats["wait_max_sec"] = max(self._stats["wait_max_sec"], waited)
+            if acquired:
+                self._stats["checkouts"] += 1
+                self._stats["in_use"] += 1
+            else:
+                self._stats["timeouts"] += 1
+        if not acquired:
+            raise PoolTimeout(f"{self.acquire_timeout} sn içinde boş tarayıcı bulunamadı.")
+
+        entry = None
+        healthy = False
+        try:
+            try:
+                entry = self._idle.get_nowait()
+                if not self._alive(entry):
+                    self._count("crashed")
+                    self._quit(entry)
+                    entry = self._new_entry()
+            except queue.Empty:
+                entry = self._new_entry()
+            entry.uses += 1
+            try:
+                yield entry.driver
+            except Exception as e:
+                # Sayfa zaman aşımı gibi hatalarda sürücü sağlamdır
+                healthy = not self._is_broken(e)
+                raise
+            healthy = True
+        finally:
+            self._release(entry, healthy)
+
+    def _release(self, entry, healthy):
+        try:
+            if entry is None:
+                return
+            if not healthy:
+                self._count("crashed")
+                self._quit(entry)
+                return
+            if entry.uses >= self.max_uses:
+                self._count("recycled")
+                self._quit(entry)
+                return
+            if self._reset:
+                try:
+                    self._reset(entry.driver)
+                except Exception:
+                    self._count("crashed")
+                    self._quit(entry)
+                    return
+            self._idle.put(entry)
+        finally:
+            self._count("in_use", -1)
+            self._slots.release()
+
+    def close(self):
+        """Boştaki tüm sürücüleri kapatır."""
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(entry)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["size"] = self.size
+        stats["idle"] = self._idle.qsize()
+        stats["wait_avg_sec"] = stats["wait_total_sec"] / stats["checkouts"] if stats["checkouts"] else 0.0
+        return stats
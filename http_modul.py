@@ -0,0 +1,200 @@
+"""
+Ortak HTTP katmanı.
+
+Biletinial ve Microfon modülleri istekleri tek bir requests.Session üzerinden
+atar. Session, host başına keep-alive bağlantı havuzu tuttuğu için aynı siteye
+giden ardışık isteklerde DNS, TCP ve TLS maliyeti tekrar ödenmez.
+
+conditional_get() URL başına ETag / Last-Modified ve son parse sonucunu saklar;
+sayfa değişmediyse ne gövde indirilir ne de yeniden parse edilir.
+
+Tüm istekler outbound_modul'ün host başına zamanlayıcısından geçer: 429 / 5xx'te
+geri çekilerek yeniden deneme ve kaynak çöktüğünde hemen hata veren devre kesici.
+Hız ve eşzamanlılık sınırı sadece scraper'ların limit_source() ile bildirdiği
+kaynak sitelere uygulanır; diğer host'lar (ör. yerel benchmark sunucusu) sınırsızdır.
+Reddedilen istekte OutboundRejected yükselir.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics_modul
+import outbound_modul
+from outbound_modul import CircuitOpenError, OutboundRejected  # noqa: F401  (çağıranlar için)
+
+
+# --- AYARLAR ---
+# Ortam değişkenleriyle değiştirilebilir; çalışma anında configure() kullanılabilir.
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # Havuzda tutulacak host sayısı
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))  # Host başına açık bağlantı sayısı
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+CONDITIONAL_CACHE_SIZE = int(os.getenv("HTTP_CONDITIONAL_CACHE_SIZE", "1024"))  # Hatırlanacak URL sayısı
+
+# Kaynak sitelere uygulanan nezaket ayarları; 0 sınırı kapatır.
+SOURCE_LIMITS = {
+    "rate": float(os.getenv("HTTP_SOURCE_RATE", "8")),  # Saniyede istek
+    "burst": int(os.getenv("HTTP_SOURCE_BURST", "16")),  # Birikebilecek istek
+    "concurrency": int(os.getenv("HTTP_SOURCE_CONCURRENCY", "8")),  # Eşzamanlı istek
+}
+
+# Kaynak olmayan host'lar varsayılan olarak sınırsızdır (HTTP_HOST_RATE / CONCURRENCY).
+# HTTP_HOST_LIMITS ile host bazında değiştirilir: "www.biletinial.com=4/8/4;microfon.co=2/4/2"
+# (saniyede istek / birikebilecek istek / eşzamanlı istek); kaynak ayarından önce gelir.
+SCHEDULER = outbound_modul.OutboundScheduler(
+    rate=float(os.getenv("HTTP_HOST_RATE", "0")),
+    burst=int(os.getenv("HTTP_HOST_BURST", "16")),
+    concurrency=int(os.getenv("HTTP_HOST_CONCURRENCY", "0")),
+    host_limits=outbound_modul.parse_host_limits(os.getenv("HTTP_HOST_LIMITS", "")),
+    max_queue=int(os.getenv("HTTP_HOST_MAX_QUEUE", "100")),  # Sırada bekleyebilecek istek
+    queue_timeout=float(os.getenv("HTTP_QUEUE_TIMEOUT", "30")),  # Sırada en fazla bekleme (sn)
+    max_retries=int(os.getenv("HTTP_MAX_RETRIES", "3")),
+    backoff_base=float(os.getenv("HTTP_BACKOFF_BASE", "0.5")),
+    backoff_max=float(os.getenv("HTTP_BACKOFF_MAX", "10")),
+    max_retry_after=float(os.getenv("HTTP_MAX_RETRY_AFTER", "30")),  # Daha uzun Retry-After'da yeniden denenmez
+    breaker_threshold=int(os.getenv("HTTP_BREAKER_THRESHOLD", "5")),  # Devreyi açan art arda hata sayısı
+    breaker_cooldown=float(os.getenv("HTTP_BREAKER_COOLDOWN", "30")),  # Devrenin açık kalacağı süre (sn)
+    retry_exceptions=(requests.ConnectionError, requests.Timeout),
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Paylaşılan Session'ı döndürür, yoksa oluşturur."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def configure(pool_connections=None, pool_maxsize=None, timeout=None):
+    """
+    Havuz boyutlarını ve varsayılan zaman aşımını günceller.
+    Havuz ayarı değişirse mevcut Session kapatılır, bir sonraki istekte yenisi kurulur.
+    """
+    global POOL_CONNECTIONS, POOL_MAXSIZE, DEFAULT_TIMEOUT
+    if timeout is not None:
+        DEFAULT_TIMEOUT = float(timeout)
+    if pool_connections is None and pool_maxsize is None:
+        return
+    if pool_connections is not None:
+        POOL_CONNECTIONS = int(pool_connections)
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = int(pool_maxsize)
+    close()
+
+
+def close():
+    """Paylaşılan Session'ı ve açık bağlantılarını kapatır."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get(url, headers=None, timeout=None, **kwargs):
+    """
+    requests.get ile aynı imza; bağlantıları paylaşılan havuzdan kullanır.
+    İstek host sınırları içinde atılır, geçici hatalarda yeniden denenir. Host
+    sınırları izin vermezse OutboundRejected (devre açıksa CircuitOpenError).
+    """
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    with metrics_modul.stage("http_request"):
+        return SCHEDULER.request(url, lambda: get_session().get(url, headers=headers, timeout=timeout, **kwargs))
+
+
+def limit_source(base_url):
+    """Kaynak sitenin host'una SOURCE_LIMITS uygulanır (HTTP_HOST_LIMITS'te ayarı yoksa)."""
+    SCHEDULER.limit_host(urlsplit(base_url).netloc, SOURCE_LIMITS)
+
+
+def outbound_stats():
+    """Host başına sıra, eşzamanlılık, devre kesici ve ret / yeniden deneme sayıları."""
+    return SCHEDULER.stats()
+
+
+# --- KOŞULLU İSTEK ---
+NOT_MODIFIED = "not_modified"  # Sunucu 304 döndü, gövde inmedi
+UNCHANGED = "unchanged"  # Gövde indi ama ilgili bölümün özeti aynı, parse atlandı
+PARSED = "parsed"  # Sayfa yeni veya değişmiş, parse edildi
+
+_validators = OrderedDict()  # anahtar -> (etag, last_modified, özet, parse sonucu)
+_validators_lock = threading.Lock()
+_conditional_stats = {NOT_MODIFIED: 0, UNCHANGED: 0, PARSED: 0}
+
+
+def conditional_get(url, parse, fingerprint=None, key=None, headers=None, timeout=None):
+    """
+    Sayfayı koşullu olarak çeker. (status_code, değer, durum) döndürür.
+    parse(response): 200 yanıtını sonuca çevirir; sadece sayfa değiştiyse çağrılır.
+    fingerprint(content): Sayfanın sonucu belirleyen bölümünü döndürür (ör. liste
+    konteynerinin ham HTML'i). Sunucu 304 desteklemese de bu bölümün özeti önceki
+    ile aynıysa önceki sonuç döner.
+    key: Sonuç URL dışında başka değerlere de bağlıysa hatırlama anahtarı.
+    200/304 dışındaki yanıtlarda değer None'dır. Dönen değer paylaşılır, değiştirilmemelidir.
+    """
+    key = key if key is not None else url
+    with _validators_lock:
+        entry = _validators.get(key)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        etag, last_modified = entry[0], entry[1]
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+    response = get(url, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and entry is not None:
+        return _remember(key, entry, NOT_MODIFIED)
+    if response.status_code != 200:
+        return response.status_code, None, None
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    digest = None
+    if fingerprint is not None:
+        digest = hashlib.sha1(fingerprint(response.content)).hexdigest()
+        if entry is not None and entry[2] == digest:
+            return _remember(key, (etag, last_modified, digest, entry[3]), UNCHANGED)
+
+    return _remember(key, (etag, last_modified, digest, parse(response)), PARSED)
+
+
+def _remember(key, entry, state):
+    # Doğrulayıcısı ve özeti olmayan sonuç tekrar kullanılamaz; saklanmaz
+    with _validators_lock:
+        if entry[0] or entry[1] or entry[2]:
+            _validators[key] = entry
+            _validators.move_to_end(key)
+            while len(_validators) > CONDITIONAL_CACHE_SIZE:
+                _validators.popitem(last=False)
+        _conditional_stats[state] += 1
+    return 200, entry[3], state
+
+
+def conditional_stats():
+    with _validators_lock:
+        stats = dict(_conditional_stats)
+        stats["entries"] = len(_validators)
+    return stats
+
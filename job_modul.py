@@ -0,0 +1,202 @@
+"""
+Uzun süren taramalar için arka plan işleri.
+
+İş kuyruğa alınır ve hemen bir kimlik döner; istemci durumu, ilerlemeyi ve sonucu
+ayrıca sorgular. İşler sınırlı bir worker havuzunda çalışır, her kaynağın ayrıca
+kendi eşzamanlılık sınırı vardır. İşler kaynak başına kuyrukta bekler ve sınırı
+dolmamış bir kaynağın işi havuza verilir; böylece sınırı dolu bir kaynağın işleri
+worker tutup diğer kaynakları bekletmez. Biten işler TTL sonunda silinir; her
+iş bittiğinde süresi dolanlar ve max_finished sınırını aşan en eski işler
+temizlenir, böylece istek gelmese de bellekte biriken iş sayısı sınırlı kalır.
+"""
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+FINISHED = (DONE, ERROR, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """İş iptal edildiğinde ilerleme çağrısından yükseltilir."""
+
+
+class Job:
+    def __init__(self, source, params):
+        self.id = uuid.uuid4().hex
+        self.source = source
+        self.params = params
+        self.status = QUEUED
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def report(self, progress):
+        """Scraper'ların ilerleme geri çağrısı. İptal edildiyse taramayı durdurur."""
+        if self.cancel_event.is_set():
+            raise JobCancelled("İş iptal edildi.")
+        self.progress = dict(progress)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "source": self.source,
+            "params": self.params,
+            "status": self.status,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class JobManager:
+    """
+    runner: runner(source, params, progress) -> sonuç sözlüğü.
+    is_error: Sonucun hata olup olmadığına karar verir.
+    source_limits: Kaynak başına aynı anda çalışabilecek iş sayısı.
+    ttl: Biten işin sorgulanabileceği süre (sn).
+    max_finished: Bellekte tutulan en fazla biten iş sayısı; aşılırsa en eskisi silinir.
+    """
+
+    def __init__(self, runner, is_error=None, max_workers=4, source_limits=None, ttl=3600, max_jobs=1000,
+                 max_finished=1000):
+        self._runner = runner
+        self._is_error = is_error or (lambda result: False)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._limits = dict(source_limits or {})
+        self._pending = {}  # kaynak -> sıradaki işler
+        self._running = {}  # kaynak -> havuza verilmiş iş sayısı
+        self._active = 0
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self.max_finished = max_finished
+        self._jobs = {}
+        self._finished = deque()  # bitiş sırasına göre biten işler
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        # Kilit tutulurken çağrılır; en eski biten işler kuyruğun başındadır
+        cutoff = time.time() - self.ttl
+        while self._finished and (
+            len(self._finished) > self.max_finished or self._finished[0].finished_at < cutoff
+        ):
+            job = self._finished.popleft()
+            self._jobs.pop(job.id, None)
+
+    def _expire(self):
+        with self._lock:
+            self._evict()
+
+    def submit(self, source, params):
+        """İşi kuyruğa alır. Kuyruk doluysa RuntimeError yükseltir."""
+        self._expire()
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if job.status not in FINISHED)
+            if active >= self.max_jobs:
+                raise RuntimeError("İş kuyruğu dolu, daha sonra tekrar deneyin.")
+            job = Job(source, params)
+            self._jobs[job.id] = job
+            self._pending.setdefault(source, deque()).append(job)
+        self._dispatch()
+        return job
+
+    def _dispatch(self):
+        # Sınırı dolmamış kaynaklardan sırayla iş al (round-robin)
+        with self._lock:
+            while self._active < self.max_workers:
+                submitted = False
+                for source, queue in self._pending.items():
+                    if not queue or self._active >= self.max_workers:
+                        continue
+                    if self._running.get(source, 0) >= self._limits.get(source, self.max_workers):
+                        continue
+                    job = queue.popleft()
+                    self._running[source] = self._running.get(source, 0) + 1
+                    self._active += 1
+                    job.future = self._executor.submit(self._run, job)
+                    submitted = True
+                if not submitted:
+                    return
+
+    def _release(self, job):
+        with self._lock:
+            self._running[job.source] -= 1
+            self._active -= 1
+        self._dispatch()
+
+    def get(self, job_id):
+        self._expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """İşi iptal eder. Çalışan tarama bir sonraki ilerleme adımında durur."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        job.cancel_event.set()
+        with self._lock:
+            queue = self._pending.get(job.source)
+            queued = job in queue if queue else False
+            if queued:
+                queue.remove(job)
+        if queued:
+            self._finish(job, CANCELLED, error="İş iptal edildi.")
+        elif job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED, error="İş iptal edildi.")
+            self._release(job)
+        return job
+
+    def _finish(self, job, status, result=None, error=None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        with self._lock:
+            self._finished.append(job)
+            self._evict()
+
+    def _run(self, job):
+        try:
+            if job.cancel_event.is_set():
+                self._finish(job, CANCELLED, error="İş iptal edildi.")
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+            result = self._runner(job.source, job.params, job.report)
+            if job.cancel_event.is_set():
+                self._finish(job, CANCELLED, error="İş iptal edildi.")
+            elif self._is_error(result):
+                self._finish(job, ERROR, error=result.get("message") if isinstance(result, dict) else str(result))
+            else:
+                self._finish(job, DONE, result=result)
+        except JobCancelled as e:
+            self._finish(job, CANCELLED, error=str(e))
+        except Exception as e:
+            self._finish(job, ERROR, error=str(e))
+        finally:
+            self._release(job)
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            queued = {source: len(queue) for source, queue in self._pending.items() if queue}
+        return {"jobs": counts, "queued": queued, "max_workers": self.max_workers, "ttl": self.ttl,
+                "max_finished": self.max_finished}
@@ -0,0 +1,333 @@
+"""
+Kaynak (scraper) kayıt defteri.
+
+API scraper'ları doğrudan değil buradan çağırır. İstek normalleştirme, yanıt
+önbelleği ve özdeş isteklerin birleştirilmesi gibi tüm kaynaklarda ortak olan
+adımlar burada toplanır.
+"""
+import os
+import queue
+import threading
+import time
+
+import biletinial_modul
+import bubilet_modul
+import burs_microfon
+import cache_modul
+import metrics_modul
+import model_modul
+import query_modul
+import scheduler_modul
+import singleflight_modul
+import store_modul
+
+
+def _biletinial_scope(params):
+    # run_biletinial'in istek attığı URL'yi belirleyen değerler: (şehir, kategori)
+    return (params["city"].lower(), biletinial_modul.CATEGORIES.get(params["category"], "sinema"))
+
+
+def _bubilet_scope(params):
+    return (bubilet_modul.url_hazirla(params["city"]), bubilet_modul.url_hazirla(params["category"]))
+
+
+def _microfon_scope(params):
+    # Burslar şehre bağlı değil; seviye kategori yerine geçer
+    return ("", burs_microfon._normalize_level(params["level"]))
+
+
+def _microfon_check(params):
+    if not burs_microfon._normalize_level(params["level"]):
+        return f"Geçersiz okul seviyesi: {params['level']}. Seçenekler: {', '.join(burs_microfon.LEVEL_MAP)}"
+    return None
+
+
+def _run_biletinial(params, progress=None, on_item=None):
+    return biletinial_modul.run_biletinial(params["category"], params["city"], on_item=on_item)
+
+
+def _run_bubilet(params, progress=None, on_item=None):
+    return bubilet_modul.run_bubilet(params["category"], params["city"], progress=progress, on_item=on_item)
+
+
+def _run_microfon(params, progress=None, on_item=None):
+    window = params.get("window", burs_microfon.PAGE_WINDOW)
+    return burs_microfon.run_microfon(params["level"], window=window, progress=progress, on_item=on_item)
+
+
+# ttl: Taze kabul edilme süresi (sn), stale_ttl: Sonrasında eski kopyanın
+# arka planda yenilenirken sunulabileceği ek süre (sn), items: Sonuçtaki liste alanı,
+# scope: İsteğin normalleştirilmiş (şehir, kategori) kapsamı, fields: İstek parametreleri,
+# record: Listedeki kayıtların tipi, check: Parametreler geçersizse hata mesajı döndürür
+SOURCES = {
+    "biletinial": {
+        "run": _run_biletinial,
+        "items": "events",
+        "record": model_modul.BiletinialEvent,
+        "scope": _biletinial_scope,
+        "fields": ("city", "category"),
+        "ttl": int(os.getenv("CACHE_TTL_BILETINIAL", "600")),
+        "stale_ttl": int(os.getenv("CACHE_STALE_BILETINIAL", "1800")),
+    },
+    "bubilet": {
+        "run": _run_bubilet,
+        "items": "events",
+        "record": model_modul.BubiletEvent,
+        "scope": _bubilet_scope,
+        "fields": ("city", "category"),
+        "ttl": int(os.getenv("CACHE_TTL_BUBILET", "1800")),
+        "stale_ttl": int(os.getenv("CACHE_STALE_BUBILET", "3600")),
+    },
+    "microfon": {
+        "run": _run_microfon,
+        "items": "scholarships",
+        "record": model_modul.Scholarship,
+        "scope": _microfon_scope,
+        "check": _microfon_check,
+        "fields": ("level",),
+        "ttl": int(os.getenv("CACHE_TTL_MICROFON", "3600")),
+        "stale_ttl": int(os.getenv("CACHE_STALE_MICROFON", "7200")),
+    },
+}
+
+
+def is_error(result):
+    return not isinstance(result, dict) or result.get("status") == "error"
+
+
+CACHE = cache_modul.TTLCache(
+    max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "256")),
+    max_bytes=int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+    should_cache=lambda result: not is_error(result),
+)
+
+
+# SINGLEFLIGHT_LOCK_DIR verilirse aynı makinedeki worker'lar arasında da birleştirilir
+FLIGHTS = singleflight_modul.SingleFlight(lock_dir=os.getenv("SINGLEFLIGHT_LOCK_DIR") or None)
+
+
+# Kalıcı depo isteğe bağlıdır: STORE_PATH verilmezse (ör. STORE_PATH=etkinlikler.db)
+# sonuçlar depoya yazılmaz ve modülü içe aktarmak diskte dosya oluşturmaz
+STORE_PATH = os.getenv("STORE_PATH", "")
+STORE = store_modul.EventStore(STORE_PATH) if STORE_PATH else None
+
+
+def check(source, params):
+    """Parametreler kaynağın tarayabileceği değerlerse None, değilse hata mesajı döndürür."""
+    validate = SOURCES[source].get("check")
+    return validate(params) if validate else None
+
+
+def cache_key(source, params):
+    """Normalleştirilmiş istek anahtarı: aynı sayfaya giden istekler aynı anahtarı alır."""
+    return (source,) + SOURCES[source]["scope"](params)
+
+
+def _record(source, params, result):
+    """
+    Başarılı canlı taramayı kalıcı depoya yazar ve sonuca "changes" alanını ekler:
+    önceki taramaya göre eklenen, değişen ve kaybolan kayıtların anahtarları.
+    "partial" işaretli sonuçlarda kaybolan kayıtlar hesaplanmaz.
+    """
+    if STORE is None or is_error(result):
+        return result
+    city, category = SOURCES[source]["scope"](params)
+    try:
+        result["changes"] = STORE.sync(
+            source, city, category, result.get(SOURCES[source]["items"], []), complete=not result.get("partial")
+        )
+    except Exception as e:
+        print(f"⚠️ Depoya yazılamadı {source}: {e}")
+    return result
+
+
+# Anahtar başına son isteklerin sıklığı; ön ısıtma önceliğinde kullanılır
+DEMAND = scheduler_modul.DemandCounter(half_life=int(os.getenv("PREWARM_DEMAND_HALF_LIFE", "3600")))
+
+
+def _run(source, params, progress=None, on_item=None):
+    """Canlı taramayı yapar; süre ve kayıt sayısı metriklere, sonuç depoya yazılır."""
+    config = SOURCES[source]
+    with metrics_modul.scope(source, *config["scope"](params)):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            # Kayıtlar bir kez sözlüğe çevrilir; önbellek ve yanıtlar hep sözlük görür
+            result = model_modul.plain(config["run"](params, progress=progress, on_item=on_item))
+            if not is_error(result):
+                status = "success"
+                metrics_modul.count_items(len(result.get(config["items"], [])))
+        finally:
+            metrics_modul.observe_scrape(time.perf_counter() - started, status)
+    return _record(source, params, result)
+
+
+def _cacheable(result):
+    # "changes" sadece canlı taramayı yapan (veya ona katılan) yanıtta döner;
+    # önbellekteki kopyada tutulursa sonraki isabetler eski değişiklikleri gösterir
+    if isinstance(result, dict) and "changes" in result:
+        return {key: value for key, value in result.items() if key != "changes"}
+    return result
+
+
+def _load(source, params, key, progress=None):
+    # Aynı anahtar için süren tarama varsa ona katıl
+    result, _ = FLIGHTS.do(key, lambda: _run(source, params, progress))
+    return result
+
+
+def scrape(source, params, refresh=False, progress=None):
+    """
+    Kaynağı önbellek üzerinden tarar. (sonuç, önbellek durumu) döndürür.
+    refresh=True ise önbellek atlanır ve sonuç yenilenir.
+    progress verilirse tarama ilerledikçe çağrılır (başka bir isteğin süren
+    taramasına katılınırsa çağrılmaz). "changes" alanı sadece canlı tarama
+    sonucunda ("miss" / "refresh") bulunur.
+    """
+    config = SOURCES[source]
+    key = cache_key(source, params)
+    DEMAND.note(key)
+    live = {}
+
+    def load():
+        live["result"] = _load(source, params, key, progress)
+        return _cacheable(live["result"])
+
+    result, cache_state = CACHE.get_or_load(key, load, config["ttl"], config["stale_ttl"], force=refresh)
+    if cache_state in (cache_modul.MISS, cache_modul.REFRESH) and "result" in live:
+        result = live["result"]
+    return result, cache_state
+
+
+def run_job(source, params, progress=None):
+    """
+    Arka plan işinin taraması. Taze önbellek kaydı varsa onu döndürür; yoksa ortak
+    uçuşa (FLIGHTS) katılmadan canlı tarar ve başarılı sonucu önbelleğe yazar.
+    İş iptal edilince progress'in yükselttiği hata yalnızca bu taramayı durdurur;
+    aynı anahtarı bekleyen başka isteklere yayılmaz.
+    """
+    config = SOURCES[source]
+    key = cache_key(source, params)
+    DEMAND.note(key)
+    cached = CACHE.get_fresh(key, config["ttl"])
+    if cached is not None:
+        return cached
+    result = _run(source, params, progress=progress)
+    CACHE.put(key, _cacheable(result))
+    return result
+
+
+# /scrape yanıtında liste alanının biçimi: sözlük listesi veya alan adları bir kez yazılan satırlar
+LAYOUTS = ("objects", "rows")
+
+
+def shape(source, result, fields=None, sort=None, limit=None, cursor=None, layout=None):
+    """
+    Tarama sonucunu yanıt için daraltır; önbellekteki sonuç değiştirilmez.
+    fields: Kayıtlarda bırakılacak alanlar. Verilirse sonuçtaki diğer liste / sözlük
+    alanları (scanned_urls, changes) da adları fields'ta yoksa çıkarılır.
+    sort, limit, cursor: query_modul.page_items; limit veya cursor verilirse
+    yanıta next_cursor eklenir.
+    layout="rows" ise liste alanı {"fields": [...], "rows": [[...], ...]} olarak döner.
+    Geçersiz değerlerde ValueError yükseltir.
+    """
+    if layout is not None and layout not in LAYOUTS:
+        raise ValueError(f"Geçersiz biçim: {layout}. Seçenekler: {', '.join(LAYOUTS)}")
+    rows = layout == "rows"
+    if not (fields or sort or limit or cursor or rows) or is_error(result):
+        return result
+    config = SOURCES[source]
+    record_fields = config["record"].FIELDS
+    fields = fields or []
+    unknown = [name for name in fields if name not in record_fields and name not in result]
+    if unknown:
+        raise ValueError(f"Geçersiz alan: {', '.join(unknown)}. Seçenekler: {', '.join(record_fields)}")
+    items, next_cursor = query_modul.page_items(
+        result.get(config["items"], []),
+        store_modul.FIELDS[source]["key"],
+        record_fields,
+        fields=None if rows else [name for name in fields if name in record_fields],
+        sort=sort,
+        limit=limit,
+        cursor=cursor,
+    )
+    if rows:
+        items = model_modul.rows(items, [name for name in fields if name in record_fields] or record_fields)
+    shaped = {}
+    for key, value in result.items():
+        if key == config["items"]:
+            value = items
+        elif fields and isinstance(value, (list, dict)) and key not in fields:
+            continue
+        shaped[key] = value
+    if limit or cursor:
+        shaped["next_cursor"] = next_cursor
+    return shaped
+
+
+def prewarm(source, params):
+    """
+    Önbelleği kullanıcı isteği beklemeden yeniler (talep sayılmaz). Başarılı sonuç
+    önbelleğe ve depoya yazılır; aynı anda gelen kullanıcı isteği bu taramaya katılır.
+    """
+    key = cache_key(source, params)
+    result = _load(source, params, key)
+    CACHE.put(key, _cacheable(result))
+    return result
+
+
+class StreamClosed(Exception):
+    """İstemci akışı kapattığında taramayı durdurmak için yükseltilir."""
+
+
+def _summary(source, result, cache_state):
+    summary = {key: value for key, value in result.items() if key != SOURCES[source]["items"]}
+    summary["cache"] = cache_state
+    return summary
+
+
+def stream(source, params):
+    """
+    Kaynağı tarar ve sonuçları üretildikçe verir: önce ("item", kayıt) çiftleri,
+    en sonda ("summary", liste alanı çıkarılmış sonuç). Taze önbellek kaydı varsa
+    ondan okunur; yoksa canlı tarama yapılır ve başarılı sonuç önbelleğe yazılır.
+    Üreteç kapatılırsa (istemci koptu) tarama bir sonraki kayıtta durdurulur.
+    """
+    config = SOURCES[source]
+    key = cache_key(source, params)
+    DEMAND.note(key)
+
+    cached = CACHE.get_fresh(key, config["ttl"])
+    if cached is not None:
+        for item in cached.get(config["items"], []):
+            yield "item", item
+        yield "summary", _summary(source, cached, cache_modul.HIT)
+        return
+
+    messages = queue.Queue()
+    closed = threading.Event()
+
+    def on_item(item):
+        if closed.is_set():
+            raise StreamClosed("Akış kapatıldı.")
+        messages.put(("item", item))
+
+    def worker():
+        try:
+            result = _run(source, params, on_item=on_item)
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        messages.put(("result", result))
+
+    threading.Thread(target=worker, name=f"stream-{source}", daemon=True).start()
+    try:
+        while True:
+            kind, value = messages.get()
+            if kind == "result":
+                break
+            yield kind, value
+        if not is_error(value):
+            CACHE.put(key, _cacheable(value))
+        yield "summary", _summary(source, value, cache_modul.MISS)
+    finally:
+        closed.set()
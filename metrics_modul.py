@@ -0,0 +1,216 @@
+"""
+Hafif, bağımlılıksız metrikler ve Prometheus metin çıktısı.
+
+Taramanın her aşaması (ağ isteği, tarayıcı açılışı, scroll, HTML parse, tarih
+parse ...) scrape_stage_seconds histogramına kaynak / şehir / kategori / aşama
+etiketleriyle yazılır. Şehir ve kategori etiketleri taramanın başında scope() ile
+belirlenir; derindeki fonksiyonlar sadece aşama adını verir. Etiket değeri sayısı
+sınırlıdır: bir etiket için MAX_LABEL_VALUES farklı değerden sonrası "other" olur.
+
+Dış isteklerin host başına sıra derinliği, bekleme süresi, reddedilen ve yeniden
+denenen istekleri http_outbound_* metrikleriyle (host etiketiyle) yazılır.
+"""
+import contextvars
+import os
+import threading
+import time
+
+MAX_LABEL_VALUES = int(os.getenv("METRICS_MAX_LABEL_VALUES", "50"))
+OTHER = "other"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_scope = contextvars.ContextVar("metrics_scope", default=("", "", ""))
+_label_values = {}
+_label_lock = threading.Lock()
+
+
+def _bounded(label, value):
+    """Etiket değerini sınırlı kümeye indirger; küme doluysa yeni değerler "other" olur."""
+    value = str(value or "").strip().lower()
+    with _label_lock:
+        seen = _label_values.setdefault(label, set())
+        if value in seen:
+            return value
+        if len(seen) >= MAX_LABEL_VALUES:
+            return OTHER
+        seen.add(value)
+        return value
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=""):
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # etiketler -> [kova sayıları..., toplam, adet]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            inf = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {values[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {values[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {values[-1]}")
+        return lines
+
+
+SCOPE_LABELS = ("source", "city", "category")
+
+STAGE_SECONDS = Histogram(
+    "scrape_stage_seconds",
+    "Tarama aşamalarının süresi (sn).",
+    SCOPE_LABELS + ("stage",),
+)
+SCRAPE_SECONDS = Histogram(
+    "scrape_seconds",
+    "Canlı taramanın toplam süresi (sn).",
+    SCOPE_LABELS + ("status",),
+)
+CARDS_SEEN = Counter("scrape_cards_seen_total", "Sayfada bulunan kart sayısı.", SCOPE_LABELS)
+ITEMS_EXTRACTED = Counter("scrape_items_extracted_total", "Sonuca giren etkinlik / burs sayısı.", SCOPE_LABELS)
+
+OUTBOUND_REQUESTS = Counter(
+    "http_outbound_requests_total", "Host'a giden istek denemeleri (durum kodu veya hata adı).", ("host", "status")
+)
+OUTBOUND_QUEUED = Gauge("http_outbound_queue_depth", "Hız / eşzamanlılık sınırı için sırada bekleyen istek.", ("host",))
+OUTBOUND_IN_FLIGHT = Gauge("http_outbound_in_flight", "Host'a o anda açık istek sayısı.", ("host",))
+OUTBOUND_CIRCUIT_OPEN = Gauge("http_outbound_circuit_open", "Devre kesici açık (1) veya kapalı (0).", ("host",))
+OUTBOUND_WAIT = Histogram("http_outbound_wait_seconds", "İsteğin sırada beklediği süre (sn).", ("host",))
+OUTBOUND_REJECTED = Counter(
+    "http_outbound_rejections_total", "Gönderilmeden reddedilen istekler.", ("host", "reason")
+)
+OUTBOUND_RETRIES = Counter("http_outbound_retries_total", "Yeniden denenen istekler.", ("host", "reason"))
+
+REGISTRY = [
+    STAGE_SECONDS, SCRAPE_SECONDS, CARDS_SEEN, ITEMS_EXTRACTED,
+    OUTBOUND_REQUESTS, OUTBOUND_QUEUED, OUTBOUND_IN_FLIGHT, OUTBOUND_CIRCUIT_OPEN,
+    OUTBOUND_WAIT, OUTBOUND_REJECTED, OUTBOUND_RETRIES,
+]
+
+
+class scope:
+    """Bu blokta (ve aynı thread'de çağrılan fonksiyonlarda) ölçümlerin kaynak / şehir / kategori etiketi."""
+
+    __slots__ = ("labels", "_token")
+
+    def __init__(self, source, city="", category=""):
+        self.labels = (_bounded("source", source), _bounded("city", city), _bounded("category", category))
+
+    def __enter__(self):
+        self._token = _scope.set(self.labels)
+        return self
+
+    def __exit__(self, *exc):
+        _scope.reset(self._token)
+        return False
+
+
+class stage:
+    """Bloğun süresini geçerli kapsamın etiketleriyle scrape_stage_seconds'a yazar."""
+
+    __slots__ = ("name", "_started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        STAGE_SECONDS.observe(_scope.get() + (self.name,), time.perf_counter() - self._started)
+        return False
+
+
+def observe_scrape(seconds, status):
+    SCRAPE_SECONDS.observe(_scope.get() + (status,), seconds)
+
+
+def count_cards(count):
+    CARDS_SEEN.inc(_scope.get(), count)
+
+
+def count_items(count):
+    ITEMS_EXTRACTED.inc(_scope.get(), count)
+
+
+def host_label(host):
+    """Host adını sınırlı etiket değerine çevirir (http_outbound_* metrikleri için)."""
+    return _bounded("host", host)
+
+
+def copy_context():
+    """Thread havuzuna verilen işlerin kapsamı taşıması için: executor.submit(copy_context().run, fn, ...)."""
+    return contextvars.copy_context()
+
+
+def expose():
+    """Tüm metrikleri Prometheus metin biçiminde döndürür."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,153 @@
+"""
+Etkinlik ve burs kayıt tipleri ve hızlı JSON çıktısı.
+
+Scraper'lar her kart için bir sözlük yerine __slots__'lu bir kayıt üretir: alan
+adları sınıfta bir kez tutulur, 10 bin etkinlikte bellek sözlüğün yaklaşık
+üçte biridir. Kayıtlar sözlük gibi de okunabilir (event["title"], event.get("price")).
+
+Kayıtlar taramanın kendi bellek içi koleksiyonlarında kullanılır. Tarama sonucu
+kaynak_modul'den çıkarken plain() ile bir kez sözlüğe çevrilir: orjson slotlu
+dataclass'ları sözlüklerden birkaç kat yavaş yazar ve önbellekteki sonuç her
+isabette yeniden yazılır. Önbellek, süreçler arası birleştirme ve yanıtlar böylece
+hep aynı tipi (sözlük) görür.
+
+FIELDS yanıttaki alan sırasıdır ve kayıtlardan önceki sözlüklerle aynıdır (ör.
+Bubilet'te price, link'ten önce gelir). dumps() kayıtları da bu sırayla yazar.
+rows() listeyi alan adları bir kez yazılan satır biçimine çevirir (/scrape
+yanıtlarında layout=rows).
+
+dumps() orjson kuruluysa onu kullanır; kurulu değilse standart json modülüne düşer.
+"""
+import dataclasses
+import json
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:  # Hızlı serileştirme opsiyonel
+    orjson = None
+
+
+class Record:
+    """Kayıt tiplerinin ortak davranışı: sözlük gibi okuma, sözlüğe / satıra çevirme."""
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def to_row(self):
+        """Alan değerleri FIELDS sırasıyla (sütunlu çıktı için)."""
+        return [getattr(self, name) for name in self.FIELDS]
+
+
+def _record(cls):
+    cls = dataclass(slots=True)(cls)
+    names = tuple(field.name for field in dataclasses.fields(cls))
+    # Sınıf kendi FIELDS sırasını verebilir; yoksa tanım sırası kullanılır
+    order = cls.__dict__.get("FIELDS")
+    if order is None:
+        cls.FIELDS = names
+    elif sorted(order) != sorted(names):
+        raise TypeError(f"{cls.__name__}.FIELDS alanlarla uyuşmuyor: {order}")
+    return cls
+
+
+@_record
+class Event(Record):
+    """Biletinial ve Bubilet etkinliklerinin ortak alanları."""
+
+    city: str
+    category: str
+    title: str
+    venue: str | None
+    date: str | None  # "DD.MM.YYYY" veya "DD.MM.YYYY - DD.MM.YYYY"
+    link: str
+    image_url: str | None
+
+
+@_record
+class BiletinialEvent(Event):
+    SOURCE = "biletinial"
+    FIELDS = ("category", "city", "venue", "title", "link", "date", "image_url")
+
+
+@_record
+class BubiletEvent(Event):
+    SOURCE = "bubilet"
+    FIELDS = ("city", "category", "title", "venue", "date", "price", "link", "image_url")
+
+    price: str
+
+
+@_record
+class Scholarship(Record):
+    SOURCE = "microfon"
+
+    provider: str
+    title: str
+    detail_url: str
+    image_url: str
+    application_dates: str
+    location: str
+    level: str
+    amount: str
+    duration: str
+    description: str
+
+
+def rows(items, fields):
+    """Kayıt veya sözlük listesini {"fields": [...], "rows": [[...], ...]} biçimine çevirir."""
+    fields = list(fields)
+    return {"fields": fields, "rows": [[item.get(name) for name in fields] for item in items]}
+
+
+def plain(result):
+    """
+    Sonuçtaki kayıt listelerini sözlük listesine çevirir (yeni sözlük döndürür).
+    Sözlük olmayan değerler ve kayıt içermeyen alanlar olduğu gibi kalır.
+    """
+    if not isinstance(result, dict):
+        return result
+    converted = {}
+    for key, value in result.items():
+        if isinstance(value, list) and value and isinstance(value[0], Record):
+            value = [item.to_dict() if isinstance(item, Record) else item for item in value]
+        converted[key] = value
+    return converted
+
+
+def default(value):
+    """json.dumps(..., default=default): kayıtları sözlüğe çevirir."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+def dumps(value):
+    """Değeri UTF-8 JSON baytlarına çevirir (Türkçe karakterler kaçırılmaz)."""
+    if orjson is not None:
+        # Kayıtlar default() ile FIELDS sırasında yazılır
+        return orjson.dumps(value, default=default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(value, ensure_ascii=False, default=default, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,345 @@
+"""
+Kaynak sitelere giden istekler için host başına nazik zamanlayıcı.
+
+Her host için:
+  - Token bucket: saniyede rate istek, en fazla burst kadar birikmiş hak.
+  - Eşzamanlılık sınırı: aynı anda en fazla concurrency açık istek.
+  - Sıra: sınır doluysa istek sırada bekler; sıra max_queue'yu aşarsa veya
+    bekleme queue_timeout'u geçerse istek gönderilmeden reddedilir.
+  - Yeniden deneme: 429 / 5xx ve bağlantı hatalarında üstel, rastgele gecikmeli
+    (full jitter) yeniden deneme. Retry-After verilirse ona uyulur ve host'un
+    tamamı o süre bekletilir.
+  - Devre kesici: art arda breaker_threshold hatadan sonra host breaker_cooldown
+    boyunca hiç denenmez, istekler hemen reddedilir. Süre dolunca tek bir deneme
+    isteği gönderilir; başarılıysa devre kapanır.
+"""
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import metrics_modul
+
+# Devre kesici durumları
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Ret nedenleri
+CIRCUIT_OPEN = "circuit_open"
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+PAUSED = "paused"  # Retry-After süresi sıra beklemesinden uzun
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class OutboundRejected(Exception):
+    """İstek host sınırları nedeniyle gönderilmedi."""
+
+    def __init__(self, host, reason, retry_after=None):
+        self.host = host
+        self.reason = reason
+        self.retry_after = retry_after
+        message = f"{host} isteği reddedildi ({reason})"
+        if retry_after:
+            message += f"; {retry_after:.0f} sn sonra tekrar deneyin"
+        super().__init__(message)
+
+
+class CircuitOpenError(OutboundRejected):
+    """Host art arda hata verdiği için geçici olarak devre dışı."""
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After başlığını (saniye veya HTTP tarihi) saniyeye çevirir; geçersizse None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment is None:
+        return None
+    return max(0.0, moment.timestamp() - (time.time() if now is None else now))
+
+
+def parse_host_limits(text):
+    """
+    "host=rate/burst/concurrency;..." biçimindeki ayarı sözlüğe çevirir.
+    Ör. "www.biletinial.com=4/8/4;microfon.co=2/4/2". Boş bırakılan değer varsayılanı kullanır.
+    """
+    limits = {}
+    for entry in filter(None, (part.strip() for part in text.split(";"))):
+        host, _, values = entry.partition("=")
+        parts = values.split("/")
+        if not host or not values or len(parts) > 3:
+            raise ValueError(f"Geçersiz host sınırı: {entry}")
+        try:
+            rate, burst, concurrency = (parts + ["", ""])[:3]
+            limits[host.strip().lower()] = {
+                key: cast(value)
+                for key, cast, value in (("rate", float, rate), ("burst", int, burst), ("concurrency", int, concurrency))
+                if value.strip()
+            }
+        except ValueError:
+            raise ValueError(f"Geçersiz host sınırı: {entry}")
+    return limits
+
+
+class _Host:
+    """Tek bir host'un token bucket'ı, eşzamanlılık sayacı ve devre kesicisi."""
+
+    def __init__(self, name, rate, burst, concurrency):
+        self.name = name
+        self.label = (metrics_modul.host_label(name),)
+        self.rate = rate  # <= 0: sınırsız
+        self.burst = max(1, burst)
+        self.concurrency = concurrency  # <= 0: sınırsız
+        self.tokens = float(self.burst)
+        self.refilled = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.queued = 0
+        self.cond = threading.Condition()
+
+        self.state = CLOSED
+        self.failures = 0  # Art arda hata sayısı
+        self.opened_at = 0.0
+        self.probing = False
+        self.stats = {"requests": 0, "retries": 0, "rejected": 0, "circuit_opens": 0}
+
+    def _refill(self, now):
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+
+    def _publish(self):
+        metrics_modul.OUTBOUND_QUEUED.set(self.label, self.queued)
+        metrics_modul.OUTBOUND_IN_FLIGHT.set(self.label, self.in_flight)
+
+    def _reject(self, reason, retry_after=None, error=OutboundRejected):
+        self.stats["rejected"] += 1
+        metrics_modul.OUTBOUND_REJECTED.inc(self.label + (reason,))
+        return error(self.name, reason, retry_after)
+
+    def acquire(self, max_queue, timeout, cooldown):
+        """
+        Sıra, hız ve eşzamanlılık sınırları izin verince döner; izin yoksa OutboundRejected.
+        İstek, açık devrenin süresi dolduktan sonraki deneme isteğiyse True döner.
+        """
+        with self.cond:
+            now = time.monotonic()
+            if self.state == OPEN:
+                remaining = self.opened_at + cooldown - now
+                if remaining > 0:
+                    raise self._reject(CIRCUIT_OPEN, remaining, CircuitOpenError)
+                self.state = HALF_OPEN
+            probe = False
+            if self.state == HALF_OPEN:
+                # Tek deneme isteği sonuçlanana kadar diğerleri beklemez, reddedilir
+                if self.probing:
+                    raise self._reject(CIRCUIT_OPEN, cooldown, CircuitOpenError)
+                self.probing = probe = True
+            if self.paused_until - now > timeout:
+                self._end_probe(probe)
+                raise self._reject(PAUSED, self.paused_until - now)
+            if max_queue and self.queued >= max_queue:
+                self._end_probe(probe)
+                raise self._reject(QUEUE_FULL)
+
+            started = now
+            deadline = now + timeout
+            self.queued += 1
+            self._publish()
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self.paused_until - now
+                    if wait <= 0:
+                        slot_free = self.concurrency <= 0 or self.in_flight < self.concurrency
+                        if slot_free and (self.rate <= 0 or self.tokens >= 1):
+                            break
+                        # Yer yoksa release() uyandırır; token yoksa bir sonraki token'a kadar beklenir
+                        wait = (1 - self.tokens) / self.rate if slot_free else None
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._end_probe(probe)
+                        raise self._reject(QUEUE_TIMEOUT)
+                    self.cond.wait(remaining if wait is None else min(wait, remaining))
+                if self.rate > 0:
+                    self.tokens -= 1
+                self.in_flight += 1
+                self.stats["requests"] += 1
+            finally:
+                self.queued -= 1
+                self._publish()
+        metrics_modul.OUTBOUND_WAIT.observe(self.label, now - started)
+        return probe
+
+    def _end_probe(self, probe):
+        if probe:
+            self.probing = False
+
+    def release(self, failed, probe, breaker_threshold):
+        """failed: True hata, False başarı, None devre kesiciyi etkilemeyen sonuç."""
+        with self.cond:
+            self.in_flight -= 1
+            if probe:
+                self.probing = False
+            if failed is None:
+                if probe:
+                    self.state = OPEN  # Sonuç belirsiz; bir sonraki deneme süresini bekle
+                    self.opened_at = time.monotonic()
+            elif failed:
+                self.failures += 1
+                if self.state == HALF_OPEN or (breaker_threshold and self.failures >= breaker_threshold):
+                    if self.state != OPEN:
+                        self.stats["circuit_opens"] += 1
+                        print(f"⚠️ {self.name} art arda {self.failures} hata verdi; devre kesici açıldı.")
+                    self.state = OPEN
+                    self.opened_at = time.monotonic()
+            else:
+                self.failures = 0
+                self.state = CLOSED
+            metrics_modul.OUTBOUND_CIRCUIT_OPEN.set(self.label, 1 if self.state == OPEN else 0)
+            self._publish()
+            self.cond.notify_all()
+
+    def pause(self, seconds):
+        """Retry-After: host'a bu süre boyunca yeni istek gönderilmez."""
+        with self.cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def snapshot(self, cooldown):
+        with self.cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "concurrency": self.concurrency,
+                "tokens": round(self.tokens, 2),
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "paused_for": round(max(0.0, self.paused_until - now), 2),
+                "circuit": self.state,
+                "circuit_retry_in": round(max(0.0, self.opened_at + cooldown - now), 2) if self.state == OPEN else None,
+                "consecutive_failures": self.failures,
+                **self.stats,
+            }
+
+
+class OutboundScheduler:
+    """
+    send() çağrılarını host sınırları içinde yapar.
+    host_limits: {host: {"rate", "burst", "concurrency"}}; verilmeyen host'lar varsayılanları kullanır.
+    retry_exceptions: Yeniden denenecek istisna tipleri (ör. bağlantı hatası, zaman aşımı).
+    """
+
+    def __init__(self, rate=8.0, burst=16, concurrency=8, host_limits=None, max_queue=100, queue_timeout=30.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=10.0, max_retry_after=30.0,
+                 breaker_threshold=5, breaker_cooldown=30.0, retry_exceptions=(OSError,)):
+        self.defaults = {"rate": rate, "burst": burst, "concurrency": concurrency}
+        self.host_limits = host_limits or {}
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.retry_exceptions = tuple(retry_exceptions)
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    def _configured(self, name):
+        # Ayar host:port, sadece host veya www'siz host ile verilebilir
+        bare = name.rsplit(":", 1)[0]
+        return (self.host_limits.get(name) or self.host_limits.get(bare)
+                or self.host_limits.get(bare.removeprefix("www.")))
+
+    def limit_host(self, name, limits):
+        """
+        Host için varsayılan yerine limits'i kullanır. Host için ayrıca ayar
+        (host_limits) verilmişse o geçerli kalır.
+        """
+        name = name.lower()
+        with self._lock:
+            if self._configured(name) is None:
+                self.host_limits[name] = dict(limits)
+                self._hosts.pop(name, None)
+
+    def _host(self, name):
+        host = self._hosts.get(name)
+        if host is None:
+            with self._lock:
+                host = self._hosts.get(name)
+                if host is None:
+                    limits = self._configured(name) or {}
+                    host = self._hosts[name] = _Host(name, **{**self.defaults, **limits})
+        return host
+
+    def backoff(self, attempt, retry_after=None):
+        """attempt. yeniden deneme öncesi beklenecek süre (sn)."""
+        if retry_after is not None:
+            return retry_after + self._random.uniform(0, self.backoff_base)
+        return self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def request(self, url, send):
+        """
+        send() isteği atar ve yanıtı döndürür. Yeniden denenebilir durumlarda
+        max_retries kadar tekrar çağrılır; son yanıt döndürülür veya son hata yükseltilir.
+        Host sınırları izin vermezse OutboundRejected (devre açıksa CircuitOpenError).
+        """
+        host = self._host(urlsplit(url).netloc.lower())
+        attempt = 0
+        while True:
+            probe = host.acquire(self.max_queue, self.queue_timeout, self.breaker_cooldown)
+            response = error = None
+            try:
+                response = send()
+            except self.retry_exceptions as e:
+                error = e
+                reason = type(e).__name__
+            except BaseException:
+                host.release(None, probe, self.breaker_threshold)
+                raise
+            else:
+                reason = str(response.status_code)
+            # 429 sunucunun çalıştığını gösterir; devre kesiciyi sadece hata ve 5xx besler
+            failed = error is not None or response.status_code >= 500
+            host.release(failed, probe, self.breaker_threshold)
+            metrics_modul.OUTBOUND_REQUESTS.inc(host.label + (reason,))
+
+            if error is None and response.status_code not in RETRY_STATUSES:
+                return response
+
+            retry_after = None
+            if response is not None:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    host.pause(retry_after)
+            if attempt >= self.max_retries or (retry_after is not None and retry_after > self.max_retry_after):
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self.backoff(attempt, retry_after)
+            with host.cond:
+                host.stats["retries"] += 1
+            metrics_modul.OUTBOUND_RETRIES.inc(host.label + (reason,))
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self):
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {name: host.snapshot(self.breaker_cooldown) for name, host in sorted(hosts.items())}
@@ -0,0 +1,94 @@
+"""
+Ortak HTML parser ayarı.
+
+BeautifulSoup'un arka ucu tek yerden seçilir: "auto" kuruluysa lxml'i, değilse
+html.parser'ı kullanır. parse_only ile sadece gereken alt ağaç kurulur; sayfanın
+geri kalanı için nesne oluşturulmaz.
+"""
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+import metrics_modul
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+PARSER_BACKEND = os.getenv("HTML_PARSER", "auto")  # auto | lxml | html.parser
+BACKENDS = ("auto", "lxml", "html.parser")
+# False ise parse_only yok sayılır ve tüm belge kurulur (karşılaştırma/hata ayıklama için)
+SCOPED_PARSING = os.getenv("HTML_PARSER_SCOPED", "1") == "1"
+
+
+def resolve_backend(backend=None):
+    """Kullanılacak BeautifulSoup arka ucunun adını döndürür."""
+    backend = backend or PARSER_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen parser: {backend}. Kullanılabilir: {', '.join(BACKENDS)}")
+    if backend == "auto":
+        return "lxml" if HAS_LXML else "html.parser"
+    return backend
+
+
+def make_soup(markup, parse_only=None, backend=None):
+    """Seçili arka uçla BeautifulSoup nesnesi oluşturur."""
+    if not SCOPED_PARSING:
+        parse_only = None
+    with metrics_modul.stage("soup_build"):
+        return BeautifulSoup(markup, resolve_backend(backend), parse_only=parse_only)
+
+
+def has_class(name):
+    """
+    SoupStrainer için sınıf eşleştiricisi. Strainer, sınıf özniteliğini parse
+    sırasında ham metin olarak görür; bu yüzden tek sınıf adı da metin içinde aranır.
+    """
+    return re.compile(rf"(?:^|\s){re.escape(name)}(?:\s|$)")
+
+
+DIV_TAG_RE = re.compile(rb"<(/?)div\b", re.IGNORECASE)
+
+
+def extract_div_blocks(markup, class_name):
+    """
+    Sınıfı class_name içeren div'lerin ham HTML'ini (iç içe div'leriyle) birleştirip
+    döndürür. Ağaç kurulmaz, sadece div etiketleri sayılır; sayfa değişti mi
+    kontrolü için BeautifulSoup'tan çok daha ucuzdur.
+    """
+    if isinstance(markup, str):
+        markup = markup.encode("utf-8")
+    start_re = re.compile(
+        rb"<div\b[^>]*\bclass\s*=\s*[\"'][^\"']*(?<![\w-])"
+        + re.escape(class_name.encode("utf-8"))
+        + rb"(?![\w-])",
+        re.IGNORECASE,
+    )
+    blocks = []
+    position = 0
+    while True:
+        match = start_re.search(markup, position)
+        if match is None:
+            break
+        depth = 0
+        end = len(markup)
+        for tag in DIV_TAG_RE.finditer(markup, match.start()):
+            depth += -1 if tag.group(1) else 1
+            if depth == 0:
+                end = markup.find(b">", tag.end()) + 1 or len(markup)
+                break
+        blocks.append(markup[match.start():end])
+        position = end
+    return b"".join(blocks)
+
+
+# Modüllerin ihtiyaç duyduğu alt ağaçlar
+BILETINIAL_CONTAINER = SoupStrainer("div", class_=has_class("kategori__etkinlikler"))
+MICROFON_CARDS = SoupStrainer("div", class_=has_class("scholarship-item"))
+MICROFON_PARAGRAPHS = SoupStrainer("p")
+# find_all("a", class_="group block") ile aynı: sınıf listesi tam olarak "group block"
+BUBILET_CARDS = SoupStrainer("a", class_=re.compile(r"^\s*group\s+block\s*$"))
@@ -0,0 +1,244 @@
+"""
+Kalıcı depodaki etkinlikler üzerinde sorgu.
+
+Sorgular kaynak sitelere gitmez; store_modul'ün indeksleri (kapsam, başlangıç
+tarihi, fiyat ve katlanmış kelimelerden oluşan ters indeks) üzerinden SQLite'ta
+çalışır. Sayfalama imleç (keyset) ile yapılır: imleç son satırın sıralama
+değerini ve rowid'ini taşır, böylece derin sayfalar da aynı hızda döner.
+
+page_items aynı sıralama / imleç mantığını bellekteki tarama sonucuna uygular;
+/scrape yanıtları yeniden tarama yapmadan sayfalanır ve alanları seçilir.
+"""
+import base64
+import json
+
+import store_modul
+import tarih_modul
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Sıralama alanı -> (SQL ifadesi, artan sırada boş değer yerine, azalan sırada boş değer yerine)
+# Boş değerler her iki yönde de sona düşer.
+SORTS = {
+    "start_date": ("start_date", "'9999-12-31'", "''"),
+    "price": ("price", "1e18", "-1"),
+    "title": ("fold(title)", "'￿'", "''"),
+    "first_seen": ("first_seen", "1e18", "-1"),
+    "last_seen": ("last_seen", "1e18", "-1"),
+}
+
+
+def _encode_cursor(*values):
+    raw = json.dumps(list(values), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+# İmleç öğelerinin tipleri
+SCALAR = (str, int, float, type(None))
+STORE_CURSOR = (SCALAR, int)  # (sıralama değeri, rowid)
+DEFAULT_ITEM_CURSOR = (str, str, int)  # (sıralama, anahtar, sıra)
+SORTED_ITEM_CURSOR = (str, bool, (str, int, float), str, int)  # (sıralama, boş bayrağı, değer, anahtar, sıra)
+
+
+def _decode_cursor(cursor, types):
+    """İmleci çözer; öğe sayısı veya tipleri types ile uyuşmazsa ValueError yükseltir."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Geçersiz imleç.")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Geçersiz imleç.")
+    if not all(isinstance(value, kind) for value, kind in zip(values, types)):
+        raise ValueError("Geçersiz imleç.")
+    return values
+
+
+def _term_filter(text, fields):
+    """Her kelime için bir alt sorgu; son harfleri eksik yazılmış kelimeler de eşleşir (önek)."""
+    clauses, args = [], []
+    placeholders = ", ".join("?" for _ in fields)
+    for term in store_modul.tokens(text):
+        clauses.append(
+            f"rowid IN (SELECT event_id FROM event_terms WHERE term >= ? AND term < ? AND field IN ({placeholders}))"
+        )
+        args.extend([term, term + "￿", *fields])
+    return clauses, args
+
+
+def query(store, source=None, city=None, category=None, date_from=None, date_to=None,
+          venue=None, min_price=None, max_price=None, q=None, sort="start_date",
+          limit=DEFAULT_LIMIT, cursor=None, include_inactive=False):
+    """
+    Filtrelere uyan kayıtları döndürür: {"events": [...], "count": n, "next_cursor": str | None}.
+    date_from / date_to: Etkinlik aralığı bu aralıkla kesişenler (ISO tarih).
+    q: Başlık veya mekanda geçen kelimeler; venue: Sadece mekanda geçen kelimeler.
+    sort: SORTS anahtarlarından biri; başına "-" konursa azalan sıralanır.
+    Geçersiz sıralama veya imleçte ValueError yükseltir.
+    """
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    if name not in SORTS:
+        raise ValueError(f"Geçersiz sıralama: {sort}. Seçenekler: {', '.join(SORTS)}")
+    column, null_asc, null_desc = SORTS[name]
+    sort_expr = f"COALESCE({column}, {null_desc if descending else null_asc})"
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    clauses, args = [], []
+    if not include_inactive:
+        clauses.append("active = 1")
+    if source:
+        clauses.append("source = ?")
+        args.append(source)
+    # Kapsam değerleri kaynağa göre farklı yazılır (ör. "izmir", "i̇stanbul", "stand-up");
+    # her iki taraf da katlanarak karşılaştırılır
+    if city:
+        clauses.append("fold(replace(city, '-', ' ')) = ?")
+        args.append(store_modul.fold(city.replace("-", " ")))
+    if category:
+        clauses.append("fold(replace(category, '-', ' ')) = ?")
+        args.append(store_modul.fold(category.replace("-", " ")))
+    if date_from:
+        clauses.append("COALESCE(end_date, start_date) >= ?")
+        args.append(date_from)
+    if date_to:
+        clauses.append("start_date <= ?")
+        args.append(date_to)
+    if min_price is not None:
+        clauses.append("price >= ?")
+        args.append(min_price)
+    if max_price is not None:
+        clauses.append("price <= ?")
+        args.append(max_price)
+    for text, fields in ((q, (store_modul.TITLE, store_modul.VENUE)), (venue, (store_modul.VENUE,))):
+        if text:
+            term_clauses, term_args = _term_filter(text, fields)
+            clauses.extend(term_clauses)
+            args.extend(term_args)
+    if cursor:
+        value, rowid = _decode_cursor(cursor, STORE_CURSOR)
+        clauses.append(f"({sort_expr}, rowid) {'<' if descending else '>'} (?, ?)")
+        args.extend([value, rowid])
+
+    where = " AND ".join(clauses) or "1"
+    order = "DESC" if descending else "ASC"
+    sql = (
+        f"SELECT rowid, {sort_expr} AS sort_value, source, start_date, end_date, price, "
+        f"first_seen, last_seen, active, payload FROM events WHERE {where} "
+        f"ORDER BY sort_value {order}, rowid {order} LIMIT ?"
+    )
+    rows = store._connection().execute(sql, args + [limit + 1]).fetchall()
+
+    events = []
+    for row in rows[:limit]:
+        event = json.loads(row["payload"])
+        event.setdefault("source", row["source"])
+        event.update({
+            "start_date": row["start_date"],
+            "end_date": row["end_date"],
+            "price_value": row["price"],
+            "first_seen": row["first_seen"],
+            "last_seen": row["last_seen"],
+            "active": bool(row["active"]),
+        })
+        events.append(event)
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_cursor(last["sort_value"], last["rowid"])
+    return {"events": events, "count": len(events), "next_cursor": next_cursor}
+
+
+def _start_date(text):
+    start, _ = tarih_modul.parse_formatted(text)
+    return start.isoformat() if start else None
+
+
+def _folded(value):
+    return (store_modul.fold(value) or None) if isinstance(value, str) else value
+
+
+# Tarama sonucunda metni değil değeri karşılaştırılan alanlar; diğerleri katlanmış metinle sıralanır
+ITEM_SORT_VALUES = {
+    "date": _start_date,
+    "application_dates": _start_date,
+    "price": store_modul.parse_price,
+    "amount": store_modul.parse_price,
+}
+
+
+def _resume_after(items, key_field, key, index):
+    # Sıralamasız imleç: anahtar listede hâlâ varsa ondan sonrası, yoksa eski sıradan sonrası
+    if key:
+        for offset, item in enumerate(items):
+            if item.get(key_field) == key:
+                return offset + 1
+    return max(index + 1, 0)
+
+
+def page_items(items, key_field, item_fields, fields=None, sort=None, limit=None, cursor=None):
+    """
+    Bellekteki kayıt listesini sıralar, imleçten itibaren limit kadarını alır ve
+    sadece istenen alanları bırakır. (kayıtlar, next_cursor) döndürür.
+    sort: item_fields'tan biri, başına "-" konursa azalan; boş değerler sona düşer.
+    Sıralama verilmezse taramadaki sıra korunur. İmleç son kaydın sıralama değerini
+    ve anahtarını (link / detail_url) taşır; sonuç arada yenilense de sayfa kaymaz.
+    Sıralamasız sayfada devam, imleçteki anahtarın yeni listedeki yerinden yapılır;
+    anahtar yoksa veya kayıt listeden çıkmışsa imleçteki sıra numarasına düşülür.
+    Geçersiz alan, sıralama veya imleçte ValueError yükseltir.
+    """
+    if fields:
+        unknown = [name for name in fields if name not in item_fields]
+        if unknown:
+            raise ValueError(f"Geçersiz alan: {', '.join(unknown)}. Seçenekler: {', '.join(item_fields)}")
+
+    descending = bool(sort) and sort.startswith("-")
+    name = sort.lstrip("-") if sort else None
+    if name is not None and name not in item_fields:
+        raise ValueError(f"Geçersiz sıralama: {sort}. Seçenekler: {', '.join(item_fields)}")
+
+    if name is None:
+        keys = None
+        order = list(range(len(items)))
+    else:
+        value_of = ITEM_SORT_VALUES.get(name, _folded)
+        keys = []
+        for index, item in enumerate(items):
+            value = value_of(item.get(name))
+            # Azalan sırada listeyi ters çevirdiğimiz için boş değerin bayrağı da ters
+            flag = (value is not None) if descending else (value is None)
+            keys.append((flag, value if value is not None else "", item.get(key_field) or "", index))
+        order = sorted(range(len(items)), key=keys.__getitem__, reverse=descending)
+
+    start = 0
+    if cursor:
+        sort_name, *position = _decode_cursor(cursor, DEFAULT_ITEM_CURSOR if name is None else SORTED_ITEM_CURSOR)
+        if sort_name != (sort or ""):
+            raise ValueError("İmleç başka bir sıralamaya ait.")
+        if name is None:
+            start = _resume_after(items, key_field, *position)
+        else:
+            position = tuple(position)
+            start = len(order)
+            try:
+                for offset, index in enumerate(order):
+                    if (keys[index] < position) if descending else (keys[index] > position):
+                        start = offset
+                        break
+            except TypeError:
+                # Değer tipi sıralama alanıyla uyuşmuyor (ör. fiyat yerine metin)
+                raise ValueError("Geçersiz imleç.")
+
+    end = len(order) if limit is None else start + limit
+    page = [items[index] for index in order[start:end]]
+    next_cursor = None
+    if end < len(order):
+        last = order[end - 1]
+        if name is None:
+            next_cursor = _encode_cursor("", items[last].get(key_field) or "", last)
+        else:
+            next_cursor = _encode_cursor(sort or "", *keys[last])
+    if fields:
+        page = [{field: item.get(field) for field in fields} for item in page]
+    return page, next_cursor
@@ -0,0 +1,205 @@
+"""
+Sık istenen kaynak / şehir / kategori hedeflerini arka planda önceden tarar.
+
+Hedefler sabit bir listeden gelir; hangisinin önce yenileneceğine son isteklerdeki
+sıklık ve son yenilemeden beri geçen süre birlikte karar verir. Her yenilemenin
+zamanı rastgele kaydırılır (jitter), böylece hedefler aynı anda taranmaz. Kaynak
+başına aynı anda çalışabilecek tarama sayısı sınırlıdır. Zamanlayıcı kendi
+thread'inde çalışır; API'nin olay döngüsünü hiçbir zaman bekletmez.
+"""
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DemandCounter:
+    """
+    Anahtar başına üstel olarak sönümlenen istek sayacı. Bir isteğin ağırlığı
+    half_life saniyede yarıya iner; en fazla max_keys anahtar tutulur.
+    """
+
+    def __init__(self, half_life=3600, max_keys=1000):
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self._scores = {}
+        self._lock = threading.Lock()
+
+    def _decayed(self, score, updated_at, now):
+        return score * math.pow(0.5, (now - updated_at) / self.half_life)
+
+    def note(self, key):
+        now = time.monotonic()
+        with self._lock:
+            score, updated_at = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, updated_at, now) + 1.0, now)
+            if len(self._scores) > self.max_keys:
+                weakest = min(self._scores, key=lambda k: self._decayed(*self._scores[k], now))
+                del self._scores[weakest]
+
+    def score(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._scores.get(key)
+        return self._decayed(entry[0], entry[1], now) if entry else 0.0
+
+
+class _Target:
+    __slots__ = ("source", "params", "key", "interval", "next_due", "last_run", "last_duration",
+                 "last_status", "last_error", "runs", "errors", "running")
+
+    def __init__(self, source, params, key, interval, next_due):
+        self.source = source
+        self.params = params
+        self.key = key
+        self.interval = interval
+        self.next_due = next_due
+        self.last_run = None
+        self.last_duration = None
+        self.last_status = None
+        self.last_error = None
+        self.runs = 0
+        self.errors = 0
+        self.running = False
+
+
+class PrewarmScheduler:
+    """
+    refresh: refresh(source, params) -> sonuç; yenilenen sonucu önbelleğe / depoya yazar.
+    key: key(source, params) -> talep sayacındaki anahtar.
+    interval: interval(source) -> hedefin yenilenme aralığı (sn).
+    source_limits: Kaynak başına eşzamanlı tarama sınırı.
+    jitter: Aralığın ± bu oranı kadar rastgele kaydırma.
+    start_delay: İlk taramaların bu süreye rastgele yayılması (sn).
+    """
+
+    def __init__(self, refresh, key, interval, targets, demand=None, source_limits=None,
+                 jitter=0.1, start_delay=30, tick=1.0, is_error=None):
+        self._refresh = refresh
+        self._is_error = is_error or (lambda result: False)
+        self.demand = demand or DemandCounter()
+        self.jitter = jitter
+        self.tick = tick
+        self._random = random.Random()
+        now = time.monotonic()
+        self._targets = [
+            _Target(source, params, key(source, params), interval(source),
+                    now + self._random.uniform(0, start_delay))
+            for source, params in targets
+        ]
+        self.source_limits = dict(source_limits or {})
+        self._running = {source: 0 for source in self.source_limits}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, sum(self.source_limits.values()) or len(self._targets) or 1),
+            thread_name_prefix="prewarm",
+        )
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _jittered(self, interval):
+        return interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    def _priority(self, target, now):
+        # Talep sayısı + aralığa göre gecikme: çok istenen ve uzun süredir yenilenmeyen önce
+        age = now - target.next_due + target.interval
+        return self.demand.score(target.key) + age / target.interval
+
+    def start(self):
+        if self._thread is None and self._targets:
+            self._thread = threading.Thread(target=self._loop, name="prewarm-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _loop(self):
+        while not self._stop.wait(self.tick):
+            try:
+                self._dispatch()
+            except Exception as e:
+                print(f"⚠️ Ön ısıtma zamanlayıcısı hatası: {e}")
+
+    def _dispatch(self):
+        now = time.monotonic()
+        with self._lock:
+            due = [t for t in self._targets if not t.running and t.next_due <= now]
+            due.sort(key=lambda t: self._priority(t, now), reverse=True)
+            for target in due:
+                limit = self.source_limits.get(target.source)
+                if limit is not None and self._running.get(target.source, 0) >= limit:
+                    continue
+                target.running = True
+                self._running[target.source] = self._running.get(target.source, 0) + 1
+                self._executor.submit(self._run, target)
+
+    def _run(self, target):
+        started = time.monotonic()
+        status, error = "ok", None
+        try:
+            result = self._refresh(target.source, target.params)
+            if self._is_error(result):
+                status = "error"
+                error = result.get("message") if isinstance(result, dict) else str(result)
+        except Exception as e:
+            status, error = "error", str(e)
+        finished = time.monotonic()
+        with self._lock:
+            target.running = False
+            self._running[target.source] -= 1
+            target.runs += 1
+            target.last_run = time.time()
+            target.last_duration = round(finished - started, 3)
+            target.last_status = status
+            target.last_error = error
+            if status == "error":
+                target.errors += 1
+            target.next_due = finished + self._jittered(target.interval)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            targets = [
+                {
+                    "source": t.source,
+                    "params": t.params,
+                    "interval": t.interval,
+                    "next_run_in": round(max(0.0, t.next_due - now), 1),
+                    "priority": round(self._priority(t, now), 3),
+                    "demand": round(self.demand.score(t.key), 3),
+                    "running": t.running,
+                    "runs": t.runs,
+                    "errors": t.errors,
+                    "last_run": t.last_run,
+                    "last_duration": t.last_duration,
+                    "last_status": t.last_status,
+                    "last_error": t.last_error,
+                }
+                for t in self._targets
+            ]
+            running = dict(self._running)
+        targets.sort(key=lambda t: t["next_run_in"])
+        return {
+            "active": self._thread is not None and not self._stop.is_set(),
+            "source_limits": self.source_limits,
+            "running": running,
+            "jitter": self.jitter,
+            "targets": targets,
+        }
+
+
+def parse_targets(text, fields):
+    """
+    "kaynak:değer:değer;..." biçimindeki hedef listesini [(kaynak, params)] listesine çevirir.
+    fields: Kaynak adı -> parametre adları (ör. "bubilet" -> ("city", "category")).
+    Tanınmayan kaynak veya eksik değerli hedefler ValueError yükseltir.
+    """
+    targets = []
+    for entry in filter(None, (part.strip() for part in (text or "").replace(",", ";").split(";"))):
+        source, *values = [value.strip() for value in entry.split(":")]
+        if source not in fields or len(values) != len(fields[source]) or not all(values):
+            raise ValueError(f"Geçersiz ön ısıtma hedefi: {entry}")
+        targets.append((source, dict(zip(fields[source], values))))
+    return targets
@@ -0,0 +1,122 @@
+"""
+Aynı anda gelen özdeş istekleri tek bir taramada birleştirir (single-flight).
+
+Aynı anahtar için bir iş sürerken gelen çağrılar yeni iş başlatmaz; süren işin
+sonucunu (veya hatasını) paylaşır. lock_dir verilirse uvicorn worker'ları arasında
+da birleştirme yapılır: işi yapan süreç anahtara ait dosya kilidini tutar, bekleyen
+süreçler kilit açılınca liderin yazdığı sonuç dosyasını okur.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import model_modul
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası birleştirme yapılamaz
+    fcntl = None
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, lock_dir=None):
+        if lock_dir and fcntl is None:
+            print("⚠️ fcntl yok, süreçler arası birleştirme kapalı.")
+            lock_dir = None
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+        self.lock_dir = lock_dir
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0, "coalesced_cross_process": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def do(self, key, fn):
+        """
+        fn'i key için bir kez çalıştırır. (değer, paylaşıldı mı) döndürür.
+        Lider çağrı hata verirse aynı hata bekleyenlerde de yükseltilir.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+                self._stats["leaders"] += 1
+            else:
+                leader = False
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        shared = False
+        try:
+            if self.lock_dir:
+                call.value, shared = self._run_locked(key, fn)
+            else:
+                call.value = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value, shared
+
+    def _paths(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        base = os.path.join(self.lock_dir, digest)
+        return base + ".lock", base + ".json"
+
+    def _run_locked(self, key, fn):
+        lock_path, result_path = self._paths(key)
+        started = time.time()
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Biz beklerken başka bir süreç aynı işi bitirdiyse onun sonucunu kullan
+                try:
+                    if os.path.getmtime(result_path) >= started:
+                        with open(result_path, encoding="utf-8") as f:
+                            value = json.load(f)
+                        self._count("coalesced_cross_process")
+                        return value, True
+                except (OSError, ValueError):
+                    pass
+
+                value = fn()
+                try:
+                    tmp_path = f"{result_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        json.dump(value, f, ensure_ascii=False, default=model_modul.default)
+                    os.replace(tmp_path, result_path)
+                except (OSError, TypeError, ValueError) as e:
+                    print(f"⚠️ Single-flight sonucu yazılamadı: {e}")
+                return value, False
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["cross_process"] = bool(self.lock_dir)
+        return stats
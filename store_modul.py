@@ -0,0 +1,243 @@
+"""
+Kalıcı etkinlik deposu (SQLite, WAL).
+
+Her tarama sonucu, taramanın kapsamına (kaynak, şehir, kategori) göre saklanır.
+Kapsam içinde kayıtlar link / detail_url ile tekildir. Her senkronizasyonda içerik
+özeti karşılaştırılır ve sadece eklenen, değişen ve kaybolan kayıtlar raporlanır.
+Bir kapsamın tüm yazımları tek transaction içinde toplu (executemany) yapılır.
+
+Sorgular için başlık ve mekan kelimeleri Türkçe katlanmış (ı/i, ş/s ...) halde
+event_terms tablosunda ters indeks olarak tutulur; fiyat metni sayıya çevrilir.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+import model_modul
+import tarih_modul
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    source TEXT NOT NULL,
+    city TEXT NOT NULL,
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT,
+    venue TEXT,
+    date_text TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    price REAL,
+    payload TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (source, city, category, key)
+);
+CREATE INDEX IF NOT EXISTS idx_events_scope ON events (source, city, category, active);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events (start_date);
+CREATE TABLE IF NOT EXISTS event_terms (
+    term TEXT NOT NULL,
+    field TEXT NOT NULL,
+    event_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_terms_term ON event_terms (term, field);
+CREATE INDEX IF NOT EXISTS idx_terms_event ON event_terms (event_id);
+"""
+
+
+# Kaynağa göre kaydın anahtar, başlık, mekan ve tarih alanları
+FIELDS = {
+    "biletinial": {"key": "link", "title": "title", "venue": "venue", "date": "date"},
+    "bubilet": {"key": "link", "title": "title", "venue": "venue", "date": "date"},
+    "microfon": {"key": "detail_url", "title": "title", "venue": "provider", "date": "application_dates"},
+}
+
+# Ters indeksteki alan kodları
+TITLE = "t"
+VENUE = "v"
+
+FOLD_MAP = str.maketrans({
+    "ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u",
+    "â": "a", "î": "i", "û": "u", "\u0307": None,
+})
+WORD_RE = re.compile(r"\w+")
+PRICE_RE = re.compile(r"\d[\d.,]*")
+
+
+def fold(text):
+    """Metni aramaya uygun hale getirir: Türkçe küçük harf, aksansız (url_hazirla gibi)."""
+    if not text:
+        return ""
+    return text.replace("İ", "i").replace("I", "ı").lower().translate(FOLD_MAP)
+
+
+def tokens(text):
+    return WORD_RE.findall(fold(text))
+
+
+def parse_price(text):
+    """
+    "1.250,50 TL", "₺450", "450,00" gibi fiyat metinlerini sayıya çevirir.
+    Nokta binlik, virgül ondalık ayırıcıdır. Sayı yoksa (ör. "Belirsiz") None.
+    """
+    match = PRICE_RE.search(text or "")
+    if match is None:
+        return None
+    number = match.group().rstrip(".,")
+    if "," in number:
+        number = number.replace(".", "").replace(",", ".")
+    elif re.fullmatch(r"\d{1,3}(\.\d{3})+", number):
+        number = number.replace(".", "")
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+def content_hash(item):
+    return hashlib.sha1(json.dumps(item, sort_keys=True, ensure_ascii=False, default=model_modul.default).encode("utf-8")).hexdigest()
+
+
+class EventStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        # SQLite bağlantıları thread'ler arasında paylaşılmaz; her thread kendi bağlantısını açar
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.create_function("fold", 1, fold, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def _row(self, source, city, category, item, digest, now):
+        fields = FIELDS[source]
+        date_text = item.get(fields["date"])
+        start, end = tarih_modul.parse_formatted(date_text)
+        return {
+            "source": source,
+            "city": city,
+            "category": category,
+            "key": item[fields["key"]],
+            "title": item.get(fields["title"]),
+            "venue": item.get(fields["venue"]),
+            "date_text": date_text,
+            "start_date": start.isoformat() if start else None,
+            "end_date": end.isoformat() if end else None,
+            "price": parse_price(item.get("price")),
+            "payload": json.dumps(item, ensure_ascii=False, default=model_modul.default),
+            "content_hash": digest,
+            "now": now,
+        }
+
+    def _index_terms(self, conn, source, city, category, rows):
+        """Eklenen / değişen kayıtların ters indeks girdilerini yeniden yazar."""
+        if not rows:
+            return
+        ids = {
+            row["key"]: row["rowid"]
+            for row in conn.execute(
+                "SELECT rowid, key FROM events WHERE source = ? AND city = ? AND category = ?",
+                (source, city, category),
+            )
+        }
+        event_ids = [(ids[row["key"]],) for row in rows]
+        terms = []
+        for (event_id,), row in zip(event_ids, rows):
+            for field, text in ((TITLE, row["title"]), (VENUE, row["venue"])):
+                terms.extend((term, field, event_id) for term in set(tokens(text)))
+        conn.executemany("DELETE FROM event_terms WHERE event_id = ?", event_ids)
+        conn.executemany("INSERT INTO event_terms (term, field, event_id) VALUES (?, ?, ?)", terms)
+
+    def sync(self, source, city, category, items, complete=True):
+        """
+        Kapsamın güncel listesini yazar. Eklenen, değişen ve kaybolan anahtarları döndürür.
+        Daha önce kaybolmuş bir kayıt geri gelirse eklenmiş sayılır.
+        complete=False ise liste kısmi kabul edilir (ör. Bubilet HTTP yolu): listede
+        olmayan kayıtlar kaybolmuş sayılmaz, sadece ekleme ve güncelleme yapılır.
+        """
+        key_field = FIELDS[source]["key"]
+        now = time.time()
+
+        current = {}
+        for item in items:
+            key = item.get(key_field)
+            if key:
+                current[key] = item
+
+        with self._write_lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = {
+                    row["key"]: (row["content_hash"], row["active"])
+                    for row in conn.execute(
+                        "SELECT key, content_hash, active FROM events WHERE source = ? AND city = ? AND category = ?",
+                        (source, city, category),
+                    )
+                }
+
+                inserted, changed, touched = [], [], []
+                rows = []
+                for key, item in current.items():
+                    digest = content_hash(item)
+                    previous = existing.get(key)
+                    if previous is not None and previous[0] == digest and previous[1]:
+                        touched.append((now, source, city, category, key))
+                        continue
+                    (changed if previous is not None and previous[1] else inserted).append(key)
+                    rows.append(self._row(source, city, category, item, digest, now))
+
+                vanished = [
+                    key for key, (_, active) in existing.items() if active and key not in current
+                ] if complete else []
+
+                conn.executemany(
+                    """
+                    INSERT INTO events (source, city, category, key, title, venue, date_text, start_date,
+                                        end_date, price, payload, content_hash, first_seen, last_seen, active)
+                    VALUES (:source, :city, :category, :key, :title, :venue, :date_text, :start_date,
+                            :end_date, :price, :payload, :content_hash, :now, :now, 1)
+                    ON CONFLICT (source, city, category, key) DO UPDATE SET
+                        title = excluded.title, venue = excluded.venue, date_text = excluded.date_text,
+                        start_date = excluded.start_date, end_date = excluded.end_date,
+                        price = excluded.price, payload = excluded.payload, content_hash = excluded.content_hash,
+                        last_seen = excluded.last_seen, active = 1
+                    """,
+                    rows,
+                )
+                self._index_terms(conn, source, city, category, rows)
+                conn.executemany(
+                    "UPDATE events SET last_seen = ? WHERE source = ? AND city = ? AND category = ? AND key = ?",
+                    touched,
+                )
+                conn.executemany(
+                    "UPDATE events SET active = 0 WHERE source = ? AND city = ? AND category = ? AND key = ?",
+                    [(source, city, category, key) for key in vanished],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return {"inserted": inserted, "changed": changed, "vanished": vanished, "unchanged": len(touched)}
+
+    def stats(self):
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT source, COUNT(*) AS total, SUM(active) AS active FROM events GROUP BY source"
+        ).fetchall()
+        return {row["source"]: {"total": row["total"], "active": row["active"]} for row in rows}
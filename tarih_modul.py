@@ -0,0 +1,161 @@
+"""
+Ortak Türkçe tarih ayrıştırıcı.
+
+Biletinial ve Bubilet kartlarındaki serbest tarih metinlerini ("Kasım - 28 Ocak - 31",
+"12 Kasım Cumartesi 20:00" vb.) başlangıç/bitiş tarihine çevirir. Regex'ler bir kez
+derlenir; sonuçlar (metin, referans gün, stil) anahtarıyla önbelleğe alınır.
+
+İki stil vardır, çünkü iki site farklı kurallarla yazıldı ve çıktıları korunuyor:
+- "biletinial": Önce "Ay Gün" yazımı aranır, bulunamazsa "Gün Ay". Ay bugünden
+  önceyse gelecek yıl kabul edilir.
+- "bubilet": Gün adları ve saatler temizlenir, iki yazım birlikte kullanılır.
+  Aynı aydaki geçmiş günler de gelecek yıla atılır.
+"""
+import datetime
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import metrics_modul
+
+# Türkçe aylar ve sayısal karşılıkları
+MONTH_MAP = {
+    "ocak": 1, "şubat": 2, "mart": 3, "nisan": 4, "mayıs": 5, "haziran": 6,
+    "temmuz": 7, "ağustos": 8, "eylül": 9, "ekim": 10, "kasım": 11, "aralık": 12
+}
+# IGNORECASE ile "mayis", "kasim" gibi yazımlar da eşleşir; ilk üç harf yeterlidir
+MONTH_BY_PREFIX = {name[:3]: value for name, value in MONTH_MAP.items()}
+
+DATE_FORMAT = "%d.%m.%Y"
+CACHE_SIZE = 8192
+STYLES = ("biletinial", "bubilet")
+
+_MONTH_PATTERN = r"(ocak|şubat|mart|nisan|mayıs|haziran|temmuz|ağustos|eylül|ekim|kasım|aralık)"
+MONTH_FIRST_RE = re.compile(rf"{_MONTH_PATTERN}\s*[-.]?\s*(\d{{1,2}})", re.IGNORECASE)
+DAY_FIRST_RE = re.compile(rf"(\d{{1,2}})\s*[-.]?\s*{_MONTH_PATTERN}", re.IGNORECASE)
+DAY_NAMES_RE = re.compile(
+    r"(pazartesi|salı|çarşamba|perşembe|cuma|cumartesi|pazar|pzt|sal|çar|per|cum|cmt|paz|cmrt)",
+    re.IGNORECASE,
+)
+TIME_RE = re.compile(r"\d{1,2}:\d{2}")
+SEPARATORS_RE = re.compile(r"[\s\/\.]+")
+FORMATTED_RE = re.compile(r"(\d{2})\.(\d{2})\.(\d{4})")
+
+# start/end: datetime.date veya None, text: eski DD.MM.YYYY[ - DD.MM.YYYY] çıktısı
+DateRange = namedtuple("DateRange", ["start", "end", "text"])
+
+# Testler ve çevrimdışı benchmark'lar için "bugün" sabitlenebilir
+REFERENCE_DATE = None
+
+
+def today():
+    return REFERENCE_DATE or datetime.date.today()
+
+
+def _biletinial_matches(text):
+    matches = [(int(d), m) for m, d in MONTH_FIRST_RE.findall(text)]
+    if not matches:
+        matches = [(int(d), m) for d, m in DAY_FIRST_RE.findall(text)]
+    return matches
+
+
+def _bubilet_matches(text):
+    text = DAY_NAMES_RE.sub('', text)
+    text = TIME_RE.sub('', text)
+    text = SEPARATORS_RE.sub(' ', text).strip()
+
+    matches = [(int(d), m) for m, d in MONTH_FIRST_RE.findall(text)]
+    seen = {(day, month[:3]) for day, month in matches}
+    for d, m in DAY_FIRST_RE.findall(text):
+        key = (int(d), m[:3])
+        if key not in seen:
+            seen.add(key)
+            matches.append((key[0], m))
+    return matches
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(date_text, reference, style):
+    text = date_text.lower()
+    if style == "bubilet":
+        matches = _bubilet_matches(text)
+    else:
+        matches = _biletinial_matches(text)
+
+    parsed_dates = []
+    for day, month_str in matches:
+        month_val = MONTH_BY_PREFIX.get(month_str[:3])
+        if not month_val:
+            continue
+
+        # Etkinlik ayı bu aydan önceyse etkinlik gelecek yıldadır
+        year = reference.year
+        if month_val < reference.month:
+            year += 1
+        elif style == "bubilet" and month_val == reference.month and day < reference.day:
+            year += 1
+
+        try:
+            parsed_dates.append(datetime.date(year, month_val, day))
+        except ValueError:
+            continue
+
+    if not parsed_dates:
+        return DateRange(None, None, date_text)  # Parse edilemedi
+
+    start = min(parsed_dates)
+    end = max(parsed_dates)
+    if start == end:
+        return DateRange(start, end, start.strftime(DATE_FORMAT))
+    return DateRange(start, end, f"{start.strftime(DATE_FORMAT)} - {end.strftime(DATE_FORMAT)}")
+
+
+def parse(date_text, reference=None, style="biletinial"):
+    """
+    Tarih metnini DateRange olarak döndürür. Metin boşsa None döner.
+    Parse edilemeyen metinlerde start/end None, text ise metnin kendisidir.
+    """
+    if not date_text:
+        return None
+    if style not in STYLES:
+        raise ValueError(f"Bilinmeyen tarih stili: {style}")
+    with metrics_modul.stage("date_parse"):
+        return _parse(date_text, reference or today(), style)
+
+
+def parse_many(date_texts, reference=None, style="biletinial"):
+    """Bir sayfadaki tüm tarih metinlerini tek çağrıda parse eder (sıra korunur)."""
+    reference = reference or today()
+    results = {}
+    parsed = []
+    for text in date_texts:
+        if text not in results:
+            results[text] = parse(text, reference, style)
+        parsed.append(results[text])
+    return parsed
+
+
+def parse_date_range(date_text, reference=None, style="biletinial"):
+    """Eski arayüz: DD.MM.YYYY veya "DD.MM.YYYY - DD.MM.YYYY" metni döndürür."""
+    parsed = parse(date_text, reference, style)
+    return parsed.text if parsed else None
+
+
+def parse_formatted(text):
+    """
+    parse_date_range çıktısını ya da Microfon'un "DD.MM.YYYY - DD.MM.YYYY" metnini
+    (start, end) date ikilisine çevirir. Tarih bulunamazsa (None, None).
+    """
+    dates = []
+    for day, month, year in FORMATTED_RE.findall(text or ""):
+        try:
+            dates.append(datetime.date(int(year), int(month), int(day)))
+        except ValueError:
+            continue
+    if not dates:
+        return None, None
+    return min(dates), max(dates)
+
+
+def cache_info():
+    return _parse.cache_info()
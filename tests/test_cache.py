@@ -0,0 +1,28 @@
+"""
+Yanıt önbelleği (cache_modul.TTLCache).
+
+Çalıştırma:
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache_modul  # noqa: E402
+
+
+def test_evicts_least_recent_until_under_byte_budget():
+    cache = cache_modul.TTLCache(max_entries=10, max_bytes=100, size_of=len)
+    cache.put("a", "a" * 40)
+    cache.put("b", "b" * 40)
+    cache.get_fresh("a", ttl=60)
+    cache.put("c", "c" * 40)
+
+    assert cache.peek("b") is None
+    assert cache.peek("a") is not None and cache.peek("c") is not None
+    assert cache.stats()["bytes"] == 80
+
+    cache.put("d", "d" * 101)
+    assert cache.peek("d") is None
+    assert cache.stats()["oversized"] == 1
@@ -0,0 +1,42 @@
+"""
+Tarayıcı havuzu (havuz_modul.DriverPool).
+
+Çalıştırma:
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import havuz_modul  # noqa: E402
+
+
+class FakeDriver:
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        pass
+
+
+class SessionLost(Exception):
+    pass
+
+
+def test_only_broken_session_replaces_driver():
+    pool = havuz_modul.DriverPool(FakeDriver, size=1, is_broken=lambda error: isinstance(error, SessionLost))
+
+    with pytest.raises(TimeoutError):
+        with pool.driver():
+            raise TimeoutError("kart bulunamadı")
+    assert pool.stats()["crashed"] == 0
+    assert pool.stats()["idle"] == 1
+
+    with pytest.raises(SessionLost):
+        with pool.driver():
+            raise SessionLost()
+    assert pool.stats()["crashed"] == 1
+    assert pool.stats()["idle"] == 0
@@ -0,0 +1,105 @@
+"""
+Arka plan işleri (job_modul) için regresyon testleri.
+
+Çalıştırma:
+    python -m pytest -q tests
+"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import job_modul  # noqa: E402
+import kaynak_modul  # noqa: E402
+
+PARAMS = {"level": "lise", "window": 1}
+RESULT = {"status": "success", "scholarships": [{"detail_url": "https://example.com/burs/1", "title": "Burs"}]}
+
+
+def _wait(job, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if job.status in job_modul.FINISHED:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"İş bitmedi: {job.status}")
+
+
+def test_cancel_does_not_fail_concurrent_scrape(monkeypatch):
+    # İş iptali, aynı anahtarı o sırada tarayan isteğe JobCancelled olarak yayılmamalı
+    job_running = threading.Event()
+    release = threading.Event()
+
+    def fake_run(params, progress=None, on_item=None):
+        if progress is not None:
+            job_running.set()
+        for page in range(500):
+            if progress is not None:
+                progress({"page": page})
+            if release.wait(0.01):
+                break
+        return dict(RESULT)
+
+    monkeypatch.setitem(kaynak_modul.SOURCES["microfon"], "run", fake_run)
+    monkeypatch.setattr(kaynak_modul, "STORE", None)
+    kaynak_modul.CACHE.invalidate()
+    jobs = job_modul.JobManager(runner=kaynak_modul.run_job, is_error=kaynak_modul.is_error, max_workers=2)
+
+    job = jobs.submit("microfon", PARAMS)
+    assert job_running.wait(5)
+    outcome = {}
+    request = threading.Thread(
+        target=lambda: outcome.update(result=kaynak_modul.scrape("microfon", PARAMS)[0])
+    )
+    request.start()
+    threading.Event().wait(0.05)
+    jobs.cancel(job.id)
+    _wait(job)
+    release.set()
+    request.join(5)
+
+    assert job.status == job_modul.CANCELLED
+    assert outcome["result"]["status"] == "success"
+    assert outcome["result"]["scholarships"] == RESULT["scholarships"]
+    kaynak_modul.CACHE.invalidate()
+
+
+def test_source_limit_does_not_starve_other_sources():
+    # Sınırı dolu kaynağın sıradaki işleri worker tutmamalı
+    release = threading.Event()
+    started = {}
+
+    def runner(source, params, progress):
+        started.setdefault(source, threading.Event()).set()
+        if source == "bubilet":
+            release.wait(5)
+        return dict(RESULT)
+
+    jobs = job_modul.JobManager(runner=runner, max_workers=4, source_limits={"bubilet": 2})
+    bubilet_jobs = [jobs.submit("bubilet", {}) for _ in range(6)]
+    microfon_job = jobs.submit("microfon", {})
+    _wait(microfon_job, timeout=1)
+    assert microfon_job.status == job_modul.DONE
+    assert sum(job.status == job_modul.RUNNING for job in bubilet_jobs) == 2
+
+    jobs.cancel(bubilet_jobs[-1].id)
+    assert bubilet_jobs[-1].status == job_modul.CANCELLED
+    release.set()
+    for job in bubilet_jobs[:-1]:
+        _wait(job)
+        assert job.status == job_modul.DONE
+
+
+def test_finished_jobs_are_capped_and_expired_on_finish():
+    # Biten işler submit/get beklenmeden iş bitişinde temizlenmeli
+    jobs = job_modul.JobManager(runner=lambda source, params, progress: dict(RESULT), max_workers=1,
+                                max_finished=3)
+    submitted = [jobs.submit("microfon", {}) for _ in range(5)]
+    for job in submitted:
+        job.future.result(5)
+    assert set(jobs._jobs) == {job.id for job in submitted[-3:]}
+
+    jobs.ttl = 0
+    last = jobs.submit("microfon", {})
+    last.future.result(5)
+    assert set(jobs._jobs) <= {last.id}
@@ -0,0 +1,47 @@
+"""
+Bellekteki tarama sonucunun sayfalanması (query_modul.page_items).
+
+Çalıştırma:
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import query_modul  # noqa: E402
+
+
+def _links(page):
+    return [item["link"] for item in page]
+
+
+def test_default_order_cursor_survives_refresh():
+    # Sonuç sayfalar arasında yenilenip baştan kayıt düşse de sonraki sayfa kaymamalı
+    items = [{"link": f"L{i}"} for i in range(1, 7)]
+    page, cursor = query_modul.page_items(items, "link", ("link",), limit=2)
+    assert _links(page) == ["L1", "L2"]
+
+    page, cursor = query_modul.page_items(items[1:], "link", ("link",), limit=2, cursor=cursor)
+    assert _links(page) == ["L3", "L4"]
+
+
+def test_default_order_cursor_without_key_uses_position():
+    items = [{"title": str(i)} for i in range(5)]
+    _, cursor = query_modul.page_items(items, "link", ("title",), limit=2)
+    page, _ = query_modul.page_items(items, "link", ("title",), limit=2, cursor=cursor)
+    assert page == [{"title": "2"}, {"title": "3"}]
+
+
+def test_cursor_with_wrong_element_types_is_rejected():
+    items = [{"link": f"L{i}", "price": f"{i * 10} TL"} for i in range(5)]
+    bad_cursors = [
+        query_modul._encode_cursor("", "L1", "1"),
+        query_modul._encode_cursor("price", False, "10", "L1", 1),
+        query_modul._encode_cursor("price", "x", 10.0, "L1", "1"),
+    ]
+    for cursor, sort in zip(bad_cursors, (None, "price", "price")):
+        with pytest.raises(ValueError):
+            query_modul.page_items(items, "link", ("link", "price"), sort=sort, limit=2, cursor=cursor)
@@ -0,0 +1,49 @@
+"""
+Kalıcı depo (store_modul) senkronizasyonu.
+
+Çalıştırma:
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import store_modul  # noqa: E402
+
+
+def _event(i):
+    return {"title": f"Oyun {i}", "venue": "Sahne", "date": "01.01.2030", "link": f"https://example.com/{i}"}
+
+
+def test_partial_result_does_not_vanish_missing_events(tmp_path):
+    store = store_modul.EventStore(str(tmp_path / "etkinlikler.db"))
+    store.sync("bubilet", "istanbul", "tiyatro", [_event(i) for i in range(10)])
+
+    changes = store.sync("bubilet", "istanbul", "tiyatro", [_event(i) for i in range(9)], complete=False)
+    assert changes["vanished"] == []
+    assert store.stats()["bubilet"]["active"] == 10
+
+    changes = store.sync("bubilet", "istanbul", "tiyatro", [_event(i) for i in range(9)])
+    assert changes["vanished"] == ["https://example.com/9"]
+
+
+def test_cache_hit_does_not_repeat_changes(tmp_path, monkeypatch):
+    import kaynak_modul
+
+    monkeypatch.setattr(kaynak_modul, "STORE", store_modul.EventStore(str(tmp_path / "etkinlikler.db")))
+    monkeypatch.setitem(
+        kaynak_modul.SOURCES["biletinial"], "run",
+        lambda params, progress=None, on_item=None: {"status": "success", "events": [_event(1)]},
+    )
+    kaynak_modul.CACHE.invalidate()
+    params = {"city": "istanbul", "category": "tiyatro"}
+
+    result, cache_state = kaynak_modul.scrape("biletinial", params)
+    assert cache_state == "miss"
+    assert result["changes"]["inserted"] == ["https://example.com/1"]
+
+    result, cache_state = kaynak_modul.scrape("biletinial", params)
+    assert cache_state == "hit"
+    assert "changes" not in result
+    kaynak_modul.CACHE.invalidate()